@@ -0,0 +1,50 @@
+"""defect created_at and daily defect counts rollup
+
+Revision ID: 3f2a9c7e5b14
+Revises: 118befc2db9c
+Create Date: 2026-10-17 19:02:11.408215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c7e5b14'
+down_revision: Union[str, None] = '118befc2db9c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # existing defects get the migration time: they were never timestamped
+    op.add_column('defects', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False))
+    op.create_table('defect_daily_counts',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('defect_category_id', sa.Integer(), nullable=False),
+    sa.Column('part_id', sa.Integer(), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=True),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'defect_category_id', 'part_id', name=op.f('defect_daily_counts_pkey'))
+    )
+    op.create_index('ix_defect_daily_counts_department_id_day', 'defect_daily_counts', ['department_id', 'day'], unique=False)
+    # backfill; same query as `python -m app.api.rollups rebuild`
+    op.execute(
+        "INSERT INTO defect_daily_counts"
+        " (day, defect_category_id, part_id, department_id, count)"
+        " SELECT CAST(timezone('UTC', d.created_at) AS DATE), d.defect_category_id,"
+        " d.part_id, p.department_id, count(*)"
+        " FROM defects d JOIN parts p ON p.id = d.part_id"
+        " WHERE d.defect_category_id IS NOT NULL"
+        " GROUP BY 1, 2, 3, 4"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_defect_daily_counts_department_id_day', table_name='defect_daily_counts')
+    op.drop_table('defect_daily_counts')
+    op.drop_column('defects', 'created_at')
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from functools import lru_cache
+
+from fastapi import Request
+from fastapi.responses import Response
+from graphql import (
+    GraphQLObjectType,
+    GraphQLSchema,
+    GraphQLSyntaxError,
+    OperationDefinitionNode,
+    OperationType,
+    TypeInfo,
+    TypeInfoVisitor,
+    Visitor,
+    get_named_type,
+    visit,
+)
+
+from app.api.documents import document_cache
+from app.api.persisted_queries import PersistedQueryStore, request_extensions
+from app.core.cache import table_versions
+from models.models import Base
+
+CACHE_CONTROL = "no-cache"  # store, but revalidate with If-None-Match every time
+
+# Types computed from tables they are not named after
+COMPUTED_TYPE_TABLES = {
+    "DefectParetoType": frozenset({"defect_daily_counts", "defects"}),
+}
+
+
+class DocumentTables:
+    """Which tables a GraphQL document can read, worked out from its types.
+
+    Every selected field whose type is a model type (`DepartmentType` ->
+    `departments`) contributes that table. Wrapper types (connections,
+    edges, detail views) contribute every model type they can reach, since
+    e.g. `pageInfo { hasNextPage }` depends on rows it never selects.
+    Computed types contribute the tables listed in COMPUTED_TYPE_TABLES.
+    """
+
+    def __init__(self, schema: GraphQLSchema):
+        self._schema = schema
+        self._model_tables = {
+            f"{m.class_.__name__}Type": m.local_table.name
+            for m in Base.registry.mappers
+        }
+        self._reachable = lru_cache(maxsize=None)(self._reachable_tables)
+
+    def _reachable_tables(self, type_name: str) -> frozenset[str]:
+        if type_name in self._model_tables:
+            return frozenset({self._model_tables[type_name]})
+        tables: set[str] = set()
+        seen, pending = {type_name}, [type_name]
+        while pending:
+            name = pending.pop()
+            tables.update(COMPUTED_TYPE_TABLES.get(name, ()))
+            gql_type = self._schema.get_type(name)
+            if not isinstance(gql_type, GraphQLObjectType):
+                continue
+            for field in gql_type.fields.values():
+                name = get_named_type(field.type).name
+                if name in self._model_tables:
+                    tables.add(self._model_tables[name])
+                elif name not in seen:
+                    seen.add(name)
+                    pending.append(name)
+        return frozenset(tables)
+
+    def __call__(self, document) -> set[str]:
+        tables: set[str] = set()
+        type_info = TypeInfo(self._schema)
+        reachable = self._reachable
+
+        class FieldTypes(Visitor):
+            def enter_field(self, node, *_):
+                field_type = type_info.get_type()
+                if field_type is not None:
+                    tables.update(reachable(get_named_type(field_type).name))
+
+        visit(document, TypeInfoVisitor(type_info, FieldTypes()))
+        return tables
+
+
+def graphql_etag(
+    document_tables: DocumentTables, query: str, variables: str, operation: str
+) -> str | None:
+    """Validator for a GET query, or None when it should not be cached.
+
+    Derived from the request itself and the current versions of the tables
+    it reads, so it changes as soon as a write to one of them commits.
+    Mutations and unparsable documents are left to the GraphQL router.
+    """
+    try:
+        document = document_cache.parse(query)
+    except GraphQLSyntaxError:
+        return None
+    for definition in document.definitions:
+        if (
+            isinstance(definition, OperationDefinitionNode)
+            and definition.operation != OperationType.QUERY
+        ):
+            return None
+    versions = table_versions.snapshot(document_tables(document))
+    payload = json.dumps(
+        [table_versions.epoch, query, variables, operation, versions]
+    ).encode()
+    return f'W/"{hashlib.sha256(payload).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def _get_query(params, persisted: PersistedQueryStore | None) -> str | None:
+    if "query" in params:
+        return params["query"]
+    if persisted is None:
+        return None
+    apq = request_extensions(params.get("extensions")).get("persistedQuery") or {}
+    sha256 = apq.get("sha256Hash")
+    return persisted.peek(sha256) if isinstance(sha256, str) else None
+
+
+def conditional_get(
+    schema: GraphQLSchema,
+    persisted: PersistedQueryStore | None = None,
+    path: str = "/graphql",
+):
+    """HTTP middleware adding ETag/If-None-Match support to GraphQL GETs.
+
+    A matching If-None-Match is answered with 304 before the router runs,
+    so no resolver executes and no connection is checked out. Responses
+    carrying GraphQL errors get no ETag, so a transient failure is never
+    revalidated into a cached error. Hash-only APQ requests are validated
+    against the registered text when `persisted` knows the hash.
+    """
+    document_tables = DocumentTables(schema)
+
+    async def middleware(request: Request, call_next):
+        if request.method != "GET" or request.url.path.rstrip("/") != path:
+            return await call_next(request)
+        params = request.query_params
+        query = _get_query(params, persisted)
+        if query is None:
+            return await call_next(request)
+        etag = graphql_etag(
+            document_tables,
+            query,
+            params.get("variables", ""),
+            params.get("operationName", ""),
+        )
+        if etag is None:
+            return await call_next(request)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        try:
+            failed = bool(json.loads(body).get("errors"))
+        except ValueError:
+            failed = True
+        if not failed:
+            response.headers.update(headers)
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            media_type=response.media_type,
+        )
+
+    return middleware
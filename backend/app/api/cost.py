@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    get_named_type,
+    value_from_ast_untyped,
+)
+from strawberry.extensions import SchemaExtension
+from strawberry.types import ExecutionResult
+
+from app.api.services import DEFAULT_LIMIT, MAX_LIMIT
+from app.core.config import settings
+
+log = logging.getLogger("shop-floor.cost")
+
+PAGE_ARGS = ("limit", "first", "top")
+
+
+@dataclass
+class QueryCost:
+    cost: int
+    depth: int
+
+
+def _is_list(gql_type) -> bool:
+    if isinstance(gql_type, GraphQLNonNull):
+        gql_type = gql_type.of_type
+    return isinstance(gql_type, GraphQLList)
+
+
+class _Estimator:
+    """Upper bound on the rows an operation can return, and its depth.
+
+    Each object field costs one per row it can produce, times the cost of
+    its selection. A paged field (`limit`/`first`/`top`) produces at most what
+    the repos' pagination clamp lets through; any other list (relationship
+    collections) at most MAX_LIMIT. Lists inside a paged connection
+    (`edges`) are already bounded by its page size.
+    """
+
+    def __init__(self, schema: GraphQLSchema, document, variables: dict):
+        self.schema = schema
+        self.variables = variables or {}
+        self.fragments = {
+            d.name.value: d
+            for d in document.definitions
+            if isinstance(d, FragmentDefinitionNode)
+        }
+
+    def _page_size(self, node: FieldNode, field_def) -> int | None:
+        for name in PAGE_ARGS:
+            if name in field_def.args:
+                value = next(
+                    (a.value for a in node.arguments or () if a.name.value == name),
+                    None,
+                )
+                if value is not None:
+                    value = value_from_ast_untyped(value, self.variables)
+                # same clamp as the repos apply
+                if not isinstance(value, int) or value <= 0:
+                    return DEFAULT_LIMIT
+                return min(value, MAX_LIMIT)
+        return None
+
+    def _fields(self, selection_set):
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                yield selection
+            elif isinstance(selection, InlineFragmentNode):
+                yield from self._fields(selection.selection_set)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments.get(selection.name.value)
+                if fragment is not None:
+                    yield from self._fields(fragment.selection_set)
+
+    def selection(self, parent: GraphQLObjectType, selection_set, bounded: bool):
+        """(cost, depth) of `selection_set` on `parent`."""
+        cost, depth = 0, 0
+        for node in self._fields(selection_set):
+            name = node.name.value
+            if name.startswith("__") or name not in parent.fields:
+                continue  # introspection, __typename
+            field_def = parent.fields[name]
+            child = get_named_type(field_def.type)
+            if not isinstance(child, GraphQLObjectType) or not node.selection_set:
+                depth = max(depth, 1)
+                continue
+            page = self._page_size(node, field_def)
+            is_list = _is_list(field_def.type)
+            if page is not None:
+                rows = page
+            elif is_list:
+                rows = 1 if bounded else MAX_LIMIT
+            else:
+                rows = 1
+            # a paged connection bounds the `edges` list below it
+            child_cost, child_depth = self.selection(
+                child, node.selection_set, bounded=page is not None and not is_list
+            )
+            cost += rows * (1 + child_cost)
+            depth = max(depth, 1 + child_depth)
+        return cost, depth
+
+
+def estimate_cost(
+    schema: GraphQLSchema, document, variables: dict | None, operation_name: str | None
+) -> QueryCost:
+    operations = [
+        d for d in document.definitions if isinstance(d, OperationDefinitionNode)
+    ]
+    if operation_name:
+        operations = [
+            o for o in operations if o.name and o.name.value == operation_name
+        ]
+    if not operations:
+        return QueryCost(cost=0, depth=0)
+    operation = operations[0]
+    root = schema.get_root_type(operation.operation)
+    estimator = _Estimator(schema, document, variables or {})
+    cost, depth = estimator.selection(root, operation.selection_set, bounded=False)
+    return QueryCost(cost=cost, depth=depth)
+
+
+class QueryCostLimit(SchemaExtension):
+    """Reject operations over QUERY_MAX_DEPTH / QUERY_MAX_COST before execution.
+
+    Runs after validation, once variables are known, so `limit: $n` is
+    priced at the value actually sent. Every operation's estimate is logged
+    to tune the budgets against real traffic.
+    """
+
+    def on_execute(self):
+        ctx = self.execution_context
+        document = ctx.graphql_document
+        if document is not None:
+            estimate = estimate_cost(
+                ctx.schema._schema, document, ctx.variables, ctx.operation_name
+            )
+            log.info(
+                "operation=%s cost=%d depth=%d",
+                ctx.operation_name or "-",
+                estimate.cost,
+                estimate.depth,
+            )
+            error = self._check(estimate)
+            if error is not None:
+                ctx.result = ExecutionResult(data=None, errors=[error])
+        yield
+
+    @staticmethod
+    def _check(estimate: QueryCost) -> GraphQLError | None:
+        max_depth, max_cost = settings.QUERY_MAX_DEPTH, settings.QUERY_MAX_COST
+        if max_depth and estimate.depth > max_depth:
+            message = f"Query depth {estimate.depth} exceeds the limit of {max_depth}"
+        elif max_cost and estimate.cost > max_cost:
+            message = f"Query cost {estimate.cost} exceeds the limit of {max_cost}"
+        else:
+            return None
+        return GraphQLError(
+            message,
+            extensions={
+                "code": "QUERY_TOO_COMPLEX",
+                "cost": estimate.cost,
+                "depth": estimate.depth,
+            },
+        )
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from graphql import DocumentNode, GraphQLError, parse
+from strawberry.extensions import SchemaExtension
+
+from app.core.config import settings
+
+
+class DocumentCacheStats:
+    """Process-wide counters for a DocumentCache."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.validation_hits = 0
+        self.validation_misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {**vars(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class _Entry:
+    __slots__ = ("document", "validation")
+
+    def __init__(self, document: DocumentNode):
+        self.document = document
+        # validation errors per (schema, rules); [] means the document is valid
+        self.validation: dict[tuple, list[GraphQLError]] = {}
+
+
+class DocumentCache:
+    """LRU of query text -> parsed AST and its validation result.
+
+    The views send the same few dozen documents over and over, so parsing
+    and validating each one once per process is enough. Documents that fail
+    to parse are not cached; ones that fail validation are, errors included.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.stats = DocumentCacheStats()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, query: str) -> _Entry | None:
+        with self._lock:
+            entry = self._entries.get(query)
+            if entry is None:
+                self.stats.misses += 1
+            else:
+                self._entries.move_to_end(query)
+                self.stats.hits += 1
+            return entry
+
+    def put(self, query: str, document: DocumentNode) -> _Entry:
+        entry = _Entry(document)
+        if self.maxsize <= 0:
+            return entry
+        with self._lock:
+            entry = self._entries.setdefault(query, entry)
+            self._entries.move_to_end(query)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return entry
+
+    def parse(self, query: str) -> DocumentNode:
+        """Cached `graphql.parse`; raises GraphQLSyntaxError like it."""
+        entry = self.get(query)
+        if entry is None:
+            entry = self.put(query, parse(query))
+        return entry.document
+
+    def record_validation(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.stats.validation_hits += 1
+            else:
+                self.stats.validation_misses += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+document_cache = DocumentCache(maxsize=settings.DOCUMENT_CACHE_MAX_ENTRIES)
+
+
+class CachedDocuments(SchemaExtension):
+    """Serve parse and validation results from `document_cache`.
+
+    On a hit both steps are skipped: Strawberry only parses when no
+    document is set and only validates when no errors are set.
+    """
+
+    _entry: _Entry | None = None
+
+    def on_parse(self):
+        ctx = self.execution_context
+        self._entry = document_cache.get(ctx.query) if ctx.query else None
+        if self._entry is not None:
+            ctx.graphql_document = self._entry.document
+        yield
+        if self._entry is None and ctx.graphql_document is not None:
+            self._entry = document_cache.put(ctx.query, ctx.graphql_document)
+
+    def on_validate(self):
+        ctx = self.execution_context
+        entry = self._entry
+        key = (ctx.schema._schema, tuple(ctx.validation_rules))
+        cached = entry.validation.get(key) if entry is not None else None
+        document_cache.record_validation(cached is not None)
+        if cached is not None:
+            ctx.errors = list(cached)
+        yield
+        if cached is None and entry is not None and ctx.errors is not None:
+            entry.validation[key] = list(ctx.errors)
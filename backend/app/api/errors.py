@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import ForeignKeyConstraint, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+from strawberry.exceptions import GraphQLError
+
+from models.models import Base
+
+# Human labels for tables, used in the translated messages
+_TABLE_LABELS = {
+    "users": "User",
+    "departments": "Department",
+    "parts": "Part",
+    "defect_categories": "Defect category",
+    "defects": "Defect",
+    "quality": "Quality",
+    "work_centers": "Work center",
+    "work_orders": "Work order",
+    "work_order_ops": "Work order op",
+    "routings": "Routing",
+    "routing_steps": "Routing step",
+    "boms": "BOM",
+    "bom_items": "BOM item",
+    "activity_logs": "Activity log",
+    "floors": "Floor",
+    "floor_zones": "Floor zone",
+}
+
+
+def _constraint_messages() -> dict[str, tuple[str, str]]:
+    """constraint name -> (code, message template), derived from the models.
+
+    Names follow the metadata naming convention, which matches Postgres'
+    defaults, so they line up with what the server reports.
+    """
+    messages: dict[str, tuple[str, str]] = {}
+    for table in Base.metadata.tables.values():
+        label = _TABLE_LABELS.get(table.name, table.name)
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                column = constraint.columns.keys()[0]
+                messages[constraint.name] = (
+                    "CONFLICT",
+                    f"{label} already exists; check {column}.",
+                )
+            elif isinstance(constraint, ForeignKeyConstraint):
+                target = constraint.referred_table.name
+                messages[constraint.name] = (
+                    "NOT_FOUND",
+                    _TABLE_LABELS.get(target, target) + " {value}not found",
+                )
+    return messages
+
+
+_CONSTRAINT_MESSAGES = _constraint_messages()
+
+# Postgres: 'Key (part_id)=(99) is not present in table "parts".'
+_DETAIL_VALUE = re.compile(r"Key \([^)]*\)=\((?P<value>[^)]*)\)")
+# SQLite: 'UNIQUE constraint failed: departments.title'
+_SQLITE_UNIQUE = re.compile(
+    r"UNIQUE constraint failed: (?P<table>\w+)\.(?P<column>\w+)"
+)
+
+
+def _constraint_name(exc: IntegrityError) -> str | None:
+    diag = getattr(exc.orig, "diag", None)
+    if diag is not None and getattr(diag, "constraint_name", None):
+        return diag.constraint_name
+    match = _SQLITE_UNIQUE.search(str(exc.orig))
+    if match:
+        return f"{match['table']}_{match['column']}_key"
+    return None
+
+
+def translate_integrity_error(exc: IntegrityError) -> GraphQLError:
+    """Map a unique/foreign-key violation to a GraphQLError with a friendly message."""
+    name = _constraint_name(exc)
+    if name in _CONSTRAINT_MESSAGES:
+        code, template = _CONSTRAINT_MESSAGES[name]
+        diag = getattr(exc.orig, "diag", None)
+        match = _DETAIL_VALUE.search(getattr(diag, "message_detail", None) or "")
+        message = template.format(value=f"{match['value']} " if match else "")
+        return GraphQLError(message, extensions={"code": code})
+    if "FOREIGN KEY" in str(exc.orig).upper():
+        return GraphQLError(
+            "Referenced record not found", extensions={"code": "NOT_FOUND"}
+        )
+    if "NOT NULL" in str(exc.orig).upper():
+        return GraphQLError(
+            "Missing required value", extensions={"code": "BAD_USER_INPUT"}
+        )
+    return GraphQLError("Constraint violation", extensions={"code": "CONFLICT"})
+
+
+@contextmanager
+def integrity_errors():
+    """Re-raise IntegrityError from the enclosed flush/execute as a GraphQLError."""
+    try:
+        yield
+    except IntegrityError as exc:
+        raise translate_integrity_error(exc) from exc
+
+
+# Older services signal the code with a "CODE: message" prefix
+_MESSAGE_PREFIXES = {
+    "NOT_FOUND": "NOT_FOUND",
+    "CONFLICT": "CONFLICT",
+    "VALIDATION": "BAD_REQUEST",
+    "QUERY_TOO_COMPLEX": "QUERY_TOO_COMPLEX",
+}
+
+
+def classify_error(error) -> tuple[str, str, dict]:
+    """(code, message, extensions) a GraphQL error is reported to clients with."""
+    # Try to unwrap the original exception raised in resolvers/services
+    original = getattr(error, "original_error", None) or error
+    # GraphQLError's str() appends a source excerpt; use the bare message
+    message = getattr(original, "message", None) or str(original)
+
+    # Prefer an explicit extensions.code if provided on the original error
+    ext = (
+        getattr(original, "extensions", None)
+        or getattr(error, "extensions", None)
+        or {}
+    )
+    code = ext.get("code")
+
+    # If no explicit code, fall back to the prefix convention
+    if not code and isinstance(message, str):
+        prefix, sep, rest = message.partition(":")
+        if sep and prefix in _MESSAGE_PREFIXES:
+            code = _MESSAGE_PREFIXES[prefix]
+            message = rest.strip()
+
+    # Errors without a path come from parsing/validation, not from a resolver
+    if not code and getattr(error, "path", None) is None:
+        code = "GRAPHQL_VALIDATION_FAILED"
+
+    return code or "INTERNAL_SERVER_ERROR", message, ext
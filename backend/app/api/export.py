@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Iterator
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from models.models import ActivityLog, Defect, Part, WorkOrder, WorkOrderOp
+
+# rows fetched per round trip (server-side cursor batch) and per response chunk
+YIELD_PER = 2_000
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """How one entity is exported: its rows, and where each filter applies.
+
+    `joins` are (target, onclause) pairs added only when a filter that needs
+    them is set, so an unfiltered export is a plain scan in id order.
+    """
+
+    model: type
+    time_column: object = None
+    department_column: object = None
+    work_center_column: object = None
+    joins: dict = None
+
+
+EXPORTS = {
+    "activity-logs": ExportSpec(
+        ActivityLog,
+        time_column=ActivityLog.created_at,
+        department_column=ActivityLog.department_id,
+        work_center_column=WorkOrder.work_center_id,
+        joins={"work_center": (WorkOrder, ActivityLog.work_order_id == WorkOrder.id)},
+    ),
+    "work-order-ops": ExportSpec(
+        WorkOrderOp,
+        time_column=WorkOrderOp.started_at,
+        department_column=WorkOrder.department_id,
+        work_center_column=WorkOrderOp.work_center_id,
+        joins={"department": (WorkOrder, WorkOrderOp.work_order_id == WorkOrder.id)},
+    ),
+    "defects": ExportSpec(
+        Defect,
+        time_column=Defect.created_at,
+        # a defect belongs to its part's department, as in the Pareto rollup
+        department_column=Part.department_id,
+        joins={"department": (Part, Defect.part_id == Part.id)},
+    ),
+}
+
+
+def export_query(spec: ExportSpec, since, until, department_id, work_center_id):
+    """SELECT of the entity's columns in id order, or HTTP 400 for a filter it lacks."""
+    table = spec.model.__table__
+    stmt = select(*table.columns).order_by(table.c.id)
+    filters = {
+        "since": (since, spec.time_column, lambda c, v: c >= v),
+        "until": (until, spec.time_column, lambda c, v: c < v),
+        "department": (department_id, spec.department_column, lambda c, v: c == v),
+        "work_center": (work_center_id, spec.work_center_column, lambda c, v: c == v),
+    }
+    for name, (value, column, predicate) in filters.items():
+        if value is None:
+            continue
+        if column is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{table.name} cannot be filtered by {name}",
+            )
+        join = (spec.joins or {}).get(name)
+        if join is not None:
+            stmt = stmt.join(*join)
+        stmt = stmt.where(predicate(column, value))
+    return stmt
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def stream_rows(engine, stmt, fmt: ExportFormat) -> Iterator[str]:
+    """Serialized rows of `stmt`, one chunk per YIELD_PER batch.
+
+    Holds its own connection for the whole stream; `stream_results` makes
+    psycopg use a server-side cursor, so memory stays constant however
+    many rows match.
+    """
+    with engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=YIELD_PER
+        ).execute(stmt)
+        columns = list(result.keys())
+        if fmt is ExportFormat.csv:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+        for rows in result.partitions():
+            if fmt is ExportFormat.ndjson:
+                yield "".join(
+                    json.dumps(dict(zip(columns, row)), default=_json_value) + "\n"
+                    for row in rows
+                )
+            else:
+                writer.writerows(
+                    [v.isoformat() if isinstance(v, datetime) else v for v in row]
+                    for row in rows
+                )
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if fmt is ExportFormat.csv and buffer.tell():
+            yield buffer.getvalue()  # header of an empty export
+
+
+def export_router(engine) -> APIRouter:
+    """`GET /export/{entity}`: stream every matching row as NDJSON or CSV.
+
+    For bulk extracts that would otherwise page through the GraphQL lists
+    MAX_LIMIT rows (and one OFFSET scan) at a time.
+    """
+    router = APIRouter(prefix="/export", tags=["export"])
+
+    @router.get("/{entity}")
+    def export(
+        entity: str,
+        fmt: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+        since: datetime | None = None,
+        until: datetime | None = None,
+        department_id: int | None = None,
+        work_center_id: int | None = None,
+    ):
+        spec = EXPORTS.get(entity)
+        if spec is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Unknown export {entity!r}; one of {', '.join(EXPORTS)}",
+            )
+        stmt = export_query(spec, since, until, department_id, work_center_id)
+        media_type = (
+            "application/x-ndjson" if fmt is ExportFormat.ndjson else "text/csv"
+        )
+        return StreamingResponse(
+            stream_rows(engine, stmt, fmt),
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f'attachment; filename="{entity}.{fmt.value}"'
+            },
+        )
+
+    return router
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import inspect
+import time
+
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+from app.api.errors import classify_error
+from app.core.config import settings
+from app.core.metrics import graphql_errors, operation_duration, resolver_duration
+from app.core.query_stats import QueryStats, track_queries
+from app.core.session import LazySession, end_unit_of_work
+
+
+class UnitOfWork(SchemaExtension):
+    """Treat each GraphQL operation as one database transaction.
+
+    Repos only add/flush; a mutation document commits once here if every
+    field succeeded and rolls back otherwise, so several mutations in one
+    document are atomic. Queries just end their read transaction.
+
+    The request's LazySession is then closed, so the pooled connection goes
+    back before the response is serialized and sent instead of being held
+    until the HTTP middleware stack unwinds.
+    """
+
+    async def on_execute(self):
+        succeeded = False
+        try:
+            yield
+            result = self.execution_context.result
+            succeeded = result is not None and not result.errors
+        finally:
+            db = self.execution_context.context.get("db")
+            if db is not None:
+                try:
+                    is_mutation = (
+                        self.execution_context.operation_type == OperationType.MUTATION
+                    )
+                    await end_unit_of_work(db, commit=succeeded and is_mutation)
+                finally:
+                    if isinstance(db, LazySession):
+                        await db.aclose()
+
+
+class QueryCounter(SchemaExtension):
+    """Count the SQL statements and DB time of each operation.
+
+    Totals go out as `X-DB-Queries` / `X-DB-Time` (ms) response headers and
+    under `extensions.db` in the result. Statements repeated more than
+    DB_REPEAT_THRESHOLD times are logged, or fail the field with DB_REPEAT_RAISE.
+    """
+
+    def on_operation(self):
+        self.stats = QueryStats(settings.DB_REPEAT_THRESHOLD, settings.DB_REPEAT_RAISE)
+        context = self.execution_context.context
+        db = context.get("db") if isinstance(context, dict) else None
+        if db is not None:
+            track_queries(db, self.stats)
+        yield
+        response = context.get("response") if isinstance(context, dict) else None
+        if response is not None:
+            response.headers["X-DB-Queries"] = str(self.stats.count)
+            response.headers["X-DB-Time"] = f"{self.stats.milliseconds:.3f}"
+
+    def get_results(self):
+        return {
+            "db": {"queries": self.stats.count, "timeMs": self.stats.milliseconds}
+        }
+
+
+class Metrics(SchemaExtension):
+    """Record operation and resolver latencies and error codes.
+
+    Only resolvers that return an awaitable are timed: those are the ones
+    in core.py and the loader-backed fields, while plain attribute fields
+    resolve synchronously and would only add overhead.
+    """
+
+    def on_operation(self):
+        start = time.perf_counter()
+        yield
+        ctx = self.execution_context
+        operation_type = ctx.operation_type if ctx.graphql_document else None
+        operation_duration.observe(
+            time.perf_counter() - start,
+            operation=ctx.operation_name or "anonymous",
+            type=operation_type.value if operation_type else "unknown",
+        )
+        for error in ctx.errors or ():
+            graphql_errors.inc(code=classify_error(error)[0])
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        result = _next(root, info, *args, **kwargs)
+        if inspect.isawaitable(result):
+            return self._timed(result, f"{info.parent_type.name}.{info.field_name}")
+        return result
+
+    @staticmethod
+    async def _timed(awaitable, field: str):
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            resolver_duration.observe(time.perf_counter() - start, field=field)
@@ -0,0 +1,377 @@
+"""Bulk CSV import of master data (parts, work centers, work orders).
+
+One transaction per file instead of one per row:
+
+1. rows are type- and length-checked while the CSV streams into a temporary
+   staging table, through psycopg COPY on Postgres, batched INSERTs elsewhere;
+2. duplicate keys and foreign keys are checked set-wise in SQL, marking
+   failing staging rows with their error;
+3. the remaining rows are merged with INSERT ... ON CONFLICT DO UPDATE on the
+   entity's key (`id` for parts, `code` for work centers, `number` for work
+   orders). Existing rows only get the columns the CSV header names; a work
+   order without a department takes its part's, as through the API.
+
+Rejected rows are reported with their CSV line number; the rest still load.
+
+    python -m app.api.imports work_orders orders.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from fastapi import APIRouter, HTTPException, UploadFile
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    cast,
+    exists,
+    func,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.api.rollups import sync_departments
+from app.core.cache import record_writes
+from models.models import Department, Part, WorkCenter, WorkOrder
+
+BATCH = 5_000
+MAX_LISTED_REJECTS = 1_000
+
+
+class CsvImportError(ValueError):
+    """The file as a whole cannot be imported (bad header, unknown entity)."""
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    model: type
+    key: str
+    required: tuple[str, ...]
+    optional: tuple[str, ...] = ()
+    foreign_keys: dict[str, type] = field(default_factory=dict)
+    defaults: dict[str, object] = field(default_factory=dict)
+    # column -> foreign key whose row supplies it when left empty
+    inherited: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return self.required + self.optional
+
+
+IMPORTS = {
+    "parts": ImportSpec(
+        Part,
+        key="id",
+        required=("id", "name", "department_id"),
+        foreign_keys={"department_id": Department},
+    ),
+    "work_centers": ImportSpec(
+        WorkCenter,
+        key="code",
+        required=("code", "name"),
+        optional=("department_id",),
+        foreign_keys={"department_id": Department},
+    ),
+    "work_orders": ImportSpec(
+        WorkOrder,
+        key="number",
+        required=("number", "part_id"),
+        optional=("status", "quantity", "department_id", "work_center_id"),
+        foreign_keys={
+            "part_id": Part,
+            "department_id": Department,
+            "work_center_id": WorkCenter,
+        },
+        defaults={"status": "open", "quantity": 1},
+        inherited={"department_id": "part_id"},
+    ),
+}
+
+
+@dataclass
+class ImportResult:
+    inserted: int = 0
+    updated: int = 0
+    rejected: int = 0
+    rejects: list[dict] = field(default_factory=list)
+
+    def reject(self, line: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.rejects) < MAX_LISTED_REJECTS:
+            self.rejects.append({"line": line, "error": error})
+
+    def as_dict(self) -> dict:
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "rejected": self.rejected,
+            "rejects": self.rejects,
+        }
+
+
+def _staging_table(spec: ImportSpec) -> Table:
+    target = spec.model.__table__
+    return Table(
+        f"import_{target.name}",
+        MetaData(),
+        Column("line", Integer, primary_key=True),
+        *(Column(name, target.c[name].type) for name in spec.columns),
+        Column("error", String(255)),
+        prefixes=["TEMPORARY"],
+    )
+
+
+def _parse(spec: ImportSpec, line: int, raw: dict) -> tuple[dict | None, str | None]:
+    """Typed staging row for one CSV record, or the reason it is rejected."""
+    target = spec.model.__table__
+    row = {"line": line}
+    for name in spec.columns:
+        value = (raw.get(name) or "").strip()
+        if not value:
+            if name in spec.required:
+                return None, f"{name} is required"
+            row[name] = spec.defaults.get(name)
+            continue
+        column_type = target.c[name].type
+        if isinstance(column_type, Integer):
+            try:
+                row[name] = int(value)
+            except ValueError:
+                return None, f"{name} {value!r} is not an integer"
+        else:
+            if column_type.length and len(value) > column_type.length:
+                return None, f"{name} is longer than {column_type.length} characters"
+            row[name] = value
+    return row, None
+
+
+class _StagingWriter:
+    """Streams rows into `staging`; the COPY (if any) lives on `stack`.
+
+    Closing the stack ends the COPY and its cursor, and an exception raised
+    while writing reaches the COPY so it is aborted rather than committed.
+    """
+
+    def __init__(self, conn, staging: Table, stack: ExitStack):
+        self.conn = conn
+        self.staging = staging
+        self.names = [c.name for c in staging.columns if c.name != "error"]
+        self.copy = None
+        if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg":
+            cursor = stack.enter_context(conn.connection.driver_connection.cursor())
+            self.copy = stack.enter_context(
+                cursor.copy(f"COPY {staging.name} ({', '.join(self.names)}) FROM STDIN")
+            )
+        self.batch: list[dict] = []
+
+    def write(self, row: dict) -> None:
+        if self.copy is not None:
+            self.copy.write_row([row[n] for n in self.names])
+            return
+        self.batch.append(row)
+        if len(self.batch) >= BATCH:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.batch:
+            self.conn.execute(self.staging.insert(), self.batch)
+            self.batch = []
+
+
+def _mark(conn, staging: Table, condition, error) -> None:
+    conn.execute(
+        update(staging).where(staging.c.error.is_(None), condition).values(error=error)
+    )
+
+
+def _validate(conn, spec: ImportSpec, staging: Table) -> None:
+    """Set-wise checks; failing staging rows get an `error`."""
+    # the last occurrence of a key wins, as if the rows were applied in order;
+    # one pass over staging with a window instead of a lookup per row
+    last = select(
+        staging.c.line,
+        func.max(staging.c.line)
+        .over(partition_by=staging.c[spec.key])
+        .label("last_line"),
+    ).subquery("last")
+    _mark(
+        conn,
+        staging,
+        (last.c.line == staging.c.line) & (last.c.line < last.c.last_line),
+        f"duplicate {spec.key}, superseded by line " + cast(last.c.last_line, String),
+    )
+    for name, model in spec.foreign_keys.items():
+        column = staging.c[name]
+        _mark(
+            conn,
+            staging,
+            column.is_not(None) & ~exists().where(model.id == column),
+            f"{name} does not exist",
+        )
+
+
+def _inherit(conn, spec: ImportSpec, staging: Table) -> None:
+    """Fill empty inherited columns from the row their foreign key names."""
+    for name, via in spec.inherited.items():
+        source = spec.foreign_keys[via].__table__
+        conn.execute(
+            update(staging)
+            .where(staging.c.error.is_(None), staging.c[name].is_(None))
+            .values(
+                {
+                    name: select(source.c[name])
+                    .where(source.c.id == staging.c[via])
+                    .scalar_subquery()
+                }
+            )
+        )
+
+
+def _merge(
+    conn, spec: ImportSpec, staging: Table, header: set[str], result: ImportResult
+) -> None:
+    """Upsert the valid staging rows.
+
+    Inserts write the header's columns plus those with a default or inherited
+    value; updates touch only the header's columns (and inherited ones), so a
+    CSV that leaves out `status` does not reset it on existing orders.
+    """
+    target = spec.model.__table__
+    inserted = [
+        n
+        for n in spec.columns
+        if n in header or n in spec.defaults or n in spec.inherited
+    ]
+    updated = [
+        n
+        for n in spec.columns
+        if n != spec.key and (n in header or n in spec.inherited)
+    ]
+    valid = staging.c.error.is_(None)
+    result.updated = conn.scalar(
+        select(func.count())
+        .select_from(staging.join(target, target.c[spec.key] == staging.c[spec.key]))
+        .where(valid)
+    )
+    accepted = conn.scalar(select(func.count()).select_from(staging).where(valid))
+    result.inserted = accepted - result.updated
+
+    dialect = postgresql if conn.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(target).from_select(
+        inserted,
+        select(*(staging.c[name] for name in inserted))
+        .where(valid)
+        .order_by(staging.c.line),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[spec.key],
+        set_={n: stmt.excluded[n] for n in updated},
+    )
+    conn.execute(stmt)
+    if spec.key == "id" and conn.dialect.name == "postgresql":
+        # explicit ids bypass the sequence
+        conn.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{target.name}', 'id'),"
+                f" coalesce((SELECT max(id) FROM {target.name}), 0) + 1, false)"
+            )
+        )
+
+
+def import_csv(session: Session, entity: str, lines: Iterable[str]) -> ImportResult:
+    """Import one CSV file into `entity`; the caller commits."""
+    spec = IMPORTS.get(entity)
+    if spec is None:
+        raise CsvImportError(f"Unknown import {entity!r}; one of {', '.join(IMPORTS)}")
+    reader = csv.DictReader(lines)
+    header = set(reader.fieldnames or ())
+    missing = [name for name in spec.required if name not in header]
+    if missing:
+        raise CsvImportError(f"CSV header lacks {', '.join(missing)}")
+
+    conn = session.connection()
+    staging = _staging_table(spec)
+    staging.create(conn)
+    result = ImportResult()
+    try:
+        with ExitStack() as stack:
+            writer = _StagingWriter(conn, staging, stack)
+            for raw in reader:
+                row, error = _parse(spec, reader.line_num, raw)
+                if error:
+                    result.reject(reader.line_num, error)
+                else:
+                    writer.write(row)
+            writer.flush()
+        _validate(conn, spec, staging)
+        for line, error in conn.execute(
+            select(staging.c.line, staging.c.error)
+            .where(staging.c.error.is_not(None))
+            .order_by(staging.c.line)
+        ):
+            result.reject(line, error)
+        result.rejects.sort(key=lambda r: r["line"])
+        _inherit(conn, spec, staging)
+        _merge(conn, spec, staging, header, result)
+        if spec.model is Part:
+            # parts may have changed department; their defect counts follow
+            sync_departments(
+                session, select(staging.c.id).where(staging.c.error.is_(None))
+            )
+    finally:
+        staging.drop(conn)
+    record_writes(session, spec.model.__tablename__)
+    return result
+
+
+def import_router(session_factory) -> APIRouter:
+    """`POST /import/{entity}` with the CSV as a multipart `file` upload."""
+    router = APIRouter(prefix="/import", tags=["import"])
+
+    @router.post("/{entity}")
+    def import_file(entity: str, file: UploadFile):
+        lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        with session_factory() as session:
+            try:
+                result = import_csv(session, entity, lines)
+            except CsvImportError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+            session.commit()
+        return result.as_dict()
+
+    return router
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("entity", choices=sorted(IMPORTS))
+    parser.add_argument("path", help="CSV file with a header row")
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal
+
+    with open(args.path, encoding="utf-8-sig", newline="") as fh:
+        with SessionLocal() as session:
+            try:
+                result = import_csv(session, args.entity, fh)
+            except CsvImportError as exc:
+                parser.exit(2, f"error: {exc}\n")
+            session.commit()
+    print(json.dumps(result.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
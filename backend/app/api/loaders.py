@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Callable
+
+from sqlalchemy.orm import Session
+from strawberry.dataloader import DataLoader
+
+from app.core.session import DbSession, run_in_session
+from app.api.services import (
+    DefectCategoryRepo,
+    DepartmentRepo,
+    FloorRepo,
+    PartRepo,
+    WorkCenterRepo,
+    WorkOrderRepo,
+)
+
+
+def _by_id(db: DbSession, fetch: Callable[[Session, list[int]], list]) -> DataLoader:
+    """One `WHERE id IN (...)` per batch; missing ids resolve to None."""
+
+    async def load(ids: list[int]) -> list:
+        fetched = await run_in_session(db, lambda s: fetch(s, list(ids)))
+        rows = {row.id: row for row in fetched}
+        return [rows.get(i) for i in ids]
+
+    return DataLoader(load_fn=load)
+
+
+def _grouped(
+    db: DbSession, fetch: Callable[[Session, list[int]], list], attr: str
+) -> DataLoader:
+    """One query per batch for a one-to-many relation keyed on `attr`."""
+
+    async def load(keys: list[int]) -> list[list]:
+        groups: dict[int, list] = defaultdict(list)
+        for row in await run_in_session(db, lambda s: fetch(s, list(keys))):
+            groups[getattr(row, attr)].append(row)
+        return [groups.get(k, []) for k in keys]
+
+    return DataLoader(load_fn=load)
+
+
+class Loaders:
+    """Per-request DataLoaders backing the nested fields in app/schema.py.
+
+    Loaders cache by key for the lifetime of the request, so build a fresh
+    instance per GraphQL request (see main.get_context).
+    """
+
+    def __init__(self, db: DbSession):
+        self.departments = _by_id(db, lambda s, ids: DepartmentRepo(s).by_ids(ids))
+        self.defect_categories = _by_id(
+            db, lambda s, ids: DefectCategoryRepo(s).by_ids(ids)
+        )
+        self.floors = _by_id(db, lambda s, ids: FloorRepo(s).by_ids(ids))
+        self.parts = _by_id(db, lambda s, ids: PartRepo(s).by_ids(ids))
+        self.work_centers = _by_id(db, lambda s, ids: WorkCenterRepo(s).by_ids(ids))
+        self.work_orders = _by_id(db, lambda s, ids: WorkOrderRepo(s).by_ids(ids))
+        self.work_orders_by_part = _grouped(
+            db, lambda s, ids: WorkOrderRepo(s).list_by_parts(ids), "part_id"
+        )
+        self.work_orders_by_work_center = _grouped(
+            db,
+            lambda s, ids: WorkOrderRepo(s).list_by_work_centers(ids),
+            "work_center_id",
+        )
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable
+
+from graphql import GraphQLError
+from strawberry.extensions import SchemaExtension
+from strawberry.fastapi import GraphQLRouter
+from strawberry.types import ExecutionResult
+
+from app.core.config import settings
+
+
+class PersistedQueryError(Exception):
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.code = code
+
+
+class PersistedQueryStats:
+    """Process-wide counters for a PersistedQueryStore."""
+
+    def __init__(self) -> None:
+        self.hits = 0  # hash-only requests served from the store
+        self.misses = 0  # hash-only requests the client had to resend
+        self.registrations = 0
+        self.evictions = 0
+        self.rejections = 0  # refused by allowlist mode or a bad hash
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(vars(self))
+
+
+class PersistedQueryStore:
+    """sha256 -> query text for automatic persisted queries (APQ).
+
+    Clients first send only the hash; on PERSISTED_QUERY_NOT_FOUND they
+    resend it with the full text, which registers it. Registered queries
+    live in a bounded LRU. Queries from a manifest are pinned and never
+    evicted; with `allowlist_only` they are the only queries accepted and
+    clients cannot register new ones.
+    """
+
+    def __init__(self, maxsize: int, allowlist_only: bool = False):
+        self.maxsize = maxsize
+        self.allowlist_only = allowlist_only
+        self.stats = PersistedQueryStats()
+        self._pinned: dict[str, str] = {}
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash(query: str) -> str:
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    def load_manifest(self, path: str) -> int:
+        """Pin the queries in `path`: a JSON list of queries or {hash: query}."""
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        queries = manifest.values() if isinstance(manifest, dict) else manifest
+        with self._lock:
+            for query in queries:
+                self._pinned[self.hash(query)] = query
+        return len(self._pinned)
+
+    def peek(self, sha256: str) -> str | None:
+        with self._lock:
+            return self._pinned.get(sha256) or self._entries.get(sha256)
+
+    def get(self, sha256: str) -> str | None:
+        with self._lock:
+            query = self._pinned.get(sha256)
+            if query is None:
+                query = self._entries.get(sha256)
+                if query is not None:
+                    self._entries.move_to_end(sha256)
+            if query is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+            return query
+
+    def register(self, sha256: str, query: str) -> None:
+        with self._lock:
+            if sha256 in self._pinned or self.maxsize <= 0:
+                return
+            if sha256 not in self._entries:
+                self.stats.registrations += 1
+            self._entries[sha256] = query
+            self._entries.move_to_end(sha256)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def _reject(self, message: str, code: str) -> PersistedQueryError:
+        with self._lock:
+            self.stats.rejections += 1
+        return PersistedQueryError(message, code)
+
+    def resolve(self, query: str | None, extensions) -> str | None:
+        """Query text to execute for a request, registering it if new."""
+        persisted = (extensions or {}).get("persistedQuery")
+        if not persisted:
+            if query is not None and self.allowlist_only:
+                if self.hash(query) not in self._pinned:
+                    raise self._reject(
+                        "Query is not in the persisted query allowlist", "FORBIDDEN"
+                    )
+            return query
+
+        sha256 = persisted.get("sha256Hash")
+        if persisted.get("version") != 1 or not isinstance(sha256, str):
+            raise PersistedQueryError(
+                "Unsupported persisted query", "PERSISTED_QUERY_NOT_SUPPORTED"
+            )
+        if query is None:
+            query = self.get(sha256)
+            if query is None:
+                raise PersistedQueryError(
+                    "PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND"
+                )
+            return query
+
+        if self.hash(query) != sha256:
+            raise self._reject("provided sha does not match query", "BAD_REQUEST")
+        if self.allowlist_only and sha256 not in self._pinned:
+            raise self._reject(
+                "Query is not in the persisted query allowlist", "FORBIDDEN"
+            )
+        self.register(sha256, query)
+        return query
+
+    def as_dict(self) -> dict[str, str]:
+        with self._lock:
+            return {**self._entries, **self._pinned}
+
+    def __len__(self) -> int:
+        return len(self._pinned) + len(self._entries)
+
+
+persisted_queries = PersistedQueryStore(
+    maxsize=settings.APQ_MAX_ENTRIES,
+    allowlist_only=settings.APQ_ALLOWLIST_ONLY,
+)
+if settings.APQ_MANIFEST_PATH:
+    persisted_queries.load_manifest(settings.APQ_MANIFEST_PATH)
+
+
+class PersistedQueryAllowlist(SchemaExtension):
+    """Applies allowlist mode to every operation the schema executes.
+
+    Subscriptions come in over the WebSocket protocols and never pass
+    through `PersistedQueryRouter.parse_http_body`.
+    """
+
+    store = persisted_queries
+
+    def on_execute(self):
+        try:
+            self.store.resolve(self.execution_context.query, None)
+        except PersistedQueryError as e:
+            raise GraphQLError(str(e), extensions={"code": e.code}) from None
+        yield
+
+
+def request_extensions(raw) -> dict:
+    """The `extensions` member of a request; a JSON string in GET params."""
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return {}
+    return raw if isinstance(raw, dict) else {}
+
+
+# The JSON strawberry last decoded while parsing the current request: for an
+# application/json POST, the body. Read back for its `extensions`, which
+# GraphQLRequestData does not carry, instead of decoding the body again.
+_decoded_json: ContextVar[Any] = ContextVar("decoded_json", default=None)
+
+
+class PersistedQueryRouter(GraphQLRouter):
+    """GraphQLRouter speaking the APQ protocol over GET and POST.
+
+    Also applies `error_formatter` (GraphQLError -> response dict) to every
+    error, which the stock router has no hook for.
+    """
+
+    def __init__(
+        self,
+        schema,
+        *,
+        store: PersistedQueryStore,
+        error_formatter: Callable[[GraphQLError], dict] | None = None,
+        **kwargs,
+    ):
+        super().__init__(schema, **kwargs)
+        self.store = store
+        self.error_formatter = error_formatter
+
+    def should_render_graphql_ide(self, request) -> bool:
+        # a hash-only GET has no `query` param but is not a browser visit
+        return (
+            "extensions" not in request.query_params
+            and super().should_render_graphql_ide(request)
+        )
+
+    def parse_json(self, data):
+        decoded = super().parse_json(data)
+        _decoded_json.set(decoded)
+        return decoded
+
+    async def parse_http_body(self, request):
+        token = _decoded_json.set(None)
+        try:
+            request_data = await super().parse_http_body(request)
+            body = _decoded_json.get()
+        finally:
+            _decoded_json.reset(token)
+        if request.method == "GET":
+            raw = request.query_params.get("extensions")
+        elif "application/json" in (request.content_type or ""):
+            raw = body.get("extensions") if isinstance(body, dict) else None
+        else:
+            raw = None
+        request_data.query = self.store.resolve(
+            request_data.query, request_extensions(raw)
+        )
+        return request_data
+
+    async def process_result(self, request, result):
+        data = await super().process_result(request, result)
+        if self.error_formatter is not None and result.errors:
+            data["errors"] = [self.error_formatter(e) for e in result.errors]
+        return data
+
+    async def execute_operation(self, request, context, root_value):
+        try:
+            return await super().execute_operation(request, context, root_value)
+        except PersistedQueryError as e:
+            return ExecutionResult(
+                data=None, errors=[GraphQLError(str(e), extensions={"code": e.code})]
+            )
@@ -0,0 +1,216 @@
+"""Defect counts per category, part and day, kept for the `defectPareto` query.
+
+`defect_daily_counts` is maintained incrementally: MutationService applies
+each defect insert, move or delete as +1/-1 deltas, upserted with INSERT ...
+ON CONFLICT DO UPDATE SET count = count + excluded.count in the same
+transaction as the defect itself. Nothing is ever recomputed from
+`defects`, so reading the rollup costs the same however many defects there
+are. A row's department is its part's, copied in so Pareto queries filter
+without a join; moving a part moves its rows.
+
+Defects without a part or a category have no place in the rollup and are
+not counted. A defect's day is its `created_at` date in UTC.
+
+To backfill after a bulk load that bypassed MutationService, or to check
+the rollup against its source:
+
+    python -m app.api.rollups rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+from sqlalchemy import Date, cast, delete, func, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models.models import Defect, DefectDailyCount, Part
+
+# (day, defect_category_id, part_id)
+RollupKey = tuple[date, int, int]
+
+
+@dataclass
+class ParetoRow:
+    defect_category_id: int
+    count: int
+    # percent of all defects in the range, and running total down the list
+    share: float
+    cumulative_share: float
+
+
+def defect_day(created_at: datetime) -> date:
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+
+def rollup_key(defect: Defect) -> RollupKey | None:
+    """Where `defect` is counted, or None if it is not."""
+    if defect.part_id is None or defect.defect_category_id is None:
+        return None
+    return (defect_day(defect.created_at), defect.defect_category_id, defect.part_id)
+
+
+def _utc_day(conn, column):
+    if conn.dialect.name == "postgresql":
+        return cast(func.timezone("UTC", column), Date)
+    return func.date(column)
+
+
+def _part_department(part_id):
+    return select(Part.department_id).where(Part.id == part_id).scalar_subquery()
+
+
+class DefectRollup:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, deltas: Counter[RollupKey]) -> None:
+        """Add `deltas` to their rows in one upsert; rows reaching zero are removed."""
+        deltas = {key: n for key, n in deltas.items() if key is not None and n}
+        if not deltas:
+            return
+        conn = self.db.connection()
+        dialect = postgresql if conn.dialect.name == "postgresql" else sqlite
+        t = DefectDailyCount.__table__
+        stmt = dialect.insert(t).values(
+            [
+                {
+                    "day": day,
+                    "defect_category_id": category_id,
+                    "part_id": part_id,
+                    "department_id": _part_department(part_id),
+                    "count": n,
+                }
+                # key order, so concurrent upserts lock rows in the same order
+                for (day, category_id, part_id), n in sorted(deltas.items())
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[t.c.day, t.c.defect_category_id, t.c.part_id],
+            set_={
+                "count": t.c.count + stmt.excluded.count,
+                "department_id": stmt.excluded.department_id,
+            },
+        )
+        self.db.execute(stmt)
+        decremented = [key for key, n in deltas.items() if n < 0]
+        if decremented:
+            self.db.execute(
+                delete(t).where(
+                    tuple_(t.c.day, t.c.defect_category_id, t.c.part_id).in_(
+                        decremented
+                    ),
+                    t.c.count <= 0,
+                )
+            )
+
+    def move_part(self, part_id: int, department_id: int | None) -> None:
+        """A part changed department; so do its defect counts."""
+        t = DefectDailyCount.__table__
+        self.db.execute(
+            update(t).where(t.c.part_id == part_id).values(department_id=department_id)
+        )
+
+    def pareto(
+        self,
+        department_id: int | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        top: int = 10,
+    ) -> list[ParetoRow]:
+        """Categories by defect count, most first, over days `start`..`end` inclusive.
+
+        Totals and running shares come from window functions over the
+        grouped rollup, so this is one statement however long the range.
+        """
+        t = DefectDailyCount.__table__
+        count = func.sum(t.c.count)
+        order = (count.desc(), t.c.defect_category_id)
+        stmt = (
+            select(
+                t.c.defect_category_id,
+                count.label("count"),
+                func.sum(count).over().label("total"),
+                func.sum(count).over(order_by=order).label("running"),
+            )
+            .group_by(t.c.defect_category_id)
+            .having(count > 0)
+            .order_by(*order)
+            .limit(top)
+        )
+        if department_id is not None:
+            stmt = stmt.where(t.c.department_id == department_id)
+        if start is not None:
+            stmt = stmt.where(t.c.day >= start)
+        if end is not None:
+            stmt = stmt.where(t.c.day <= end)
+        return [
+            ParetoRow(
+                defect_category_id=category_id,
+                count=n,
+                share=round(100 * n / total, 2),
+                cumulative_share=round(100 * running / total, 2),
+            )
+            for category_id, n, total, running in self.db.execute(stmt)
+        ]
+
+
+def sync_departments(db: Session, part_ids) -> None:
+    """Re-copy the department of `part_ids` (ids or a subquery) into the rollup."""
+    t = DefectDailyCount.__table__
+    db.execute(
+        update(t)
+        .where(t.c.part_id.in_(part_ids))
+        .values(department_id=_part_department(t.c.part_id))
+    )
+
+
+def rebuild(db: Session) -> int:
+    """Recompute the whole rollup from `defects`; returns the rows written."""
+    conn = db.connection()
+    t = DefectDailyCount.__table__
+    day = _utc_day(conn, Defect.created_at).label("day")
+    counted = (
+        select(
+            day,
+            Defect.defect_category_id,
+            Defect.part_id,
+            Part.department_id,
+            func.count().label("count"),
+        )
+        .join(Part, Part.id == Defect.part_id)
+        .where(Defect.defect_category_id.is_not(None))
+        .group_by(day, Defect.defect_category_id, Defect.part_id, Part.department_id)
+    )
+    db.execute(delete(t))
+    db.execute(
+        t.insert().from_select(
+            ["day", "defect_category_id", "part_id", "department_id", "count"],
+            counted,
+        )
+    )
+    return db.scalar(select(func.count()).select_from(t))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("rebuild",))
+    parser.parse_args()
+
+    from app.core.database import SessionLocal
+
+    with SessionLocal() as session:
+        rows = rebuild(session)
+        session.commit()
+    print(json.dumps({"defect_daily_counts": rows}))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,21 @@
 from __future__ import annotations
 
-from datetime import datetime
-from sqlalchemy.orm import Session
+import base64
+import binascii
+import json
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime
+from types import SimpleNamespace
+from sqlalchemy import func, insert, inspect, not_, select, tuple_
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
+from app.core.session import DbSession, run_in_session
+from app.api.errors import integrity_errors
+from app.api.rollups import DefectRollup, ParetoRow, rollup_key
+from app.core.cache import bind_token, reference_cache
+from app.core.config import settings
+from app.core.events import Event, emit, snapshot
+from app.core.write_behind import WriteBehindBuffer
 from models.models import (
     User,
     Department,
@@ -38,6 +52,14 @@ from app.schema import (
     ActivityLogInput,
     FloorInput,
     FloorZoneInput,
+    BulkItemError,
+    SortDirection,
+    WorkOrderFilter,
+    WorkOrderOrderBy,
+    RoutingFilter,
+    RoutingStepFilter,
+    BOMFilter,
+    FloorZoneFilter,
 )
 
 # --- Pagination helper ---
@@ -52,6 +74,220 @@ def _coerce_pagination(limit: int | None, offset: int | None) -> tuple[int, int]
     return limit_, offset_
 
 
+# --- Keyset (cursor) pagination helpers ---
+_CURSOR_PREFIX = "cursor:"
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """A row's position: its id and, under an orderBy, its sort column value."""
+
+    key: int
+    value: object = None
+
+
+def encode_cursor(key: int, value=None) -> str:
+    """Opaque Relay cursor for a row's id (and sort value, if not ordered by id)."""
+    raw = f"{_CURSOR_PREFIX}{key}"
+    if value is not None:
+        raw += ":" + json.dumps(value)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str | None) -> Cursor | None:
+    """Inverse of encode_cursor; None/empty means 'from the start'."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        if not raw.startswith(_CURSOR_PREFIX):
+            raise ValueError(cursor)
+        key, _, value = raw[len(_CURSOR_PREFIX):].partition(":")
+        return Cursor(int(key), json.loads(value) if value else None)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise GraphQLError(
+            f"Invalid cursor: {cursor}", extensions={"code": "BAD_USER_INPUT"}
+        )
+
+
+def _sort_column(model, order_by):
+    """The column rows are ordered by ahead of the id tiebreaker."""
+    if order_by is None:
+        return model.id
+    return getattr(model, order_by.field.value)
+
+
+def cursor_for(row, order_by=None) -> str:
+    column = _sort_column(type(row), order_by)
+    value = None if column.key == "id" else getattr(row, column.key)
+    return encode_cursor(row.id, value)
+
+
+def _keyset_page(
+    query, model, first: int | None, after: int | Cursor | None, filters=None, order_by=None
+) -> tuple[list, bool, bool]:
+    """Seek past `after` on (sort column, id) instead of OFFSET-scanning earlier rows.
+
+    Returns (rows, has_next, has_previous). One extra row tells whether
+    another page follows; an EXISTS column in the same statement tells
+    whether any matching row sorts at or before the cursor.
+    """
+    limit_, _ = _coerce_pagination(first, None)
+    query = _apply_filter(query, model, filters)
+    if after is None:
+        rows = _apply_order(query, model, order_by).limit(limit_ + 1).all()
+        return rows[:limit_], len(rows) > limit_, False
+    if isinstance(after, int):
+        after = Cursor(after)
+
+    column = _sort_column(model, order_by)
+    if column.key == "id":
+        position, cursor = model.id, after.key
+    elif after.value is None:
+        raise GraphQLError(
+            "Cursor does not belong to this orderBy", extensions={"code": "BAD_USER_INPUT"}
+        )
+    else:
+        position, cursor = tuple_(column, model.id), tuple_(after.value, after.key)
+    descending = order_by is not None and order_by.direction is SortDirection.DESC
+    later = position < cursor if descending else position > cursor
+    earlier = (
+        _apply_filter(select(model.id), model, filters)
+        .where(not_(later))
+        .correlate(None)
+        .exists()
+        .label("has_previous")
+    )
+
+    rows = (
+        _apply_order(query.filter(later), model, order_by)
+        .add_columns(earlier)
+        .limit(limit_ + 1)
+        .all()
+    )
+    if rows:
+        has_previous = bool(rows[0].has_previous)
+    else:  # past the end: the page cannot carry the answer
+        has_previous = bool(query.session.scalar(select(earlier)))
+    rows = [row[0] for row in rows]
+    return rows[:limit_], len(rows) > limit_, has_previous
+
+
+def _first_n_per_key(db: Session, model, fk, keys: list[int], n: int) -> list:
+    """Up to `n` rows (lowest ids first) for every `fk` value in one windowed query."""
+    rn = func.row_number().over(partition_by=fk, order_by=model.id).label("rn")
+    sub = select(model, rn).where(fk.in_(keys)).subquery()
+    row = aliased(model, sub)
+    return db.query(row).filter(sub.c.rn <= n).order_by(sub.c.id).all()
+
+
+# --- Reference data cache helpers ---
+def _snapshot(row) -> SimpleNamespace:
+    """Column values of `row`, detached from any session so requests can share it."""
+    return SimpleNamespace(
+        **{attr.key: getattr(row, attr.key) for attr in inspect(row).mapper.column_attrs}
+    )
+
+
+def _cached_rows(db: Session, namespace: str, key: tuple, load) -> list:
+    """Read-through `reference_cache`; `namespace` is what writes invalidate."""
+    return reference_cache.get_or_load(
+        (namespace, bind_token(db), *key), lambda: [_snapshot(r) for r in load()]
+    )
+
+
+def _filter_key(filters) -> tuple:
+    if filters is None:
+        return ()
+    return tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in sorted(vars(filters).items())
+    )
+
+
+# --- Filter helpers ---
+def _apply_filter(query, model, filters):
+    """AND one predicate per set field of a *Filter input.
+
+    `<column>_in` fields become `column IN (...)`, the rest `column = value`.
+    """
+    if filters is None:
+        return query
+    for name, value in vars(filters).items():
+        if value is None:
+            continue
+        if name.endswith("_in"):
+            query = query.filter(getattr(model, name[: -len("_in")]).in_(value))
+        else:
+            query = query.filter(getattr(model, name) == value)
+    return query
+
+
+def _apply_order(query, model, order_by):
+    """ORDER BY the requested field, with id as the tiebreaker for stable pages."""
+    if order_by is None:
+        return query.order_by(model.id)
+    column = getattr(model, order_by.field.value)
+    if order_by.direction is SortDirection.DESC:
+        return query.order_by(column.desc(), model.id.desc())
+    return query.order_by(column, model.id)
+
+
+# --- Bulk write helpers ---
+BULK_MAX_ITEMS = 10_000
+
+
+def _check_bulk_size(items: list) -> None:
+    if len(items) > BULK_MAX_ITEMS:
+        raise GraphQLError(
+            f"At most {BULK_MAX_ITEMS} items per bulk call, got {len(items)}",
+            extensions={"code": "BAD_USER_INPUT"},
+        )
+
+
+def _existing_ids(db: Session, model, ids) -> set[int]:
+    """Which of `ids` exist, in one `WHERE id IN (...)`; None ids are ignored."""
+    wanted = {i for i in ids if i is not None}
+    if not wanted:
+        return set()
+    return set(db.scalars(select(model.id).where(model.id.in_(wanted))))
+
+
+def _insert_many(db: Session, model, rows: list[dict]) -> list:
+    """Multi-row INSERT ... RETURNING, rows returned in input order."""
+    if not rows:
+        return []
+    stmt = insert(model).returning(model, sort_by_parameter_order=True)
+    with integrity_errors():
+        return list(db.scalars(stmt, rows))
+
+
+# --- Write helpers ---
+def _flush(db: Session) -> None:
+    """Flush pending writes; unique/FK violations surface as CONFLICT/NOT_FOUND."""
+    with integrity_errors():
+        db.flush()
+
+
+def _publish_work_order(db: Session, wo: WorkOrder, *department_ids) -> None:
+    """`workOrderChanged` for `wo`'s department and any it moved out of."""
+    data = snapshot(wo)
+    for department_id in {wo.department_id, *department_ids}:
+        emit(db, Event("work_order", department_id, data))
+
+
+def _publish_work_order_op(db: Session, op: WorkOrderOp, *work_center_ids) -> None:
+    """`workOrderOpChanged` for `op`'s work center and any it moved out of."""
+    data = snapshot(op)
+    for work_center_id in {op.work_center_id, *work_center_ids}:
+        emit(db, Event("work_order_op", work_center_id, data))
+
+
+def _part_department(part_id: int):
+    """Scalar subquery for a part's department, so defaulting it costs no round trip."""
+    return select(Part.department_id).where(Part.id == part_id).scalar_subquery()
+
+
 # --- Repository layer ---
 
 class FloorRepo:
@@ -62,30 +298,53 @@ class FloorRepo:
         limit_, offset_ = _coerce_pagination(limit, offset)
         return self.db.query(Floor).offset(offset_).limit(limit_).all()
 
+    def page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[Floor], bool, bool]:
+        return _keyset_page(self.db.query(Floor), Floor, first, after)
+
     def get(self, floor_id: int) -> Floor | None:
         return self.db.get(Floor, floor_id)
 
+    def by_ids(self, ids: list[int]) -> list[Floor]:
+        return self.db.query(Floor).filter(Floor.id.in_(ids)).all()
+
     def by_name(self, name: str) -> Floor | None:
         return self.db.query(Floor).filter(Floor.name == name).first()
 
     def create(self, floor: Floor) -> Floor:
         self.db.add(floor)
-        self.db.commit()
-        self.db.refresh(floor)
+        _flush(self.db)
         return floor
 
     def delete(self, floor: Floor) -> None:
         self.db.delete(floor)
-        self.db.commit()
+        _flush(self.db)
 
 
 class FloorZoneRepo:
     def __init__(self, db: Session):
         self.db = db
 
-    def list(self, limit: int | None = None, offset: int | None = None) -> list[FloorZone]:
+    def list(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        filters: FloorZoneFilter | None = None,
+    ) -> list[FloorZone]:
         limit_, offset_ = _coerce_pagination(limit, offset)
-        return self.db.query(FloorZone).offset(offset_).limit(limit_).all()
+        if filters is None:
+            return self.db.query(FloorZone).offset(offset_).limit(limit_).all()
+        query = _apply_filter(self.db.query(FloorZone), FloorZone, filters)
+        return query.order_by(FloorZone.id).offset(offset_).limit(limit_).all()
+
+    def page(
+        self,
+        first: int | None = None,
+        after: int | Cursor | None = None,
+        filters: FloorZoneFilter | None = None,
+    ) -> tuple[list[FloorZone], bool, bool]:
+        return _keyset_page(self.db.query(FloorZone), FloorZone, first, after, filters)
 
     def list_by_floor(self, floor_id: int) -> list[FloorZone]:
         return self.db.query(FloorZone).filter(FloorZone.floor_id == floor_id).all()
@@ -95,13 +354,12 @@ class FloorZoneRepo:
 
     def create(self, zone: FloorZone) -> FloorZone:
         self.db.add(zone)
-        self.db.commit()
-        self.db.refresh(zone)
+        _flush(self.db)
         return zone
 
     def delete(self, zone: FloorZone) -> None:
         self.db.delete(zone)
-        self.db.commit()
+        _flush(self.db)
 
 
 class UserRepo:
@@ -115,18 +373,22 @@ class UserRepo:
         limit_, offset_ = _coerce_pagination(limit, offset)
         return self.db.query(User).offset(offset_).limit(limit_).all()
 
+    def page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[User], bool, bool]:
+        return _keyset_page(self.db.query(User), User, first, after)
+
     def get(self, user_id: int) -> User | None:
         return self.db.get(User, user_id)
 
     def create(self, user: User) -> User:
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        _flush(self.db)
         return user
 
     def delete(self, user: User) -> None:
         self.db.delete(user)
-        self.db.commit()
+        _flush(self.db)
 
 
 class DepartmentRepo:
@@ -140,18 +402,25 @@ class DepartmentRepo:
         limit_, offset_ = _coerce_pagination(limit, offset)
         return self.db.query(Department).offset(offset_).limit(limit_).all()
 
+    def page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[Department], bool, bool]:
+        return _keyset_page(self.db.query(Department), Department, first, after)
+
     def get(self, department_id: int) -> Department | None:
         return self.db.get(Department, department_id)
 
+    def by_ids(self, ids: list[int]) -> list[Department]:
+        return self.db.query(Department).filter(Department.id.in_(ids)).all()
+
     def create(self, department: Department) -> Department:
         self.db.add(department)
-        self.db.commit()
-        self.db.refresh(department)
+        _flush(self.db)
         return department
 
     def delete(self, department: Department) -> None:
         self.db.delete(department)
-        self.db.commit()
+        _flush(self.db)
 
 
 class PartRepo:
@@ -162,18 +431,35 @@ class PartRepo:
         limit_, offset_ = _coerce_pagination(limit, offset)
         return self.db.query(Part).offset(offset_).limit(limit_).all()
 
+    def page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[Part], bool, bool]:
+        return _keyset_page(self.db.query(Part), Part, first, after)
+
     def get(self, part_id: int) -> Part | None:
         return self.db.get(Part, part_id)
 
+    def by_ids(self, ids: list[int]) -> list[Part]:
+        return self.db.query(Part).filter(Part.id.in_(ids)).all()
+
+    def department_ids(self, part_ids) -> dict[int, int | None]:
+        """Map each existing part id to its department id, in one query."""
+        wanted = {i for i in part_ids if i is not None}
+        if not wanted:
+            return {}
+        rows = self.db.execute(
+            select(Part.id, Part.department_id).where(Part.id.in_(wanted))
+        )
+        return {part_id: department_id for part_id, department_id in rows}
+
     def create(self, part: Part) -> Part:
         self.db.add(part)
-        self.db.commit()
-        self.db.refresh(part)
+        _flush(self.db)
         return part
 
     def delete(self, part: Part) -> None:
         self.db.delete(part)
-        self.db.commit()
+        _flush(self.db)
 
 
 class DefectCategoryRepo:
@@ -187,18 +473,28 @@ class DefectCategoryRepo:
         limit_, offset_ = _coerce_pagination(limit, offset)
         return self.db.query(DefectCategory).offset(offset_).limit(limit_).all()
 
+    def page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[DefectCategory], bool, bool]:
+        return _keyset_page(self.db.query(DefectCategory), DefectCategory, first, after)
+
     def get(self, defect_category_id: int) -> DefectCategory | None:
         return self.db.get(DefectCategory, defect_category_id)
 
+    def by_ids(self, ids: list[int]) -> list[DefectCategory]:
+        return self.db.query(DefectCategory).filter(DefectCategory.id.in_(ids)).all()
+
+    def existing_ids(self, ids) -> set[int]:
+        return _existing_ids(self.db, DefectCategory, ids)
+
     def create(self, dc: DefectCategory) -> DefectCategory:
         self.db.add(dc)
-        self.db.commit()
-        self.db.refresh(dc)
+        _flush(self.db)
         return dc
 
     def delete(self, dc: DefectCategory) -> None:
         self.db.delete(dc)
-        self.db.commit()
+        _flush(self.db)
 
 
 class DefectRepo:
@@ -209,6 +505,11 @@ class DefectRepo:
         limit_, offset_ = _coerce_pagination(limit, offset)
         return self.db.query(Defect).offset(offset_).limit(limit_).all()
 
+    def page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[Defect], bool, bool]:
+        return _keyset_page(self.db.query(Defect), Defect, first, after)
+
     def get(self, defect_id: int) -> Defect | None:
         return self.db.get(Defect, defect_id)
 
@@ -246,13 +547,15 @@ class DefectRepo:
 
     def create(self, defect: Defect) -> Defect:
         self.db.add(defect)
-        self.db.commit()
-        self.db.refresh(defect)
+        _flush(self.db)
         return defect
 
+    def create_many(self, rows: list[dict]) -> list[Defect]:
+        return _insert_many(self.db, Defect, rows)
+
     def delete(self, defect: Defect) -> None:
         self.db.delete(defect)
-        self.db.commit()
+        _flush(self.db)
 
 
 class QualityRepo:
@@ -263,6 +566,11 @@ class QualityRepo:
         limit_, offset_ = _coerce_pagination(limit, offset)
         return self.db.query(Quality).offset(offset_).limit(limit_).all()
 
+    def page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[Quality], bool, bool]:
+        return _keyset_page(self.db.query(Quality), Quality, first, after)
+
     def get(self, quality_id: int) -> Quality | None:
         return self.db.get(Quality, quality_id)
 
@@ -271,13 +579,15 @@ class QualityRepo:
 
     def create(self, quality: Quality) -> Quality:
         self.db.add(quality)
-        self.db.commit()
-        self.db.refresh(quality)
+        _flush(self.db)
         return quality
 
+    def create_many(self, rows: list[dict]) -> list[Quality]:
+        return _insert_many(self.db, Quality, rows)
+
     def delete(self, quality: Quality) -> None:
         self.db.delete(quality)
-        self.db.commit()
+        _flush(self.db)
 
 
 class WorkCenterRepo:
@@ -291,18 +601,28 @@ class WorkCenterRepo:
         limit_, offset_ = _coerce_pagination(limit, offset)
         return self.db.query(WorkCenter).offset(offset_).limit(limit_).all()
 
+    def page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[WorkCenter], bool, bool]:
+        return _keyset_page(self.db.query(WorkCenter), WorkCenter, first, after)
+
     def get(self, work_center_id: int) -> WorkCenter | None:
         return self.db.get(WorkCenter, work_center_id)
 
+    def by_ids(self, ids: list[int]) -> list[WorkCenter]:
+        return self.db.query(WorkCenter).filter(WorkCenter.id.in_(ids)).all()
+
+    def existing_ids(self, ids) -> set[int]:
+        return _existing_ids(self.db, WorkCenter, ids)
+
     def create(self, wc: WorkCenter) -> WorkCenter:
         self.db.add(wc)
-        self.db.commit()
-        self.db.refresh(wc)
+        _flush(self.db)
         return wc
 
     def delete(self, wc: WorkCenter) -> None:
         self.db.delete(wc)
-        self.db.commit()
+        _flush(self.db)
 
 
 class WorkOrderRepo:
@@ -312,22 +632,71 @@ class WorkOrderRepo:
     def by_number(self, number: str) -> WorkOrder | None:
         return self.db.query(WorkOrder).filter(WorkOrder.number == number).first()
 
-    def list(self, limit: int | None = None, offset: int | None = None) -> list[WorkOrder]:
+    def existing_numbers(self, numbers) -> set[str]:
+        wanted = set(numbers)
+        if not wanted:
+            return set()
+        return set(
+            self.db.scalars(select(WorkOrder.number).where(WorkOrder.number.in_(wanted)))
+        )
+
+    def list(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        filters: WorkOrderFilter | None = None,
+        order_by: WorkOrderOrderBy | None = None,
+    ) -> list[WorkOrder]:
         limit_, offset_ = _coerce_pagination(limit, offset)
-        return self.db.query(WorkOrder).offset(offset_).limit(limit_).all()
+        if filters is None and order_by is None:
+            return self.db.query(WorkOrder).offset(offset_).limit(limit_).all()
+        query = _apply_filter(self.db.query(WorkOrder), WorkOrder, filters)
+        return _apply_order(query, WorkOrder, order_by).offset(offset_).limit(limit_).all()
+
+    def page(
+        self,
+        first: int | None = None,
+        after: int | Cursor | None = None,
+        filters: WorkOrderFilter | None = None,
+        order_by: WorkOrderOrderBy | None = None,
+    ) -> tuple[list[WorkOrder], bool, bool]:
+        return _keyset_page(self.db.query(WorkOrder), WorkOrder, first, after, filters, order_by)
 
     def get(self, work_order_id: int) -> WorkOrder | None:
         return self.db.get(WorkOrder, work_order_id)
 
+    def by_ids(self, ids: list[int]) -> list[WorkOrder]:
+        return self.db.query(WorkOrder).filter(WorkOrder.id.in_(ids)).all()
+
+    def existing_ids(self, ids) -> set[int]:
+        return _existing_ids(self.db, WorkOrder, ids)
+
+    def list_by_work_centers(
+        self, work_center_ids: list[int], per_center: int = MAX_LIMIT
+    ) -> list[WorkOrder]:
+        return _first_n_per_key(
+            self.db, WorkOrder, WorkOrder.work_center_id, work_center_ids, per_center
+        )
+
+    def list_by_parts(self, part_ids: list[int], per_part: int = MAX_LIMIT) -> list[WorkOrder]:
+        return _first_n_per_key(self.db, WorkOrder, WorkOrder.part_id, part_ids, per_part)
+
     def create(self, wo: WorkOrder) -> WorkOrder:
         self.db.add(wo)
-        self.db.commit()
-        self.db.refresh(wo)
+        _flush(self.db)
         return wo
 
+    def insert(self, values: dict) -> WorkOrder:
+        """Single INSERT ... RETURNING; `values` may hold SQL expressions."""
+        with integrity_errors():
+            return self.db.scalar(insert(WorkOrder).values(**values).returning(WorkOrder))
+
+    def create_many(self, rows: list[dict]) -> list[WorkOrder]:
+        return _insert_many(self.db, WorkOrder, rows)
+
     def delete(self, wo: WorkOrder) -> None:
         self.db.delete(wo)
-        self.db.commit()
+        _flush(self.db)
 
 
 class WorkOrderOpRepo:
@@ -338,6 +707,11 @@ class WorkOrderOpRepo:
         limit_, offset_ = _coerce_pagination(limit, offset)
         return self.db.query(WorkOrderOp).offset(offset_).limit(limit_).all()
 
+    def page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[WorkOrderOp], bool, bool]:
+        return _keyset_page(self.db.query(WorkOrderOp), WorkOrderOp, first, after)
+
     def list_by_work_order(self, work_order_id: int) -> list[WorkOrderOp]:
         return (
             self.db.query(WorkOrderOp)
@@ -351,44 +725,82 @@ class WorkOrderOpRepo:
 
     def create(self, op: WorkOrderOp) -> WorkOrderOp:
         self.db.add(op)
-        self.db.commit()
-        self.db.refresh(op)
+        _flush(self.db)
         return op
 
+    def create_many(self, rows: list[dict]) -> list[WorkOrderOp]:
+        return _insert_many(self.db, WorkOrderOp, rows)
+
     def delete(self, op: WorkOrderOp) -> None:
         self.db.delete(op)
-        self.db.commit()
+        _flush(self.db)
 
 
 class RoutingRepo:
     def __init__(self, db: Session):
         self.db = db
 
-    def list(self, limit: int | None = None, offset: int | None = None) -> list[Routing]:
+    def list(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        filters: RoutingFilter | None = None,
+    ) -> list[Routing]:
         limit_, offset_ = _coerce_pagination(limit, offset)
-        return self.db.query(Routing).offset(offset_).limit(limit_).all()
+        if filters is None:
+            return self.db.query(Routing).offset(offset_).limit(limit_).all()
+        query = _apply_filter(self.db.query(Routing), Routing, filters)
+        return query.order_by(Routing.id).offset(offset_).limit(limit_).all()
+
+    def page(
+        self,
+        first: int | None = None,
+        after: int | Cursor | None = None,
+        filters: RoutingFilter | None = None,
+    ) -> tuple[list[Routing], bool, bool]:
+        return _keyset_page(self.db.query(Routing), Routing, first, after, filters)
 
     def get(self, routing_id: int) -> Routing | None:
         return self.db.get(Routing, routing_id)
 
     def create(self, routing: Routing) -> Routing:
         self.db.add(routing)
-        self.db.commit()
-        self.db.refresh(routing)
+        _flush(self.db)
         return routing
 
     def delete(self, routing: Routing) -> None:
         self.db.delete(routing)
-        self.db.commit()
+        _flush(self.db)
 
 
 class RoutingStepRepo:
     def __init__(self, db: Session):
         self.db = db
 
-    def list(self, limit: int | None = None, offset: int | None = None) -> list[RoutingStep]:
+    def list(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        filters: RoutingStepFilter | None = None,
+    ) -> list[RoutingStep]:
         limit_, offset_ = _coerce_pagination(limit, offset)
-        return self.db.query(RoutingStep).offset(offset_).limit(limit_).all()
+        if filters is None:
+            return self.db.query(RoutingStep).offset(offset_).limit(limit_).all()
+        query = _apply_filter(self.db.query(RoutingStep), RoutingStep, filters)
+        return (
+            query.order_by(RoutingStep.routing_id, RoutingStep.sequence, RoutingStep.id)
+            .offset(offset_)
+            .limit(limit_)
+            .all()
+        )
+
+    def page(
+        self,
+        first: int | None = None,
+        after: int | Cursor | None = None,
+        filters: RoutingStepFilter | None = None,
+    ) -> tuple[list[RoutingStep], bool, bool]:
+        return _keyset_page(self.db.query(RoutingStep), RoutingStep, first, after, filters)
 
     def list_by_routing(self, routing_id: int) -> list[RoutingStep]:
         return (
@@ -403,35 +815,49 @@ class RoutingStepRepo:
 
     def create(self, step: RoutingStep) -> RoutingStep:
         self.db.add(step)
-        self.db.commit()
-        self.db.refresh(step)
+        _flush(self.db)
         return step
 
     def delete(self, step: RoutingStep) -> None:
         self.db.delete(step)
-        self.db.commit()
+        _flush(self.db)
 
 
 class BOMRepo:
     def __init__(self, db: Session):
         self.db = db
 
-    def list(self, limit: int | None = None, offset: int | None = None) -> list[BOM]:
+    def list(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        filters: BOMFilter | None = None,
+    ) -> list[BOM]:
         limit_, offset_ = _coerce_pagination(limit, offset)
-        return self.db.query(BOM).offset(offset_).limit(limit_).all()
+        if filters is None:
+            return self.db.query(BOM).offset(offset_).limit(limit_).all()
+        query = _apply_filter(self.db.query(BOM), BOM, filters)
+        return query.order_by(BOM.id).offset(offset_).limit(limit_).all()
+
+    def page(
+        self,
+        first: int | None = None,
+        after: int | Cursor | None = None,
+        filters: BOMFilter | None = None,
+    ) -> tuple[list[BOM], bool, bool]:
+        return _keyset_page(self.db.query(BOM), BOM, first, after, filters)
 
     def get(self, bom_id: int) -> BOM | None:
         return self.db.get(BOM, bom_id)
 
     def create(self, bom: BOM) -> BOM:
         self.db.add(bom)
-        self.db.commit()
-        self.db.refresh(bom)
+        _flush(self.db)
         return bom
 
     def delete(self, bom: BOM) -> None:
         self.db.delete(bom)
-        self.db.commit()
+        _flush(self.db)
 
 
 class BOMItemRepo:
@@ -442,6 +868,11 @@ class BOMItemRepo:
         limit_, offset_ = _coerce_pagination(limit, offset)
         return self.db.query(BOMItem).offset(offset_).limit(limit_).all()
 
+    def page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[BOMItem], bool, bool]:
+        return _keyset_page(self.db.query(BOMItem), BOMItem, first, after)
+
     def list_by_bom(self, bom_id: int) -> list[BOMItem]:
         return self.db.query(BOMItem).filter(BOMItem.bom_id == bom_id).all()
 
@@ -450,13 +881,12 @@ class BOMItemRepo:
 
     def create(self, item: BOMItem) -> BOMItem:
         self.db.add(item)
-        self.db.commit()
-        self.db.refresh(item)
+        _flush(self.db)
         return item
 
     def delete(self, item: BOMItem) -> None:
         self.db.delete(item)
-        self.db.commit()
+        _flush(self.db)
 
 
 class ActivityLogRepo:
@@ -467,6 +897,11 @@ class ActivityLogRepo:
         limit_, offset_ = _coerce_pagination(limit, offset)
         return self.db.query(ActivityLog).offset(offset_).limit(limit_).all()
 
+    def page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[ActivityLog], bool, bool]:
+        return _keyset_page(self.db.query(ActivityLog), ActivityLog, first, after)
+
     def get(self, log_id: int) -> ActivityLog | None:
         return self.db.get(ActivityLog, log_id)
 
@@ -474,16 +909,36 @@ class ActivityLogRepo:
         return (
             self.db.query(ActivityLog)
             .filter(ActivityLog.work_order_id == work_order_id)
+            .order_by(ActivityLog.created_at)
             .all()
         )
 
     def create(self, log: ActivityLog) -> ActivityLog:
         self.db.add(log)
-        self.db.commit()
-        self.db.refresh(log)
+        _flush(self.db)
         return log
 
 
+def activity_log_values(data: ActivityLogInput) -> dict:
+    return dict(
+        user_id=data.user_id,
+        part_id=data.part_id,
+        department_id=data.department_id,
+        work_order_id=data.work_order_id,
+        event_type=data.event_type,
+        message=data.message,
+    )
+
+
+# Started by main's lifespan when ACTIVITY_LOG_WRITE_BEHIND is set
+activity_log_buffer = WriteBehindBuffer(
+    ActivityLog.__table__,
+    max_rows=settings.ACTIVITY_LOG_FLUSH_ROWS,
+    max_delay=settings.ACTIVITY_LOG_FLUSH_MS / 1000,
+    max_queue=settings.ACTIVITY_LOG_QUEUE_SIZE,
+)
+
+
 class MutationService:
     def __init__(self, db: Session):
         self.db = db
@@ -503,14 +958,10 @@ class MutationService:
         self.activity_logs = ActivityLogRepo(db)
         self.floors = FloorRepo(db)
         self.floor_zones = FloorZoneRepo(db)
+        self.defect_rollup = DefectRollup(db)
 
     # ---- Floor CRUD ----
     def add_floor(self, data: FloorInput) -> Floor:
-        if self.floors.by_name(data.name):
-            raise GraphQLError(
-                "Floor already exists; check name.",
-                extensions={"code": "CONFLICT"},
-            )
         return self.floors.create(Floor(name=data.name, description=data.description))
 
     def update_floor(self, floor_id: int, data: FloorInput) -> Floor:
@@ -519,14 +970,9 @@ class MutationService:
             raise GraphQLError(
                 f"Floor {floor_id} not found", extensions={"code": "NOT_FOUND"}
             )
-        if data.name and data.name != floor.name and self.floors.by_name(data.name):
-            raise GraphQLError(
-                "Floor already exists; check name.", extensions={"code": "CONFLICT"}
-            )
         floor.name = data.name
         floor.description = data.description
-        self.db.commit()
-        self.db.refresh(floor)
+        _flush(self.db)
         return floor
 
     def delete_floor(self, floor_id: int) -> bool:
@@ -591,8 +1037,7 @@ class MutationService:
         zone.department_id = data.department_id
         zone.work_center_id = data.work_center_id
         zone.polygon = data.polygon
-        self.db.commit()
-        self.db.refresh(zone)
+        _flush(self.db)
         return zone
 
     def delete_floor_zone(self, zone_id: int) -> bool:
@@ -606,10 +1051,6 @@ class MutationService:
 
     # ---- User CRUD ----
     def add_user(self, user_data: UserInput) -> User:
-        if self.users.by_username(user_data.username):
-            raise GraphQLError(
-                "User already exists; check username.", extensions={"code": "CONFLICT"}
-            )
         return self.users.create(
             User(
                 username=user_data.username,
@@ -625,16 +1066,11 @@ class MutationService:
             raise GraphQLError(
                 f"User {user_id} not found", extensions={"code": "NOT_FOUND"}
             )
-        if data.username and data.username != user.username and self.users.by_username(data.username):
-            raise GraphQLError(
-                "User already exists; check username.", extensions={"code": "CONFLICT"}
-            )
         user.username = data.username
         user.department_id = data.department_id
         user.job = data.job
         user.time = data.time
-        self.db.commit()
-        self.db.refresh(user)
+        _flush(self.db)
         return user
 
     def delete_user(self, user_id: int) -> bool:
@@ -648,11 +1084,6 @@ class MutationService:
 
     # ---- Department CRUD ----
     def add_department(self, department_data: DepartmentInput) -> Department:
-        if self.departments.by_title(department_data.title):
-            raise GraphQLError(
-                "Department already exists; check title.",
-                extensions={"code": "CONFLICT"},
-            )
         return self.departments.create(
             Department(
                 title=department_data.title,
@@ -669,8 +1100,7 @@ class MutationService:
             )
         department.title = data.title
         department.description = data.description
-        self.db.commit()
-        self.db.refresh(department)
+        _flush(self.db)
         return department
 
     def delete_department(self, department_id: int) -> bool:
@@ -695,10 +1125,11 @@ class MutationService:
             raise GraphQLError(
                 f"Part {part_id} not found", extensions={"code": "NOT_FOUND"}
             )
+        if data.department_id != part.department_id:
+            self.defect_rollup.move_part(part.id, data.department_id)
         part.name = data.name
         part.department_id = data.department_id
-        self.db.commit()
-        self.db.refresh(part)
+        _flush(self.db)
         return part
 
     def delete_part(self, part_id: int) -> bool:
@@ -746,8 +1177,7 @@ class MutationService:
             )
         dc.title = data.title
         dc.department_id = data.department_id
-        self.db.commit()
-        self.db.refresh(dc)
+        _flush(self.db)
         return dc
 
     def delete_defect_category(self, defect_category_id: int) -> bool:
@@ -762,7 +1192,7 @@ class MutationService:
 
     # ---- Defect CRUD ----
     def add_defect(self, defect_data: DefectInput) -> Defect:
-        return self.defects.create(
+        defect = self.defects.create(
             Defect(
                 title=defect_data.title,
                 description=defect_data.description,
@@ -770,6 +1200,8 @@ class MutationService:
                 defect_category_id=defect_data.defect_category_id,
             )
         )
+        self.defect_rollup.apply(Counter([rollup_key(defect)]))
+        return defect
 
     def update_defect(self, defect_id: int, data: DefectInput) -> Defect:
         defect = self.defects.get(defect_id)
@@ -777,12 +1209,18 @@ class MutationService:
             raise GraphQLError(
                 f"Defect {defect_id} not found", extensions={"code": "NOT_FOUND"}
             )
+        before = rollup_key(defect)
         defect.title = data.title
         defect.description = data.description
         defect.part_id = data.part_id
         defect.defect_category_id = data.defect_category_id
-        self.db.commit()
-        self.db.refresh(defect)
+        _flush(self.db)
+        after = rollup_key(defect)
+        if after != before:
+            moved = Counter()
+            moved[before] -= 1
+            moved[after] += 1
+            self.defect_rollup.apply(moved)
         return defect
 
     def delete_defect(self, defect_id: int) -> bool:
@@ -791,7 +1229,9 @@ class MutationService:
             raise GraphQLError(
                 f"Defect {defect_id} not found", extensions={"code": "NOT_FOUND"}
             )
+        key = rollup_key(defect)
         self.defects.delete(defect)
+        self.defect_rollup.apply(Counter({key: -1}))
         return True
 
     # ---- Quality CRUD ----
@@ -813,8 +1253,7 @@ class MutationService:
         quality.pass_fail = data.pass_fail
         quality.defect_count = data.defect_count
         quality.part_id = data.part_id
-        self.db.commit()
-        self.db.refresh(quality)
+        _flush(self.db)
         return quality
 
     def delete_quality(self, quality_id: int) -> bool:
@@ -828,16 +1267,6 @@ class MutationService:
 
     # ---- WorkCenter CRUD ----
     def add_work_center(self, data: WorkCenterInput) -> WorkCenter:
-        if data.code and self.work_centers.by_code(data.code):
-            raise GraphQLError(
-                "Work center code already exists; check code.",
-                extensions={"code": "CONFLICT"},
-            )
-        if data.department_id is not None and not self.departments.get(data.department_id):
-            raise GraphQLError(
-                f"Department {data.department_id} not found",
-                extensions={"code": "NOT_FOUND"},
-            )
         return self.work_centers.create(
             WorkCenter(name=data.name, code=data.code, department_id=data.department_id)
         )
@@ -849,21 +1278,10 @@ class MutationService:
                 f"Work center {work_center_id} not found",
                 extensions={"code": "NOT_FOUND"},
             )
-        if data.code and data.code != wc.code and self.work_centers.by_code(data.code):
-            raise GraphQLError(
-                "Work center code already exists; check code.",
-                extensions={"code": "CONFLICT"},
-            )
-        if data.department_id is not None and not self.departments.get(data.department_id):
-            raise GraphQLError(
-                f"Department {data.department_id} not found",
-                extensions={"code": "NOT_FOUND"},
-            )
         wc.name = data.name
         wc.code = data.code
         wc.department_id = data.department_id
-        self.db.commit()
-        self.db.refresh(wc)
+        _flush(self.db)
         return wc
 
     def delete_work_center(self, work_center_id: int) -> bool:
@@ -878,26 +1296,15 @@ class MutationService:
 
     # ---- WorkOrder CRUD ----
     def add_work_order(self, data: WorkOrderInput) -> WorkOrder:
-        if self.work_orders.by_number(data.number):
-            raise GraphQLError(
-                "Work order already exists; check number.",
-                extensions={"code": "CONFLICT"},
-            )
-        part = self.parts.get(data.part_id)
-        if not part:
-            raise GraphQLError(
-                f"Part {data.part_id} not found", extensions={"code": "NOT_FOUND"}
-            )
-        if data.work_center_id is not None and not self.work_centers.get(data.work_center_id):
-            raise GraphQLError(
-                f"Work center {data.work_center_id} not found",
-                extensions={"code": "NOT_FOUND"},
-            )
+        # Duplicate numbers and unknown part/work center ids are left to the
+        # constraints; see app/api/errors.py.
         department_id = (
-            data.department_id if data.department_id is not None else part.department_id
+            data.department_id
+            if data.department_id is not None
+            else _part_department(data.part_id)
         )
-        return self.work_orders.create(
-            WorkOrder(
+        wo = self.work_orders.insert(
+            dict(
                 number=data.number,
                 status=data.status,
                 quantity=data.quantity,
@@ -906,6 +1313,8 @@ class MutationService:
                 work_center_id=data.work_center_id,
             )
         )
+        _publish_work_order(self.db, wo)
+        return wo
 
     def update_work_order(self, work_order_id: int, data: WorkOrderInput) -> WorkOrder:
         wo = self.work_orders.get(work_order_id)
@@ -914,31 +1323,21 @@ class MutationService:
                 f"Work order {work_order_id} not found",
                 extensions={"code": "NOT_FOUND"},
             )
-        if data.number and data.number != wo.number and self.work_orders.by_number(data.number):
-            raise GraphQLError(
-                "Work order already exists; check number.",
-                extensions={"code": "CONFLICT"},
-            )
-        part = self.parts.get(data.part_id)
-        if not part:
-            raise GraphQLError(
-                f"Part {data.part_id} not found", extensions={"code": "NOT_FOUND"}
-            )
-        if data.work_center_id is not None and not self.work_centers.get(data.work_center_id):
-            raise GraphQLError(
-                f"Work center {data.work_center_id} not found",
-                extensions={"code": "NOT_FOUND"},
-            )
+        previous_department_id = wo.department_id
         wo.number = data.number
         wo.status = data.status
         wo.quantity = data.quantity
         wo.part_id = data.part_id
-        wo.department_id = (
-            data.department_id if data.department_id is not None else part.department_id
-        )
+        if data.department_id is not None:
+            wo.department_id = data.department_id
+        else:
+            # a plain value rather than _part_department: a SQL expression is
+            # expired by the flush and would cost a refresh to read back
+            part = self.parts.get(data.part_id)
+            wo.department_id = part.department_id if part else None
         wo.work_center_id = data.work_center_id
-        self.db.commit()
-        self.db.refresh(wo)
+        _flush(self.db)
+        _publish_work_order(self.db, wo, previous_department_id)
         return wo
 
     def delete_work_order(self, work_order_id: int) -> bool:
@@ -970,7 +1369,7 @@ class MutationService:
             raise GraphQLError(
                 f"Invalid datetime format: {e}", extensions={"code": "BAD_USER_INPUT"}
             )
-        return self.work_order_ops.create(
+        op = self.work_order_ops.create(
             WorkOrderOp(
                 work_order_id=data.work_order_id,
                 sequence=data.sequence,
@@ -980,6 +1379,8 @@ class MutationService:
                 completed_at=completed_at,
             )
         )
+        _publish_work_order_op(self.db, op)
+        return op
 
     def update_work_order_op(self, op_id: int, data: WorkOrderOpInput) -> WorkOrderOp:
         op = self.work_order_ops.get(op_id)
@@ -999,13 +1400,14 @@ class MutationService:
             raise GraphQLError(
                 f"Invalid datetime format: {e}", extensions={"code": "BAD_USER_INPUT"}
             )
+        previous_work_center_id = op.work_center_id
         op.sequence = data.sequence
         op.work_center_id = data.work_center_id
         op.status = data.status
         op.started_at = started_at
         op.completed_at = completed_at
-        self.db.commit()
-        self.db.refresh(op)
+        _flush(self.db)
+        _publish_work_order_op(self.db, op, previous_work_center_id)
         return op
 
     def delete_work_order_op(self, op_id: int) -> bool:
@@ -1040,8 +1442,7 @@ class MutationService:
         routing.name = data.name
         routing.part_id = data.part_id
         routing.version = data.version
-        self.db.commit()
-        self.db.refresh(routing)
+        _flush(self.db)
         return routing
 
     def delete_routing(self, routing_id: int) -> bool:
@@ -1089,8 +1490,7 @@ class MutationService:
         step.work_center_id = data.work_center_id
         step.description = data.description
         step.standard_minutes = data.standard_minutes
-        self.db.commit()
-        self.db.refresh(step)
+        _flush(self.db)
         return step
 
     def delete_routing_step(self, step_id: int) -> bool:
@@ -1122,8 +1522,7 @@ class MutationService:
             )
         bom.part_id = data.part_id
         bom.revision = data.revision
-        self.db.commit()
-        self.db.refresh(bom)
+        _flush(self.db)
         return bom
 
     def delete_bom(self, bom_id: int) -> bool:
@@ -1167,8 +1566,7 @@ class MutationService:
             )
         item.component_part_id = data.component_part_id
         item.quantity = data.quantity
-        self.db.commit()
-        self.db.refresh(item)
+        _flush(self.db)
         return item
 
     def delete_bom_item(self, item_id: int) -> bool:
@@ -1182,16 +1580,243 @@ class MutationService:
 
     # ---- ActivityLog (append-only) ----
     def add_activity_log(self, data: ActivityLogInput) -> ActivityLog:
-        return self.activity_logs.create(
-            ActivityLog(
-                user_id=data.user_id,
-                part_id=data.part_id,
-                department_id=data.department_id,
-                work_order_id=data.work_order_id,
-                event_type=data.event_type,
-                message=data.message,
-            )
+        return self.activity_logs.create(ActivityLog(**activity_log_values(data)))
+
+    # ---- Bulk inserts (validated set-wise, one INSERT ... RETURNING) ----
+    def add_work_orders(
+        self, items: list[WorkOrderInput]
+    ) -> tuple[list[WorkOrder], list[BulkItemError]]:
+        _check_bulk_size(items)
+        part_departments = self.parts.department_ids(i.part_id for i in items)
+        work_centers = self.work_centers.existing_ids(i.work_center_id for i in items)
+        taken = self.work_orders.existing_numbers(i.number for i in items)
+        rows, errors = [], []
+        for index, data in enumerate(items):
+            if data.number in taken:
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        code="CONFLICT",
+                        message=f"Work order {data.number} already exists; check number.",
+                    )
+                )
+            elif data.part_id not in part_departments:
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        code="NOT_FOUND",
+                        message=f"Part {data.part_id} not found",
+                    )
+                )
+            elif (
+                data.work_center_id is not None
+                and data.work_center_id not in work_centers
+            ):
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        code="NOT_FOUND",
+                        message=f"Work center {data.work_center_id} not found",
+                    )
+                )
+            else:
+                taken.add(data.number)
+                rows.append(
+                    dict(
+                        number=data.number,
+                        status=data.status,
+                        quantity=data.quantity,
+                        part_id=data.part_id,
+                        department_id=(
+                            data.department_id
+                            if data.department_id is not None
+                            else part_departments[data.part_id]
+                        ),
+                        work_center_id=data.work_center_id,
+                    )
+                )
+        created = self.work_orders.create_many(rows)
+        for wo in created:
+            _publish_work_order(self.db, wo)
+        return created, errors
+
+    def add_work_order_ops(
+        self, items: list[WorkOrderOpInput]
+    ) -> tuple[list[WorkOrderOp], list[BulkItemError]]:
+        _check_bulk_size(items)
+        work_orders = self.work_orders.existing_ids(i.work_order_id for i in items)
+        work_centers = self.work_centers.existing_ids(i.work_center_id for i in items)
+        rows, errors = [], []
+        for index, data in enumerate(items):
+            if data.work_order_id not in work_orders:
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        code="NOT_FOUND",
+                        message=f"Work order {data.work_order_id} not found",
+                    )
+                )
+                continue
+            if (
+                data.work_center_id is not None
+                and data.work_center_id not in work_centers
+            ):
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        code="NOT_FOUND",
+                        message=f"Work center {data.work_center_id} not found",
+                    )
+                )
+                continue
+            try:
+                started_at = (
+                    datetime.fromisoformat(data.started_at) if data.started_at else None
+                )
+                completed_at = (
+                    datetime.fromisoformat(data.completed_at)
+                    if data.completed_at
+                    else None
+                )
+            except ValueError as e:
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        code="BAD_USER_INPUT",
+                        message=f"Invalid datetime format: {e}",
+                    )
+                )
+                continue
+            rows.append(
+                dict(
+                    work_order_id=data.work_order_id,
+                    sequence=data.sequence,
+                    work_center_id=data.work_center_id,
+                    status=data.status,
+                    started_at=started_at,
+                    completed_at=completed_at,
+                )
+            )
+        created = self.work_order_ops.create_many(rows)
+        for op in created:
+            _publish_work_order_op(self.db, op)
+        return created, errors
+
+    def add_qualities(
+        self, items: list[QualityInput]
+    ) -> tuple[list[Quality], list[BulkItemError]]:
+        _check_bulk_size(items)
+        parts = self.parts.department_ids(i.part_id for i in items)
+        rows, errors = [], []
+        for index, data in enumerate(items):
+            if data.part_id not in parts:
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        code="NOT_FOUND",
+                        message=f"Part {data.part_id} not found",
+                    )
+                )
+                continue
+            rows.append(
+                dict(
+                    pass_fail=data.pass_fail,
+                    defect_count=data.defect_count,
+                    part_id=data.part_id,
+                )
+            )
+        return self.qualities.create_many(rows), errors
+
+    def add_defects(
+        self, items: list[DefectInput]
+    ) -> tuple[list[Defect], list[BulkItemError]]:
+        _check_bulk_size(items)
+        parts = self.parts.department_ids(i.part_id for i in items)
+        categories = self.defect_categories.existing_ids(
+            i.defect_category_id for i in items
         )
+        rows, errors = [], []
+        for index, data in enumerate(items):
+            if data.part_id not in parts:
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        code="NOT_FOUND",
+                        message=f"Part {data.part_id} not found",
+                    )
+                )
+                continue
+            if data.defect_category_id not in categories:
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        code="NOT_FOUND",
+                        message=f"Defect category {data.defect_category_id} not found",
+                    )
+                )
+                continue
+            rows.append(
+                dict(
+                    title=data.title,
+                    description=data.description,
+                    part_id=data.part_id,
+                    defect_category_id=data.defect_category_id,
+                )
+            )
+        created = self.defects.create_many(rows)
+        self.defect_rollup.apply(Counter(rollup_key(d) for d in created))
+        return created, errors
+
+
+# --- Detail page bundles ---
+# A part's routings and BOMs are eager-loaded onto it. Every other related
+# collection is capped at DETAIL_LIMIT: history tables newest-first,
+# structural children (a department's parts, a center's zones, ...) lowest id
+# first. Either way the statement count is fixed per page.
+DETAIL_LIMIT = 50
+OPEN_WORK_ORDER_STATUSES = ("open", "in_progress")
+ACTIVE_OP_STATUSES = ("pending", "in_progress")
+
+
+@dataclass
+class WorkCenterDetail:
+    work_center: WorkCenter
+    open_work_orders: list[WorkOrder]
+    active_operations: list[WorkOrderOp]
+    routing_steps: list[RoutingStep]
+    floor_zones: list[FloorZone]
+
+
+@dataclass
+class PartDetail:
+    part: Part
+    open_work_orders: list[WorkOrder]
+    recent_quality: list[Quality]
+    recent_defects: list[Defect]
+
+
+@dataclass
+class DepartmentDetail:
+    department: Department
+    open_work_orders: list[WorkOrder]
+    parts: list[Part]
+    work_centers: list[WorkCenter]
+    floor_zones: list[FloorZone]
+    defect_categories: list[DefectCategory]
+
+
+def _newest(db: Session, model, *criteria, limit: int = DETAIL_LIMIT) -> list:
+    return (
+        db.query(model)
+        .filter(*criteria)
+        .order_by(model.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def _oldest(db: Session, model, *criteria, limit: int = DETAIL_LIMIT) -> list:
+    return db.query(model).filter(*criteria).order_by(model.id).limit(limit).all()
 
 
 class QueryService:
@@ -1213,6 +1838,7 @@ class QueryService:
         self.activity_logs = ActivityLogRepo(db)
         self.floors = FloorRepo(db)
         self.floor_zones = FloorZoneRepo(db)
+        self.defect_rollup = DefectRollup(db)
 
     # ---- Users ----
     def get_all_users(
@@ -1220,6 +1846,11 @@ class QueryService:
     ) -> list[User]:
         return self.users.list(limit=limit, offset=offset)
 
+    def get_users_page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[User], bool, bool]:
+        return self.users.page(first=first, after=after)
+
     def get_user(self, user_id: int) -> User:
         user = self.users.get(user_id)
         if not user:
@@ -1232,7 +1863,17 @@ class QueryService:
     def get_all_departments(
         self, limit: int | None = None, offset: int | None = None
     ) -> list[Department]:
-        return self.departments.list(limit=limit, offset=offset)
+        return _cached_rows(
+            self.db,
+            "departments",
+            ("list", limit, offset),
+            lambda: self.departments.list(limit=limit, offset=offset),
+        )
+
+    def get_departments_page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[Department], bool, bool]:
+        return self.departments.page(first=first, after=after)
 
     def get_department(self, department_id: int) -> Department:
         department = self.departments.get(department_id)
@@ -1257,6 +1898,11 @@ class QueryService:
     ) -> list[Part]:
         return self.parts.list(limit=limit, offset=offset)
 
+    def get_parts_page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[Part], bool, bool]:
+        return self.parts.page(first=first, after=after)
+
     def get_part(self, part_id: int) -> Part:
         part = self.parts.get(part_id)
         if not part:
@@ -1269,7 +1915,17 @@ class QueryService:
     def get_all_defect_categories(
         self, limit: int | None = None, offset: int | None = None
     ) -> list[DefectCategory]:
-        return self.defect_categories.list(limit=limit, offset=offset)
+        return _cached_rows(
+            self.db,
+            "defect_categories",
+            ("list", limit, offset),
+            lambda: self.defect_categories.list(limit=limit, offset=offset),
+        )
+
+    def get_defect_categories_page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[DefectCategory], bool, bool]:
+        return self.defect_categories.page(first=first, after=after)
 
     def get_defect_category(self, defect_category_id: int) -> DefectCategory:
         dc = self.defect_categories.get(defect_category_id)
@@ -1286,6 +1942,11 @@ class QueryService:
     ) -> list[Defect]:
         return self.defects.list(limit=limit, offset=offset)
 
+    def get_defects_page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[Defect], bool, bool]:
+        return self.defects.page(first=first, after=after)
+
     def get_defect(self, defect_id: int) -> Defect:
         defect = self.defects.get(defect_id)
         if not defect:
@@ -1294,6 +1955,21 @@ class QueryService:
             )
         return defect
 
+    def get_defect_pareto(
+        self,
+        department_id: int | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        top: int = 10,
+    ) -> list[ParetoRow]:
+        if top < 1:
+            raise GraphQLError(
+                "top must be at least 1", extensions={"code": "BAD_USER_INPUT"}
+            )
+        return self.defect_rollup.pareto(
+            department_id, start, end, top=min(top, MAX_LIMIT)
+        )
+
     def get_defect_by_part_id(self, part_id: int) -> Defect:
         defect = self.defects.first_by_part(part_id)
         if not defect:
@@ -1340,6 +2016,11 @@ class QueryService:
     ) -> list[Quality]:
         return self.qualities.list(limit=limit, offset=offset)
 
+    def get_qualities_page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[Quality], bool, bool]:
+        return self.qualities.page(first=first, after=after)
+
     def get_quality(self, quality_id: int) -> Quality:
         quality = self.qualities.get(quality_id)
         if not quality:
@@ -1361,7 +2042,17 @@ class QueryService:
     def get_all_work_centers(
         self, limit: int | None = None, offset: int | None = None
     ) -> list[WorkCenter]:
-        return self.work_centers.list(limit=limit, offset=offset)
+        return _cached_rows(
+            self.db,
+            "work_centers",
+            ("list", limit, offset),
+            lambda: self.work_centers.list(limit=limit, offset=offset),
+        )
+
+    def get_work_centers_page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[WorkCenter], bool, bool]:
+        return self.work_centers.page(first=first, after=after)
 
     def get_work_center(self, work_center_id: int) -> WorkCenter:
         wc = self.work_centers.get(work_center_id)
@@ -1374,9 +2065,26 @@ class QueryService:
 
     # ---- WorkOrders ----
     def get_all_work_orders(
-        self, limit: int | None = None, offset: int | None = None
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        filters: WorkOrderFilter | None = None,
+        order_by: WorkOrderOrderBy | None = None,
     ) -> list[WorkOrder]:
-        return self.work_orders.list(limit=limit, offset=offset)
+        return self.work_orders.list(
+            limit=limit, offset=offset, filters=filters, order_by=order_by
+        )
+
+    def get_work_orders_page(
+        self,
+        first: int | None = None,
+        after: int | Cursor | None = None,
+        filters: WorkOrderFilter | None = None,
+        order_by: WorkOrderOrderBy | None = None,
+    ) -> tuple[list[WorkOrder], bool, bool]:
+        return self.work_orders.page(
+            first=first, after=after, filters=filters, order_by=order_by
+        )
 
     def get_work_order(self, work_order_id: int) -> WorkOrder:
         wo = self.work_orders.get(work_order_id)
@@ -1393,6 +2101,11 @@ class QueryService:
     ) -> list[WorkOrderOp]:
         return self.work_order_ops.list(limit=limit, offset=offset)
 
+    def get_work_order_ops_page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[WorkOrderOp], bool, bool]:
+        return self.work_order_ops.page(first=first, after=after)
+
     def get_work_order_op(self, op_id: int) -> WorkOrderOp:
         op = self.work_order_ops.get(op_id)
         if not op:
@@ -1406,9 +2119,20 @@ class QueryService:
 
     # ---- Routings ----
     def get_all_routings(
-        self, limit: int | None = None, offset: int | None = None
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        filters: RoutingFilter | None = None,
     ) -> list[Routing]:
-        return self.routings.list(limit=limit, offset=offset)
+        return self.routings.list(limit=limit, offset=offset, filters=filters)
+
+    def get_routings_page(
+        self,
+        first: int | None = None,
+        after: int | Cursor | None = None,
+        filters: RoutingFilter | None = None,
+    ) -> tuple[list[Routing], bool, bool]:
+        return self.routings.page(first=first, after=after, filters=filters)
 
     def get_routing(self, routing_id: int) -> Routing:
         r = self.routings.get(routing_id)
@@ -1420,9 +2144,20 @@ class QueryService:
 
     # ---- RoutingSteps ----
     def get_all_routing_steps(
-        self, limit: int | None = None, offset: int | None = None
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        filters: RoutingStepFilter | None = None,
     ) -> list[RoutingStep]:
-        return self.routing_steps.list(limit=limit, offset=offset)
+        return self.routing_steps.list(limit=limit, offset=offset, filters=filters)
+
+    def get_routing_steps_page(
+        self,
+        first: int | None = None,
+        after: int | Cursor | None = None,
+        filters: RoutingStepFilter | None = None,
+    ) -> tuple[list[RoutingStep], bool, bool]:
+        return self.routing_steps.page(first=first, after=after, filters=filters)
 
     def get_routing_step(self, step_id: int) -> RoutingStep:
         step = self.routing_steps.get(step_id)
@@ -1437,9 +2172,20 @@ class QueryService:
 
     # ---- BOMs ----
     def get_all_boms(
-        self, limit: int | None = None, offset: int | None = None
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        filters: BOMFilter | None = None,
     ) -> list[BOM]:
-        return self.boms.list(limit=limit, offset=offset)
+        return self.boms.list(limit=limit, offset=offset, filters=filters)
+
+    def get_boms_page(
+        self,
+        first: int | None = None,
+        after: int | Cursor | None = None,
+        filters: BOMFilter | None = None,
+    ) -> tuple[list[BOM], bool, bool]:
+        return self.boms.page(first=first, after=after, filters=filters)
 
     def get_bom(self, bom_id: int) -> BOM:
         b = self.boms.get(bom_id)
@@ -1455,6 +2201,11 @@ class QueryService:
     ) -> list[BOMItem]:
         return self.bom_items.list(limit=limit, offset=offset)
 
+    def get_bom_items_page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[BOMItem], bool, bool]:
+        return self.bom_items.page(first=first, after=after)
+
     def get_bom_item(self, item_id: int) -> BOMItem:
         item = self.bom_items.get(item_id)
         if not item:
@@ -1472,6 +2223,11 @@ class QueryService:
     ) -> list[ActivityLog]:
         return self.activity_logs.list(limit=limit, offset=offset)
 
+    def get_activity_logs_page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[ActivityLog], bool, bool]:
+        return self.activity_logs.page(first=first, after=after)
+
     def get_activity_logs_for_work_order(self, work_order_id: int) -> list[ActivityLog]:
         return self.activity_logs.list_by_work_order(work_order_id)
 
@@ -1479,7 +2235,17 @@ class QueryService:
     def get_all_floors(
         self, limit: int | None = None, offset: int | None = None
     ) -> list[Floor]:
-        return self.floors.list(limit=limit, offset=offset)
+        return _cached_rows(
+            self.db,
+            "floors",
+            ("list", limit, offset),
+            lambda: self.floors.list(limit=limit, offset=offset),
+        )
+
+    def get_floors_page(
+        self, first: int | None = None, after: int | Cursor | None = None
+    ) -> tuple[list[Floor], bool, bool]:
+        return self.floors.page(first=first, after=after)
 
     def get_floor(self, floor_id: int) -> Floor:
         floor = self.floors.get(floor_id)
@@ -1491,9 +2257,154 @@ class QueryService:
 
     # ---- FloorZones ----
     def get_all_floor_zones(
-        self, limit: int | None = None, offset: int | None = None
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        filters: FloorZoneFilter | None = None,
     ) -> list[FloorZone]:
-        return self.floor_zones.list(limit=limit, offset=offset)
+        return _cached_rows(
+            self.db,
+            "floor_zones",
+            ("list", limit, offset, _filter_key(filters)),
+            lambda: self.floor_zones.list(limit=limit, offset=offset, filters=filters),
+        )
+
+    def get_floor_zones_page(
+        self,
+        first: int | None = None,
+        after: int | Cursor | None = None,
+        filters: FloorZoneFilter | None = None,
+    ) -> tuple[list[FloorZone], bool, bool]:
+        return self.floor_zones.page(first=first, after=after, filters=filters)
 
     def get_floor_zones_by_floor(self, floor_id: int) -> list[FloorZone]:
-        return self.floor_zones.list_by_floor(floor_id)
+        return _cached_rows(
+            self.db,
+            "floor_zones",
+            ("by_floor", floor_id),
+            lambda: self.floor_zones.list_by_floor(floor_id),
+        )
+
+    # ---- Detail pages ----
+    def get_work_center_detail(self, work_center_id: int) -> WorkCenterDetail:
+        wc = (
+            self.db.query(WorkCenter)
+            .options(joinedload(WorkCenter.department))
+            .filter(WorkCenter.id == work_center_id)
+            .one_or_none()
+        )
+        if not wc:
+            raise GraphQLError(
+                f"Work center {work_center_id} not found",
+                extensions={"code": "NOT_FOUND"},
+            )
+        return WorkCenterDetail(
+            work_center=wc,
+            open_work_orders=_newest(
+                self.db,
+                WorkOrder,
+                WorkOrder.work_center_id == work_center_id,
+                WorkOrder.status.in_(OPEN_WORK_ORDER_STATUSES),
+            ),
+            active_operations=_newest(
+                self.db,
+                WorkOrderOp,
+                WorkOrderOp.work_center_id == work_center_id,
+                WorkOrderOp.status.in_(ACTIVE_OP_STATUSES),
+            ),
+            routing_steps=_oldest(
+                self.db, RoutingStep, RoutingStep.work_center_id == work_center_id
+            ),
+            floor_zones=_oldest(
+                self.db, FloorZone, FloorZone.work_center_id == work_center_id
+            ),
+        )
+
+    def get_part_detail(self, part_id: int) -> PartDetail:
+        part = (
+            self.db.query(Part)
+            .options(
+                joinedload(Part.department),
+                selectinload(Part.routings).selectinload(Routing.steps),
+                selectinload(Part.boms).selectinload(BOM.items),
+            )
+            .filter(Part.id == part_id)
+            .one_or_none()
+        )
+        if not part:
+            raise GraphQLError(
+                f"Part {part_id} not found", extensions={"code": "NOT_FOUND"}
+            )
+        return PartDetail(
+            part=part,
+            open_work_orders=_newest(
+                self.db,
+                WorkOrder,
+                WorkOrder.part_id == part_id,
+                WorkOrder.status.in_(OPEN_WORK_ORDER_STATUSES),
+            ),
+            recent_quality=_newest(self.db, Quality, Quality.part_id == part_id),
+            recent_defects=_newest(self.db, Defect, Defect.part_id == part_id),
+        )
+
+    def get_department_detail(self, department_id: int) -> DepartmentDetail:
+        department = self.departments.get(department_id)
+        if not department:
+            raise GraphQLError(
+                f"Department {department_id} not found",
+                extensions={"code": "NOT_FOUND"},
+            )
+        return DepartmentDetail(
+            department=department,
+            open_work_orders=_newest(
+                self.db,
+                WorkOrder,
+                WorkOrder.department_id == department_id,
+                WorkOrder.status.in_(OPEN_WORK_ORDER_STATUSES),
+            ),
+            parts=_oldest(self.db, Part, Part.department_id == department_id),
+            work_centers=_oldest(
+                self.db, WorkCenter, WorkCenter.department_id == department_id
+            ),
+            floor_zones=_oldest(
+                self.db, FloorZone, FloorZone.department_id == department_id
+            ),
+            defect_categories=_oldest(
+                self.db, DefectCategory, DefectCategory.department_id == department_id
+            ),
+        )
+
+
+# --- Awaitable service facades (sync or async sessions) ---
+
+class _AwaitableService:
+    """Expose every public method of `service_cls` as a coroutine.
+
+    Calls go through run_in_session: a plain Session runs in the
+    threadpool, an AsyncSession runs the same repo code via run_sync;
+    neither blocks the event loop.
+    """
+
+    service_cls: type
+
+    def __init__(self, db: DbSession):
+        self.db = db
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or not callable(getattr(self.service_cls, name, None)):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return await run_in_session(
+                self.db, lambda s: getattr(self.service_cls(s), name)(*args, **kwargs)
+            )
+
+        return call
+
+
+class AsyncMutationService(_AwaitableService):
+    service_cls = MutationService
+
+
+class AsyncQueryService(_AwaitableService):
+    service_cls = QueryService
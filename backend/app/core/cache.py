@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import itertools
+import secrets
+import threading
+import time
+import weakref
+from collections import OrderedDict, defaultdict
+from typing import Callable, Hashable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, ORMExecuteState, Session, object_session
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_PENDING_KEY = "written_tables"
+
+
+class CacheStats:
+    """Process-wide counters for a TTLCache."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # dropped to stay within maxsize
+        self.expirations = 0  # dropped because the TTL ran out
+        self.invalidations = 0  # namespaces invalidated by writes
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(vars(self))
+
+
+class TTLCache:
+    """Read-through cache bounded by entry count (LRU) and age (TTL).
+
+    Keys are tuples whose first element is a namespace (normally a table
+    name); `invalidate(namespace)` drops every key in it. A load that was
+    already running when its namespace got invalidated is not stored, so a
+    slow reader cannot put pre-write rows back.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._generations: dict[Hashable, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get_or_load(self, key: tuple, load: Callable[[], T]) -> T:
+        if not self.enabled:
+            return load()
+        namespace = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return value
+                del self._entries[key]
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            generation = self._generations[namespace]
+
+        value = load()
+
+        with self._lock:
+            if self._generations[namespace] == generation:
+                self._entries[key] = (self._clock() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.stats.evictions += 1
+        return value
+
+    def invalidate(self, namespace: Hashable) -> None:
+        with self._lock:
+            self._generations[namespace] += 1
+            for key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[key]
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for namespace in list(self._generations):
+                self._generations[namespace] += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+reference_cache = TTLCache(
+    maxsize=settings.REFERENCE_CACHE_MAX_ENTRIES,
+    ttl=settings.REFERENCE_CACHE_TTL_SECONDS,
+)
+
+
+_bind_tokens: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_bind_counter = itertools.count(1)
+_bind_lock = threading.Lock()
+
+
+def bind_token(session: Session) -> int:
+    """Small id for the engine behind `session`, for use in cache keys.
+
+    Keeps rows from two databases in one process (tests, benchmarks) apart;
+    unlike id(), a token is never reused by a later engine.
+    """
+    bind = session.get_bind()
+    engine = getattr(bind, "engine", bind)
+    with _bind_lock:
+        token = _bind_tokens.get(engine)
+        if token is None:
+            token = _bind_tokens[engine] = next(_bind_counter)
+        return token
+
+
+class TableVersions:
+    """Per-table write counters, bumped after each commit that wrote the table.
+
+    A response built from tables whose versions have not moved is still
+    current, so the versions (plus the request) make a validator for HTTP
+    conditional requests. Counters live in this process; `epoch` changes on
+    every start so validators handed out before a restart never match. They
+    are not shared between workers, which is why ETags need WEB_CONCURRENCY=1.
+    """
+
+    def __init__(self) -> None:
+        self.epoch = secrets.token_hex(8)
+        self._versions: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def bump(self, tables) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] += 1
+
+    def snapshot(self, tables) -> tuple[tuple[str, int], ...]:
+        with self._lock:
+            return tuple((t, self._versions[t]) for t in sorted(tables))
+
+
+table_versions = TableVersions()
+
+
+def record_writes(session: Session, *tables: str) -> None:
+    """Mark `tables` as written by `session`'s current transaction.
+
+    On commit their versions are bumped and their reference-cache entries
+    dropped; a rollback forgets them. Doing this at commit rather than at
+    write time keeps a concurrent reader from re-caching the old committed
+    rows before our transaction lands. ORM flushes and DML run through the
+    session are recorded automatically; only raw SQL needs to call this.
+    """
+    session.info.setdefault(_PENDING_KEY, set()).update(tables)
+
+
+def pending_writes(session: Session) -> set[str]:
+    """Tables recorded by `record_writes` and not yet committed."""
+    return set(session.info.get(_PENDING_KEY, ()))
+
+
+def _record_row_write(mapper: Mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        record_writes(session, mapper.local_table.name)
+
+
+for _name in ("after_insert", "after_update", "after_delete"):
+    event.listen(Mapper, _name, _record_row_write)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_bulk_write(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None:
+            record_writes(state.session, table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_writes(session: Session) -> None:
+    tables = session.info.pop(_PENDING_KEY, ())
+    table_versions.bump(tables)
+    for table in tables:
+        reference_cache.invalidate(table)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_writes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -37,6 +37,53 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 1800
 
+    # Serve GraphQL on an AsyncEngine/AsyncSession instead of the sync pool
+    DB_ASYNC: bool = False
+
+    # In-process cache for reference data (departments, work centers, floors,
+    # floor zones, defect categories); 0 for either disables it
+    REFERENCE_CACHE_TTL_SECONDS: float = 300.0
+    REFERENCE_CACHE_MAX_ENTRIES: int = 256
+
+    # Automatic persisted queries: registry size, and allowlist-only mode that
+    # accepts nothing but the queries pinned from APQ_MANIFEST_PATH
+    APQ_MAX_ENTRIES: int = 1000
+    APQ_ALLOWLIST_ONLY: bool = False
+    APQ_MANIFEST_PATH: Optional[str] = None
+
+    # Parsed + validated GraphQL documents kept per process, keyed on the text
+    DOCUMENT_CACHE_MAX_ENTRIES: int = 512
+
+    # Pre-execution budget per operation; cost is the worst-case row count
+    # (list fields priced at their clamped `limit`/`first`). 0 disables.
+    QUERY_MAX_COST: int = 20000
+    QUERY_MAX_DEPTH: int = 8
+
+    # Warn when one normalized SQL statement runs more than this many times in
+    # a single operation (likely N+1); raise instead with DB_REPEAT_RAISE (dev)
+    DB_REPEAT_THRESHOLD: int = 20
+    DB_REPEAT_RAISE: bool = False
+
+    # Events buffered per GraphQL subscription; a subscriber that falls this
+    # far behind is disconnected rather than buffered without bound
+    SUBSCRIPTION_QUEUE_SIZE: int = 100
+
+    # Entity-change event bus: "memory" (this process only) or "postgres"
+    # (LISTEN/NOTIFY, reaches every worker; also spreads cache invalidation)
+    EVENT_BUS: str = "memory"
+
+    # Worker processes serving the app; uvicorn reads the same variable for
+    # --workers. GET ETags rely on per-process table versions and are only
+    # served when this is 1.
+    WEB_CONCURRENCY: int = 1
+
+    # Write-behind for addActivityLog: rows are queued and inserted in batches
+    # of FLUSH_ROWS or every FLUSH_MS; producers wait once QUEUE_SIZE are queued
+    ACTIVITY_LOG_WRITE_BEHIND: bool = False
+    ACTIVITY_LOG_FLUSH_ROWS: int = 500
+    ACTIVITY_LOG_FLUSH_MS: int = 50
+    ACTIVITY_LOG_QUEUE_SIZE: int = 10000
+
     # API
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Shop Floor API"
@@ -1,7 +1,12 @@
 from __future__ import annotations
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import time
+from contextvars import ContextVar
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
 from app.core.config import settings
+from app.core.metrics import pool_wait, registry
+
 
 engine = create_engine(
     settings.DATABASE_URL,
@@ -20,3 +25,77 @@ SessionLocal = sessionmaker(
     expire_on_commit=False,
     future=True,
 )
+
+# Async stack (psycopg 3 picks its async driver under create_async_engine)
+async_engine = (
+    create_async_engine(
+        settings.DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if settings.DB_ASYNC
+    else None
+)
+
+AsyncSessionLocal = (
+    async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    if async_engine is not None
+    else None
+)
+
+# When the current session began a transaction that has not connected yet;
+# the pool's checkout event turns it into the checkout wait
+_connection_wanted_at: ContextVar[float | None] = ContextVar(
+    "connection_wanted_at", default=None
+)
+
+
+def _want_connection(session: Session, transaction: SessionTransaction) -> None:
+    # a root transaction connects on its first statement, right after this
+    if transaction.parent is None:
+        _connection_wanted_at.set(time.perf_counter())
+
+
+def _transaction_ended(session: Session, transaction: SessionTransaction) -> None:
+    # one that never connected must not leave its stamp for a later checkout
+    if transaction.parent is None:
+        _connection_wanted_at.set(None)
+
+
+def _checked_out(dbapi_connection, connection_record, connection_proxy) -> None:
+    wanted_at = _connection_wanted_at.get()
+    if wanted_at is not None:
+        _connection_wanted_at.set(None)
+        pool_wait.observe(time.perf_counter() - wanted_at)
+
+
+def instrument_pool() -> None:
+    """Pool gauges and checkout wait for /metrics; called once at app creation.
+
+    Reads whichever engine serves GraphQL. SQLite (tests, local runs) has no
+    pool worth watching and is left alone.
+    """
+    serving = async_engine.sync_engine if async_engine is not None else engine
+    if serving.dialect.name == "sqlite":
+        return
+    pool = serving.pool
+    if not event.contains(pool, "checkout", _checked_out):
+        event.listen(Session, "after_transaction_create", _want_connection)
+        event.listen(Session, "after_transaction_end", _transaction_ended)
+        event.listen(pool, "checkout", _checked_out)
+    registry.gauge("db_pool_size", "Configured pool size.", pool.size)
+    registry.gauge(
+        "db_pool_checked_out", "Connections currently checked out.", pool.checkedout
+    )
+    registry.gauge(
+        "db_pool_overflow",
+        "Connections open beyond pool_size.",
+        lambda: max(pool.overflow(), 0),
+    )
@@ -0,0 +1,250 @@
+"""Entity-change events, delivered to every worker process.
+
+MutationService `emit`s events on its session; they are published when the
+transaction commits and discarded when it rolls back. Handlers `subscribe`
+to topics and receive events in batches (one call per transaction, or per
+NOTIFY payload).
+
+Two backends, picked with EVENT_BUS:
+
+* `memory` delivers to this process only, right after commit. Fine for a
+  single uvicorn worker, and for tests.
+* `postgres` sends the batch with pg_notify inside the committing
+  transaction, so it is delivered (to every worker, this one included) if
+  and only if the commit succeeds. Each worker LISTENs on a dedicated
+  connection built from the engine's URL. The tables the transaction wrote
+  ride along, so other workers drop their reference-cache entries too.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import select
+import threading
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Hashable, Iterable
+
+from sqlalchemy import DateTime, event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import pending_writes, reference_cache, table_versions
+from app.core.config import settings
+
+log = logging.getLogger("shop-floor.events")
+
+_PENDING_KEY = "pending_events"
+_TABLES_TOPIC = "tables"
+# pg_notify payloads must stay under 8000 bytes
+MAX_PAYLOAD = 7_900
+
+
+@dataclass(frozen=True)
+class Event:
+    """`topic` is what handlers subscribe to; `key` narrows it (e.g. a work center id)."""
+
+    topic: str
+    key: Hashable
+    data: dict
+
+
+Handler = Callable[[list[Event]], None]
+
+
+def snapshot(row) -> dict:
+    """JSON-safe column values of an ORM row."""
+    return {
+        attr.key: (value.isoformat() if isinstance(value, datetime) else value)
+        for attr in inspect(row).mapper.column_attrs
+        for value in (getattr(row, attr.key),)
+    }
+
+
+def restore(model, data: dict):
+    """Transient `model` instance from a `snapshot`."""
+    table = model.__table__
+    values = {
+        key: (
+            datetime.fromisoformat(value)
+            if value is not None and isinstance(table.c[key].type, DateTime)
+            else value
+        )
+        for key, value in data.items()
+    }
+    return model(**values)
+
+
+class EventBus:
+    """Routes published batches to the handlers subscribed to their topics."""
+
+    # publish inside the transaction (before commit) rather than after it
+    transactional = False
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, list[Handler]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topics: Iterable[str], handler: Handler) -> None:
+        """Call `handler` with batches of `topics` events; idempotent."""
+        with self._lock:
+            for topic in topics:
+                if handler not in self._handlers[topic]:
+                    self._handlers[topic].append(handler)
+
+    def dispatch(self, events: list[Event]) -> None:
+        """Hand `events` to each interested handler, one call per handler."""
+        with self._lock:
+            handlers = {t: list(h) for t, h in self._handlers.items()}
+        batches: dict[Handler, list[Event]] = defaultdict(list)
+        for e in events:
+            for handler in handlers.get(e.topic, ()):
+                batches[handler].append(e)
+        for handler, batch in batches.items():
+            try:
+                handler(batch)
+            except Exception:  # one broken handler must not starve the rest
+                log.exception("event handler %r failed", handler)
+
+    def publish(self, events: list[Event], connection=None) -> None:
+        raise NotImplementedError
+
+    def start(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryBus(EventBus):
+    def publish(self, events: list[Event], connection=None) -> None:
+        self.dispatch(events)
+
+
+def _pack(messages: list[dict], limit: int = MAX_PAYLOAD) -> list[str]:
+    """JSON arrays of `messages`, each at most `limit` bytes where possible."""
+    payloads, batch, size = [], [], 2
+    for message in messages:
+        encoded = json.dumps(message, separators=(",", ":"))
+        if batch and size + len(encoded) + 1 > limit:
+            payloads.append("[" + ",".join(batch) + "]")
+            batch, size = [], 2
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        payloads.append("[" + ",".join(batch) + "]")
+    return payloads
+
+
+class PostgresBus(EventBus):
+    """LISTEN/NOTIFY on one channel; topics are filtered by the receiver."""
+
+    transactional = True
+
+    def __init__(self, url, channel: str = "shop_floor_events"):
+        super().__init__()
+        # psycopg wants a libpq URL: no "+driver" suffix
+        self.conninfo = url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self.channel = channel
+        self.origin = table_versions.epoch
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def publish(self, events: list[Event], connection=None) -> None:
+        messages = [asdict(e) for e in events]
+        notify = text("SELECT pg_notify(:channel, :payload)")
+        for payload in _pack(messages):
+            connection.execute(notify, {"channel": self.channel, "payload": payload})
+
+    def receive(self, payload: str) -> None:
+        """Dispatch one NOTIFY payload; another worker's table writes invalidate caches here."""
+        events = [Event(**message) for message in json.loads(payload)]
+        for e in events:
+            if e.topic == _TABLES_TOPIC and e.key != self.origin:
+                tables = e.data["tables"]
+                table_versions.bump(tables)
+                for table in tables:
+                    reference_cache.invalidate(table)
+        self.dispatch([e for e in events if e.topic != _TABLES_TOPIC])
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._listen, name="event-bus-listener", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _listen(self) -> None:
+        import psycopg
+
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self.conninfo, autocommit=True) as conn:
+                    conn.add_notify_handler(lambda n: self.receive(n.payload))
+                    conn.execute(f"LISTEN {self.channel}")
+                    while not self._stop.is_set():
+                        # wake up at least once a second to notice close(); any
+                        # round trip runs the handler for notifications read
+                        ready, _, _ = select.select([conn.fileno()], [], [], 1.0)
+                        if ready:
+                            conn.execute("SELECT 1")
+            except Exception:
+                if not self._stop.is_set():
+                    log.exception("event bus listener lost its connection")
+                    self._stop.wait(1.0)
+
+
+def create_bus(kind: str) -> EventBus:
+    if kind == "memory":
+        return InMemoryBus()
+    if kind == "postgres":
+        from app.core.database import engine
+
+        return PostgresBus(engine.url)
+    raise ValueError(f"Unknown EVENT_BUS {kind!r}; use memory or postgres")
+
+
+bus = create_bus(settings.EVENT_BUS)
+
+
+def emit(session: Session, e: Event) -> None:
+    """Publish `e` when `session`'s transaction commits; dropped on rollback."""
+    session.info.setdefault(_PENDING_KEY, []).append(e)
+
+
+@event.listens_for(Session, "before_commit")
+def _publish_in_transaction(session: Session) -> None:
+    if not bus.transactional:
+        return
+    session.flush()  # so every write is recorded before we read them
+    events = session.info.pop(_PENDING_KEY, [])
+    tables = pending_writes(session)
+    if tables:
+        events.append(Event(_TABLES_TOPIC, bus.origin, {"tables": sorted(tables)}))
+    if events:
+        bus.publish(events, session.connection())
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    events = session.info.pop(_PENDING_KEY, None)
+    if events:
+        bus.publish(events)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction) -> None:
+    # soft: also when nothing reached the database yet; outermost only, so a
+    # rolled-back savepoint keeps the enclosing transaction's events
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
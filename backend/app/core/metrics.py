@@ -0,0 +1,197 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Deliberately tiny: counters, gauges computed at scrape time and fixed-bucket
+histograms, all labelled, no client library and no push gateway.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Callable, Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds; resolver latencies are mostly sub-10ms, pool waits can be long
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# label sets beyond this per metric are folded into one series, so client
+# supplied operation names cannot grow memory without bound
+MAX_SERIES = 1000
+OVERFLOW = "__other__"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._series: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        if key not in self._series and len(self._series) >= MAX_SERIES:
+            key = tuple(OVERFLOW for _ in self.label_names)
+        return key
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        with self._lock:
+            key = self._key(labels)
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._series.get(
+            tuple(str(labels.get(n, "")) for n in self.label_names), 0
+        )
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = sorted(self._series.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in series
+        ]
+
+
+class GaugeFunc(_Metric):
+    """Gauge whose value is read from `fn` at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float]):
+        super().__init__(name, help)
+        self.fn = fn
+
+    def render(self) -> list[str]:
+        try:
+            value = self.fn()
+        except Exception:  # a broken source must not break the whole scrape
+            return []
+        return self.header() + [f"{self.name} {_number(value)}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: Iterable[str] = (), buckets=DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            key = self._key(labels)
+            series = self._series.get(key)
+            if series is None:
+                # per-bucket (non-cumulative) counts, then sum and count
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(
+            tuple(str(labels.get(n, "")) for n in self.label_names)
+        )
+        return series[2] if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = sorted(
+                (k, (list(v[0]), v[1], v[2])) for k, v in self._series.items()
+            )
+        lines = self.header()
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = f'le="{_number(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}"
+                )
+            inf = _labels(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {count}")
+            lines.append(
+                f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}"
+            )
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.setdefault(metric.name, metric)
+        return self._metrics[metric.name]
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: Iterable[str] = (), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def gauge(self, name: str, help: str, fn: Callable[[], float]) -> GaugeFunc:
+        return self.register(GaugeFunc(name, help, fn))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+operation_duration = registry.histogram(
+    "graphql_operation_duration_seconds",
+    "Wall time of a GraphQL operation, parse to result.",
+    labels=("operation", "type"),
+)
+resolver_duration = registry.histogram(
+    "graphql_resolver_duration_seconds",
+    "Wall time of async (data-loading) GraphQL resolvers.",
+    labels=("field",),
+)
+graphql_errors = registry.counter(
+    "graphql_errors_total",
+    "GraphQL errors returned, by extensions.code.",
+    labels=("code",),
+)
+pool_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time from a session needing a DB connection until the pool handed one"
+    " over (waiting, connecting, pre-ping).",
+)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import AsyncIterator, Hashable, Iterator
+
+from strawberry.exceptions import GraphQLError
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+
+class SlowConsumerError(GraphQLError):
+    """A subscriber's queue filled up; its subscription is ended."""
+
+    def __init__(self, topic: Hashable):
+        super().__init__(
+            f"Subscription to {topic!r} fell behind and was closed; "
+            "re-query and subscribe again",
+            extensions={"code": "SLOW_CONSUMER"},
+        )
+
+
+class Subscriber:
+    """One subscription's bounded queue, owned by the event loop it was made on."""
+
+    def __init__(self, topic: Hashable, maxsize: int):
+        self.topic = topic
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = False
+
+    def offer(self, item) -> None:
+        """Enqueue without waiting; a full queue drops the subscriber instead."""
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped = True
+            subscriber_drops.inc()
+
+    async def __aiter__(self) -> AsyncIterator:
+        while True:
+            # a subscriber is only dropped with a full queue, so this never
+            # waits on a queue that will not be fed again
+            if self.dropped and self.queue.empty():
+                raise SlowConsumerError(self.topic)
+            yield await self.queue.get()
+
+
+class Broker:
+    """In-process publish/subscribe keyed on hashable topics.
+
+    `publish` never blocks and may be called from any thread: each item is
+    handed to the subscriber's own loop. Subscribers that let their queue
+    fill up are dropped (their iterator raises SlowConsumerError once the
+    backlog is drained), so one stalled screen costs at most `maxsize` items.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._subscribers: dict[Hashable, set[Subscriber]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+    @contextmanager
+    def subscribe(self, topic: Hashable) -> Iterator[Subscriber]:
+        subscriber = Subscriber(topic, self.maxsize)
+        with self._lock:
+            self._subscribers[topic].add(subscriber)
+        try:
+            yield subscriber
+        finally:
+            with self._lock:
+                subscribers = self._subscribers[topic]
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def publish(self, topic: Hashable, item) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for subscriber in subscribers:
+            if subscriber.loop is running:
+                subscriber.offer(item)
+            elif not subscriber.loop.is_closed():
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, item)
+
+    def forward(self, events) -> None:
+        """Event-bus handler: publish each event's data on `(topic, key)`."""
+        for e in events:
+            self.publish((e.topic, e.key), e.data)
+
+
+broker = Broker(settings.SUBSCRIPTION_QUEUE_SIZE)
+
+subscriber_drops = registry.counter(
+    "graphql_subscription_drops_total",
+    "Subscriptions closed because their queue was full.",
+)
+registry.gauge(
+    "graphql_subscribers", "Open GraphQL subscriptions.", lambda: len(broker)
+)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import Counter
+
+from graphql import GraphQLError
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+
+log = logging.getLogger("shop-floor.sql")
+
+_STATS_KEY = "query_stats"
+
+_PARAMS = re.compile(r"%\(\w+\)s|\$\d+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """Statement text with parameters and IN-lists collapsed, for grouping."""
+    statement = _PARAMS.sub("?", statement)
+    statement = _IN_LIST.sub("(?)", statement)
+    return _SPACE.sub(" ", statement).strip()
+
+
+class RepeatedStatementError(GraphQLError):
+    def __init__(self, statement: str, count: int):
+        super().__init__(
+            f"Statement ran {count} times in one request (N+1?): {statement}",
+            extensions={"code": "N_PLUS_ONE"},
+        )
+
+
+class QueryStats:
+    """Statements one request's session ran, and the time spent in them.
+
+    `threshold` is how often one normalized statement may run before it is
+    reported as a likely N+1; the report is a warning, or an error when
+    `raise_on_repeat` is set (dev mode).
+    """
+
+    def __init__(self, threshold: int = 0, raise_on_repeat: bool = False):
+        self.threshold = threshold
+        self.raise_on_repeat = raise_on_repeat
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        key = normalize(statement)
+        self.statements[key] += 1
+        repeats = self.statements[key]
+        if self.threshold and repeats == self.threshold + 1:
+            log.warning("statement repeated %d times in one request: %s", repeats, key)
+            if self.raise_on_repeat:
+                raise RepeatedStatementError(key, repeats)
+
+    @property
+    def milliseconds(self) -> float:
+        return round(self.seconds * 1000, 3)
+
+
+def track_queries(session, stats: QueryStats) -> None:
+    """Count every statement `session` runs from now on into `stats`."""
+    session.info[_STATS_KEY] = stats
+
+
+@event.listens_for(Session, "after_begin")
+def _bind_stats_to_connection(session, transaction, connection) -> None:
+    stats = session.info.get(_STATS_KEY)
+    if stats is not None:
+        connection.info[_STATS_KEY] = stats
+
+
+@event.listens_for(Pool, "checkin")
+def _unbind_stats(dbapi_connection, connection_record) -> None:
+    if connection_record is not None:
+        connection_record.info.pop(_STATS_KEY, None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, params, context, executemany):
+    stats = conn.info.get(_STATS_KEY)
+    if stats is not None:
+        stats.record(statement)
+        conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, params, context, executemany):
+    stats = conn.info.get(_STATS_KEY)
+    started = conn.info.pop("query_started", None)
+    if stats is not None and started is not None:
+        stats.seconds += time.perf_counter() - started
@@ -0,0 +1,116 @@
+from __future__ import annotations
+import asyncio
+from typing import Callable, TypeVar, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+DbSession = Union[Session, AsyncSession]
+
+
+async def run_in_session(db: DbSession, fn: Callable[[Session], T]) -> T:
+    """Run sync ORM code `fn(session)` against either kind of session.
+
+    An AsyncSession runs it through run_sync, so the I/O is awaited on the
+    async driver; a plain Session runs it in the threadpool, so its blocking
+    I/O never stalls the event loop. Sibling GraphQL fields resolve
+    concurrently and neither kind of session may be used concurrently, so
+    calls are serialized per session.
+    """
+    if isinstance(db, LazySession):
+        db = db.session
+    if isinstance(db, AsyncSession):
+        async with _session_lock(db.sync_session):
+            return await db.run_sync(fn)
+    async with _session_lock(db):
+        return await run_in_threadpool(fn, db)
+
+
+def _session_lock(session: Session) -> asyncio.Lock:
+    return session.info.setdefault("run_in_session_lock", asyncio.Lock())
+
+
+class LazySessionStats:
+    """Process-wide counters for LazySession usage."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.requests_without_checkout = 0
+
+    def record(self, checked_out: bool) -> None:
+        self.requests += 1
+        if not checked_out:
+            self.requests_without_checkout += 1
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(vars(self))
+
+
+lazy_session_stats = LazySessionStats()
+
+
+class LazySession:
+    """Defers creating the request session until a resolver first touches it.
+
+    Introspection, `__typename` probes and other DB-free operations never
+    build a session or check out a pooled connection.
+    """
+
+    def __init__(self, factory: Callable[[], DbSession]):
+        self._factory = factory
+        self._session: DbSession | None = None
+        self._closed = False
+        self._info: dict = {}
+
+    @property
+    def session(self) -> DbSession:
+        if self._closed:
+            # reopening here would leak a connection nobody closes; take a
+            # fresh() LazySession for work after the operation ended
+            raise RuntimeError("LazySession used after aclose()")
+        if self._session is None:
+            self._session = self._factory()
+            self._session.info.update(self._info)
+        return self._session
+
+    @property
+    def info(self) -> dict:
+        """`Session.info`, usable before the session exists (copied in on creation)."""
+        return self._info if self._session is None else self._session.info
+
+    def fresh(self) -> "LazySession":
+        """A new, unopened LazySession on the same factory."""
+        return LazySession(self._factory)
+
+    @property
+    def checked_out(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+    async def aclose(self) -> None:
+        """Release the connection back to the pool; safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+        lazy_session_stats.record(self.checked_out)
+        if self._session is None:
+            return
+        if isinstance(self._session, AsyncSession):
+            await self._session.close()
+        else:
+            await run_in_threadpool(self._session.close)
+
+
+async def end_unit_of_work(db: DbSession | LazySession, commit: bool) -> None:
+    """Commit (or roll back) everything the operation flushed, in one go."""
+    if isinstance(db, LazySession):
+        if not db.checked_out:
+            return
+        db = db.session
+    if isinstance(db, AsyncSession):
+        await (db.commit() if commit else db.rollback())
+    else:
+        await run_in_threadpool(db.commit if commit else db.rollback)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import Table, insert
+from sqlalchemy.engine import Engine, Row
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import table_versions
+from app.core.metrics import registry
+
+log = logging.getLogger("shop-floor.write-behind")
+
+flush_duration = registry.histogram(
+    "write_behind_flush_seconds",
+    "Time to insert one write-behind batch, by table.",
+    labels=("table",),
+)
+flushed_rows = registry.counter(
+    "write_behind_rows_total",
+    "Rows leaving a write-behind buffer, by table and outcome.",
+    labels=("table", "outcome"),
+)
+
+_STOP = object()
+
+
+class WriteBehindBuffer:
+    """Queue INSERTs for `table` in memory and write them in batches.
+
+    Rows are flushed once `max_rows` are waiting or the oldest has waited
+    `max_delay` seconds, in one transaction on a connection of its own, off
+    the event loop. On Postgres a batch is a single multi-row INSERT ...
+    RETURNING; SQLite cannot promise RETURNING order for those, so
+    SQLAlchemy sends its rows one by one (still one commit).
+    `submit` waits while `max_queue` rows are pending, which pushes back on
+    producers instead of growing memory.
+
+    If a batch fails (typically one row's foreign key) its rows are retried
+    one by one, so only the bad rows fail. Writes bypass the ORM session,
+    so the table's version is bumped here for ETags.
+
+    `start` and `close` run on the serving event loop (FastAPI lifespan);
+    `close` flushes everything still queued.
+    """
+
+    def __init__(
+        self, table: Table, *, max_rows: int, max_delay: float, max_queue: int
+    ):
+        self.table = table
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self._engine: Engine | None = None
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self, engine: Engine) -> None:
+        if self.running:
+            return
+        self._engine = engine
+        self._queue = asyncio.Queue(self.max_queue)
+        registry.gauge(
+            f"{self.table.name}_write_behind_queue_depth",
+            f"{self.table.name} rows waiting in the write-behind buffer.",
+            lambda: self.depth,
+        )
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop accepting rows, flush the backlog and wait for it to land."""
+        if not self.running:
+            return
+        task, self._task = self._task, None
+        await self._queue.put(_STOP)
+        await task
+
+    async def submit(self, values: dict, wait: bool = True) -> asyncio.Future | None:
+        """Queue one row; with `wait`, a future for the inserted Row.
+
+        Returns as soon as the row is queued (after waiting for room). The
+        future resolves once its batch commits, or fails with that row's
+        error. Without `wait`, failures are only logged and counted.
+        """
+        if not self.running:
+            raise RuntimeError(f"{self.table.name} write-behind buffer is not running")
+        future = asyncio.get_running_loop().create_future() if wait else None
+        await self._queue.put((values, future))
+        return future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_rows:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self._queue.get_nowait()
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+        # producers that were waiting for room when close() was called
+        leftovers = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                leftovers.append(item)
+        for start in range(0, len(leftovers), self.max_rows):
+            await self._flush(leftovers[start : start + self.max_rows])
+
+    async def _flush(self, batch: list[tuple[dict, asyncio.Future | None]]) -> None:
+        rows = [values for values, _ in batch]
+        start = time.perf_counter()
+        try:
+            results = await run_in_threadpool(self._insert_batch, rows)
+        except Exception:
+            log.warning(
+                "%s batch of %d failed; retrying row by row",
+                self.table.name,
+                len(rows),
+                exc_info=True,
+            )
+            results = await run_in_threadpool(self._insert_each, rows)
+        flush_duration.observe(time.perf_counter() - start, table=self.table.name)
+        table_versions.bump([self.table.name])
+
+        for (values, future), result in zip(batch, results):
+            failed = isinstance(result, Exception)
+            flushed_rows.inc(
+                table=self.table.name, outcome="failed" if failed else "inserted"
+            )
+            if future is None:
+                if failed:
+                    log.error("dropped %s row %r: %s", self.table.name, values, result)
+            elif not future.done():
+                if failed:
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _insert_batch(self, rows: list[dict]) -> list[Row]:
+        stmt = insert(self.table).returning(*self.table.c, sort_by_parameter_order=True)
+        with self._engine.begin() as conn:
+            return list(conn.execute(stmt, rows))
+
+    def _insert_each(self, rows: list[dict]) -> list[Row | Exception]:
+        stmt = insert(self.table).returning(*self.table.c)
+        results: list[Row | Exception] = []
+        for values in rows:
+            try:
+                with self._engine.begin() as conn:
+                    results.append(conn.execute(stmt, values).one())
+            except Exception as exc:
+                results.append(exc)
+        return results
@@ -1,5 +1,15 @@
 import strawberry
-from typing import Optional
+from enum import Enum
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+async def _load(info, loader: str, key):
+    """Resolve `key` through the request's DataLoader; None keys short-circuit."""
+    if key is None:
+        return None
+    return await getattr(info.context["loaders"], loader).load(key)
 
 
 @strawberry.type
@@ -8,6 +18,10 @@ class FloorType:
     name: str
     description: Optional[str]
 
+    @classmethod
+    def from_model(cls, f) -> "FloorType":
+        return cls(id=f.id, name=f.name, description=f.description)
+
 
 @strawberry.type
 class FloorZoneType:
@@ -19,6 +33,33 @@ class FloorZoneType:
     work_center_id: Optional[int]
     polygon: str
 
+    @classmethod
+    def from_model(cls, z) -> "FloorZoneType":
+        return cls(
+            id=z.id,
+            floor_id=z.floor_id,
+            name=z.name,
+            zone_type=z.zone_type,
+            department_id=z.department_id,
+            work_center_id=z.work_center_id,
+            polygon=z.polygon,
+        )
+
+    @strawberry.field
+    async def floor(self, info) -> Optional[FloorType]:
+        f = await _load(info, "floors", self.floor_id)
+        return FloorType.from_model(f) if f else None
+
+    @strawberry.field
+    async def department(self, info) -> Optional["DepartmentType"]:
+        d = await _load(info, "departments", self.department_id)
+        return DepartmentType.from_model(d) if d else None
+
+    @strawberry.field
+    async def work_center(self, info) -> Optional["WorkCenterType"]:
+        wc = await _load(info, "work_centers", self.work_center_id)
+        return WorkCenterType.from_model(wc) if wc else None
+
 
 @strawberry.type
 class DepartmentType:
@@ -26,6 +67,10 @@ class DepartmentType:
     title: str
     description: Optional[str] = None
 
+    @classmethod
+    def from_model(cls, d) -> "DepartmentType":
+        return cls(id=d.id, title=d.title, description=d.description)
+
 
 @strawberry.type
 class DefectCategoryType:
@@ -33,6 +78,15 @@ class DefectCategoryType:
     title: str
     department_id: int
 
+    @classmethod
+    def from_model(cls, dc) -> "DefectCategoryType":
+        return cls(id=dc.id, title=dc.title, department_id=dc.department_id)
+
+    @strawberry.field
+    async def department(self, info) -> Optional[DepartmentType]:
+        d = await _load(info, "departments", self.department_id)
+        return DepartmentType.from_model(d) if d else None
+
 
 @strawberry.type
 class PartType:
@@ -40,6 +94,20 @@ class PartType:
     name: str
     department_id: int
 
+    @classmethod
+    def from_model(cls, p) -> "PartType":
+        return cls(id=p.id, name=p.name, department_id=p.department_id)
+
+    @strawberry.field
+    async def department(self, info) -> Optional[DepartmentType]:
+        d = await _load(info, "departments", self.department_id)
+        return DepartmentType.from_model(d) if d else None
+
+    @strawberry.field
+    async def work_orders(self, info) -> List["WorkOrderType"]:
+        orders = await _load(info, "work_orders_by_part", self.id)
+        return [WorkOrderType.from_model(wo) for wo in orders]
+
 
 @strawberry.type
 class UserType:
@@ -49,6 +117,21 @@ class UserType:
     job: str
     time: int
 
+    @classmethod
+    def from_model(cls, u) -> "UserType":
+        return cls(
+            id=u.id,
+            username=u.username,
+            department_id=u.department_id,
+            job=u.job,
+            time=u.time,
+        )
+
+    @strawberry.field
+    async def department(self, info) -> Optional[DepartmentType]:
+        d = await _load(info, "departments", self.department_id)
+        return DepartmentType.from_model(d) if d else None
+
 
 @strawberry.type
 class DefectType:
@@ -58,6 +141,50 @@ class DefectType:
     part_id: int
     defect_category_id: int
 
+    @classmethod
+    def from_model(cls, d) -> "DefectType":
+        return cls(
+            id=d.id,
+            title=d.title,
+            description=d.description,
+            part_id=d.part_id,
+            defect_category_id=d.defect_category_id,
+        )
+
+    @strawberry.field
+    async def part(self, info) -> Optional[PartType]:
+        p = await _load(info, "parts", self.part_id)
+        return PartType.from_model(p) if p else None
+
+    @strawberry.field
+    async def defect_category(self, info) -> Optional[DefectCategoryType]:
+        dc = await _load(info, "defect_categories", self.defect_category_id)
+        return DefectCategoryType.from_model(dc) if dc else None
+
+
+@strawberry.type
+class DefectParetoType:
+    """One defect category's count in a Pareto ranking; shares are percents."""
+
+    defect_category_id: int
+    count: int
+    share: float
+    cumulative_share: float
+
+    @classmethod
+    def from_model(cls, row) -> "DefectParetoType":
+        return cls(
+            defect_category_id=row.defect_category_id,
+            count=row.count,
+            share=row.share,
+            cumulative_share=row.cumulative_share,
+        )
+
+    @strawberry.field
+    async def defect_category(self, info) -> Optional[DefectCategoryType]:
+        dc = await _load(info, "defect_categories", self.defect_category_id)
+        return DefectCategoryType.from_model(dc) if dc else None
+
 
 @strawberry.type
 class QualityType:
@@ -66,6 +193,20 @@ class QualityType:
     defect_count: int
     part_id: int
 
+    @classmethod
+    def from_model(cls, q) -> "QualityType":
+        return cls(
+            id=q.id,
+            pass_fail=q.pass_fail,
+            defect_count=q.defect_count,
+            part_id=q.part_id,
+        )
+
+    @strawberry.field
+    async def part(self, info) -> Optional[PartType]:
+        p = await _load(info, "parts", self.part_id)
+        return PartType.from_model(p) if p else None
+
 
 @strawberry.type
 class WorkCenterType:
@@ -74,6 +215,20 @@ class WorkCenterType:
     code: Optional[str]
     department_id: Optional[int]
 
+    @classmethod
+    def from_model(cls, wc) -> "WorkCenterType":
+        return cls(id=wc.id, name=wc.name, code=wc.code, department_id=wc.department_id)
+
+    @strawberry.field
+    async def department(self, info) -> Optional[DepartmentType]:
+        d = await _load(info, "departments", self.department_id)
+        return DepartmentType.from_model(d) if d else None
+
+    @strawberry.field
+    async def work_orders(self, info) -> List["WorkOrderType"]:
+        orders = await _load(info, "work_orders_by_work_center", self.id)
+        return [WorkOrderType.from_model(wo) for wo in orders]
+
 
 @strawberry.type
 class WorkOrderType:
@@ -85,6 +240,33 @@ class WorkOrderType:
     department_id: Optional[int]
     work_center_id: Optional[int]
 
+    @classmethod
+    def from_model(cls, wo) -> "WorkOrderType":
+        return cls(
+            id=wo.id,
+            number=wo.number,
+            status=wo.status,
+            quantity=wo.quantity,
+            part_id=wo.part_id,
+            department_id=wo.department_id,
+            work_center_id=wo.work_center_id,
+        )
+
+    @strawberry.field
+    async def part(self, info) -> Optional[PartType]:
+        p = await _load(info, "parts", self.part_id)
+        return PartType.from_model(p) if p else None
+
+    @strawberry.field
+    async def department(self, info) -> Optional[DepartmentType]:
+        d = await _load(info, "departments", self.department_id)
+        return DepartmentType.from_model(d) if d else None
+
+    @strawberry.field
+    async def work_center(self, info) -> Optional[WorkCenterType]:
+        wc = await _load(info, "work_centers", self.work_center_id)
+        return WorkCenterType.from_model(wc) if wc else None
+
 
 @strawberry.type
 class WorkOrderOpType:
@@ -96,6 +278,28 @@ class WorkOrderOpType:
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
 
+    @classmethod
+    def from_model(cls, op) -> "WorkOrderOpType":
+        return cls(
+            id=op.id,
+            work_order_id=op.work_order_id,
+            sequence=op.sequence,
+            work_center_id=op.work_center_id,
+            status=op.status,
+            started_at=op.started_at.isoformat() if op.started_at else None,
+            completed_at=op.completed_at.isoformat() if op.completed_at else None,
+        )
+
+    @strawberry.field
+    async def work_order(self, info) -> Optional[WorkOrderType]:
+        wo = await _load(info, "work_orders", self.work_order_id)
+        return WorkOrderType.from_model(wo) if wo else None
+
+    @strawberry.field
+    async def work_center(self, info) -> Optional[WorkCenterType]:
+        wc = await _load(info, "work_centers", self.work_center_id)
+        return WorkCenterType.from_model(wc) if wc else None
+
 
 @strawberry.type
 class RoutingType:
@@ -104,6 +308,10 @@ class RoutingType:
     part_id: int
     version: Optional[str]
 
+    @classmethod
+    def from_model(cls, r) -> "RoutingType":
+        return cls(id=r.id, name=r.name, part_id=r.part_id, version=r.version)
+
 
 @strawberry.type
 class RoutingStepType:
@@ -114,6 +322,17 @@ class RoutingStepType:
     description: Optional[str]
     standard_minutes: Optional[int]
 
+    @classmethod
+    def from_model(cls, s) -> "RoutingStepType":
+        return cls(
+            id=s.id,
+            routing_id=s.routing_id,
+            sequence=s.sequence,
+            work_center_id=s.work_center_id,
+            description=s.description,
+            standard_minutes=s.standard_minutes,
+        )
+
 
 @strawberry.type
 class BOMType:
@@ -121,6 +340,10 @@ class BOMType:
     part_id: int
     revision: Optional[str]
 
+    @classmethod
+    def from_model(cls, b) -> "BOMType":
+        return cls(id=b.id, part_id=b.part_id, revision=b.revision)
+
 
 @strawberry.type
 class BOMItemType:
@@ -129,6 +352,15 @@ class BOMItemType:
     component_part_id: int
     quantity: int
 
+    @classmethod
+    def from_model(cls, i) -> "BOMItemType":
+        return cls(
+            id=i.id,
+            bom_id=i.bom_id,
+            component_part_id=i.component_part_id,
+            quantity=i.quantity,
+        )
+
 
 @strawberry.type
 class ActivityLogType:
@@ -141,6 +373,145 @@ class ActivityLogType:
     message: Optional[str]
     created_at: str
 
+    @classmethod
+    def from_model(cls, log) -> "ActivityLogType":
+        return cls(
+            id=log.id,
+            user_id=log.user_id,
+            part_id=log.part_id,
+            department_id=log.department_id,
+            work_order_id=log.work_order_id,
+            event_type=log.event_type,
+            message=log.message,
+            created_at=log.created_at.isoformat() if log.created_at else "",
+        )
+
+
+# --- Relay-style cursor connections ---
+@strawberry.type
+class PageInfo:
+    has_next_page: bool
+    has_previous_page: bool
+    start_cursor: Optional[str] = None
+    end_cursor: Optional[str] = None
+
+
+@strawberry.type
+class Edge(Generic[T]):
+    cursor: str
+    node: T
+
+
+@strawberry.type
+class Connection(Generic[T]):
+    edges: List[Edge[T]]
+    page_info: PageInfo
+
+
+# --- Bulk mutation results ---
+@strawberry.type
+class BulkItemError:
+    index: int
+    code: str
+    message: str
+
+
+@strawberry.type
+class BulkResult(Generic[T]):
+    created: List[T]
+    errors: List[BulkItemError]
+
+
+# --- Detail pages (one resolver per page; see QueryService.get_*_detail) ---
+@strawberry.type
+class WorkCenterDetailType:
+    work_center: WorkCenterType
+    department: Optional[DepartmentType]
+    open_work_orders: List[WorkOrderType]
+    active_operations: List[WorkOrderOpType]
+    routing_steps: List[RoutingStepType]
+    floor_zones: List[FloorZoneType]
+
+    @classmethod
+    def from_model(cls, detail) -> "WorkCenterDetailType":
+        wc = detail.work_center
+        return cls(
+            work_center=WorkCenterType.from_model(wc),
+            department=(
+                DepartmentType.from_model(wc.department) if wc.department else None
+            ),
+            open_work_orders=[
+                WorkOrderType.from_model(wo) for wo in detail.open_work_orders
+            ],
+            active_operations=[
+                WorkOrderOpType.from_model(op) for op in detail.active_operations
+            ],
+            routing_steps=[
+                RoutingStepType.from_model(s) for s in detail.routing_steps
+            ],
+            floor_zones=[FloorZoneType.from_model(z) for z in detail.floor_zones],
+        )
+
+
+@strawberry.type
+class PartDetailType:
+    part: PartType
+    department: Optional[DepartmentType]
+    open_work_orders: List[WorkOrderType]
+    routings: List[RoutingType]
+    routing_steps: List[RoutingStepType]
+    boms: List[BOMType]
+    bom_items: List[BOMItemType]
+    recent_quality: List[QualityType]
+    recent_defects: List[DefectType]
+
+    @classmethod
+    def from_model(cls, detail) -> "PartDetailType":
+        part = detail.part
+        return cls(
+            part=PartType.from_model(part),
+            department=(
+                DepartmentType.from_model(part.department) if part.department else None
+            ),
+            open_work_orders=[
+                WorkOrderType.from_model(wo) for wo in detail.open_work_orders
+            ],
+            routings=[RoutingType.from_model(r) for r in part.routings],
+            routing_steps=[
+                RoutingStepType.from_model(s) for r in part.routings for s in r.steps
+            ],
+            boms=[BOMType.from_model(b) for b in part.boms],
+            bom_items=[BOMItemType.from_model(i) for b in part.boms for i in b.items],
+            recent_quality=[QualityType.from_model(q) for q in detail.recent_quality],
+            recent_defects=[DefectType.from_model(d) for d in detail.recent_defects],
+        )
+
+
+@strawberry.type
+class DepartmentDetailType:
+    department: DepartmentType
+    parts: List[PartType]
+    work_centers: List[WorkCenterType]
+    floor_zones: List[FloorZoneType]
+    defect_categories: List[DefectCategoryType]
+    open_work_orders: List[WorkOrderType]
+
+    @classmethod
+    def from_model(cls, detail) -> "DepartmentDetailType":
+        d = detail.department
+        return cls(
+            department=DepartmentType.from_model(d),
+            parts=[PartType.from_model(p) for p in detail.parts],
+            work_centers=[WorkCenterType.from_model(wc) for wc in detail.work_centers],
+            floor_zones=[FloorZoneType.from_model(z) for z in detail.floor_zones],
+            defect_categories=[
+                DefectCategoryType.from_model(dc) for dc in detail.defect_categories
+            ],
+            open_work_orders=[
+                WorkOrderType.from_model(wo) for wo in detail.open_work_orders
+            ],
+        )
+
 
 @strawberry.input
 class DepartmentInput:
@@ -264,3 +635,56 @@ class FloorZoneInput:
     department_id: Optional[int] = None
     work_center_id: Optional[int] = None
     polygon: str
+
+
+# --- List filters and ordering ---
+# Unset fields do not constrain the result; set fields are ANDed in SQL.
+@strawberry.enum
+class SortDirection(Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+@strawberry.enum
+class WorkOrderSortField(Enum):
+    ID = "id"
+    NUMBER = "number"
+    STATUS = "status"
+    QUANTITY = "quantity"
+
+
+@strawberry.input
+class WorkOrderFilter:
+    part_id: Optional[int] = None
+    work_center_id: Optional[int] = None
+    department_id: Optional[int] = None
+    status_in: Optional[List[str]] = None
+
+
+@strawberry.input
+class WorkOrderOrderBy:
+    field: WorkOrderSortField = WorkOrderSortField.ID
+    direction: SortDirection = SortDirection.ASC
+
+
+@strawberry.input
+class RoutingFilter:
+    part_id: Optional[int] = None
+
+
+@strawberry.input
+class RoutingStepFilter:
+    routing_id: Optional[int] = None
+    work_center_id: Optional[int] = None
+
+
+@strawberry.input
+class BOMFilter:
+    part_id: Optional[int] = None
+
+
+@strawberry.input
+class FloorZoneFilter:
+    floor_id: Optional[int] = None
+    department_id: Optional[int] = None
+    work_center_id: Optional[int] = None
@@ -0,0 +1,566 @@
+"""Deterministic synthetic shop-floor data for capacity testing.
+
+Builds a plant that follows the relationships in models/models.py:
+
+- departments own work centers, defect categories and users;
+- floors are laid out in department bands, with one zone per work center
+  (non-overlapping rectangles on the 1000x600 floor-map canvas);
+- parts form a three-level product structure (components, subassemblies,
+  assemblies), each made part has a BOM on lower-level parts and every part
+  a routing whose steps run at its department's work centers;
+- work orders are spread over --years; their ops follow the routing
+  sequence in time, and the ones still open at the end date are in progress;
+- finished work orders get a quality record, failed ones defects, and every
+  step leaves activity-log entries;
+- the defect_daily_counts rollup is rebuilt from the generated defects.
+
+The same --seed and --scale always produce the same rows (ids included).
+Rows are written in batches through Core executemany, or COPY on Postgres
+(psycopg), never through ORM add/commit:
+
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.datagen --scale 10 --reset
+
+Scale 1 is about 10k work orders and 100k activity-log rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session
+
+from app.api.rollups import rebuild
+from app.core.config import settings
+from models.models import (
+    BOM,
+    ActivityLog,
+    Base,
+    BOMItem,
+    Defect,
+    DefectCategory,
+    DefectDailyCount,
+    Department,
+    Floor,
+    FloorZone,
+    Part,
+    Quality,
+    Routing,
+    RoutingStep,
+    User,
+    WorkCenter,
+    WorkOrder,
+    WorkOrderOp,
+)
+
+DEPARTMENTS = (
+    "Machining",
+    "Fabrication",
+    "Welding",
+    "Paint",
+    "Assembly",
+    "Inspection",
+    "Packaging",
+    "Maintenance",
+)
+JOBS = ("operator", "setter", "inspector", "lead", "technician")
+DEFECTS = (
+    "Scratch",
+    "Dent",
+    "Porosity",
+    "Misalignment",
+    "Burr",
+    "Crack",
+    "Wrong torque",
+)
+CANVAS = (1000, 600)
+MARGIN = 10
+BATCH = 5_000  # work orders generated and written per round
+
+
+@dataclass(frozen=True)
+class Scale:
+    departments: int
+    floors: int
+    work_centers_per_department: int
+    users_per_department: int
+    categories_per_department: int
+    parts: int
+    work_orders: int
+
+    @classmethod
+    def of(cls, factor: float) -> "Scale":
+        return cls(
+            departments=max(1, round(len(DEPARTMENTS) * factor)),
+            floors=max(1, round(2 * factor)),
+            work_centers_per_department=6,
+            users_per_department=25,
+            categories_per_department=5,
+            parts=max(10, round(2_000 * factor)),
+            work_orders=max(10, round(10_000 * factor)),
+        )
+
+
+def _rect(x1: float, y1: float, x2: float, y2: float) -> str:
+    return f"{x1:g},{y1:g} {x2:g},{y1:g} {x2:g},{y2:g} {x1:g},{y2:g}"
+
+
+class _Writer:
+    """Batched writes to one connection: COPY on psycopg, executemany elsewhere."""
+
+    def __init__(self, conn, use_copy: bool):
+        self.conn = conn
+        self.use_copy = use_copy
+        self.counts: dict[str, int] = {}
+
+    def write(self, model, rows: list[dict]) -> None:
+        if not rows:
+            return
+        table = model.__table__
+        self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+        if not self.use_copy:
+            self.conn.execute(table.insert(), rows)
+            return
+        columns = list(rows[0])
+        cursor = self.conn.connection.driver_connection.cursor()
+        with cursor.copy(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+        ) as copy:
+            for row in rows:
+                copy.write_row([row[c] for c in columns])
+
+
+class Generator:
+    def __init__(self, scale: Scale, seed: int, years: float, end: datetime):
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.end = end
+        self.start = end - timedelta(days=365 * years)
+
+    # --- reference data ---
+    def plant(self, out: _Writer) -> None:
+        s, rng = self.scale, self.rng
+        departments = [
+            {
+                "id": d,
+                "title": DEPARTMENTS[(d - 1) % len(DEPARTMENTS)]
+                + (
+                    ""
+                    if d <= len(DEPARTMENTS)
+                    else f" {(d - 1) // len(DEPARTMENTS) + 1}"
+                ),
+                "description": None,
+            }
+            for d in range(1, s.departments + 1)
+        ]
+        out.write(Department, departments)
+
+        self.work_centers: dict[int, list[int]] = {}
+        centers = []
+        for d in range(1, s.departments + 1):
+            ids = [
+                len(centers) + i for i in range(1, s.work_centers_per_department + 1)
+            ]
+            self.work_centers[d] = ids
+            for n, wc in enumerate(ids, 1):
+                centers.append(
+                    {
+                        "id": wc,
+                        "name": f"{departments[d - 1]['title']} {n}",
+                        "code": f"WC-{wc:04d}",
+                        "department_id": d,
+                    }
+                )
+        out.write(WorkCenter, centers)
+
+        self.categories = {
+            d: [
+                (d - 1) * s.categories_per_department + i
+                for i in range(1, s.categories_per_department + 1)
+            ]
+            for d in range(1, s.departments + 1)
+        }
+        out.write(
+            DefectCategory,
+            [
+                {
+                    "id": c,
+                    "title": f"{DEFECTS[i % len(DEFECTS)]} ({departments[d - 1]['title']})",
+                    "department_id": d,
+                }
+                for d, ids in self.categories.items()
+                for i, c in enumerate(ids)
+            ],
+        )
+
+        self.users = {
+            d: [
+                (d - 1) * s.users_per_department + i
+                for i in range(1, s.users_per_department + 1)
+            ]
+            for d in range(1, s.departments + 1)
+        }
+        out.write(
+            User,
+            [
+                {
+                    "id": u,
+                    "username": f"user{u:05d}",
+                    "department_id": d,
+                    "job": rng.choice(JOBS),
+                    "time": rng.choice((6, 8, 10, 12)),
+                }
+                for d, ids in self.users.items()
+                for u in ids
+            ],
+        )
+        self._floors(out)
+
+    def _floors(self, out: _Writer) -> None:
+        """Departments in horizontal bands; work centers side by side inside."""
+        s = self.scale
+        out.write(
+            Floor,
+            [
+                {"id": f, "name": f"Floor {f}", "description": None}
+                for f in range(1, s.floors + 1)
+            ],
+        )
+        zones = []
+        by_floor: dict[int, list[int]] = {}
+        for d in range(1, s.departments + 1):
+            by_floor.setdefault((d - 1) % s.floors + 1, []).append(d)
+        width, height = CANVAS
+        for floor, departments in by_floor.items():
+            band = height / len(departments)
+            for row, d in enumerate(departments):
+                top, bottom = row * band + MARGIN / 2, (row + 1) * band - MARGIN / 2
+                zones.append(
+                    {
+                        "floor_id": floor,
+                        "name": f"Department {d}",
+                        "zone_type": "department",
+                        "department_id": d,
+                        "work_center_id": None,
+                        "polygon": _rect(MARGIN, top, width - MARGIN, bottom),
+                    }
+                )
+                centers = self.work_centers[d]
+                cell = (width - 2 * MARGIN) / len(centers)
+                for col, wc in enumerate(centers):
+                    left = MARGIN + col * cell
+                    zones.append(
+                        {
+                            "floor_id": floor,
+                            "name": f"WC-{wc:04d}",
+                            "zone_type": "work_center",
+                            "department_id": d,
+                            "work_center_id": wc,
+                            "polygon": _rect(
+                                left + MARGIN,
+                                top + MARGIN,
+                                left + cell - MARGIN,
+                                bottom - MARGIN,
+                            ),
+                        }
+                    )
+        for i, zone in enumerate(zones, 1):
+            zone["id"] = i
+        out.write(FloorZone, zones)
+
+    # --- product structure ---
+    def products(self, out: _Writer) -> None:
+        s, rng = self.scale, self.rng
+        # 50% components, 30% subassemblies, 20% assemblies
+        bounds = (0, math.ceil(s.parts * 0.5), math.ceil(s.parts * 0.8), s.parts)
+        self.levels = [
+            list(range(bounds[level] + 1, bounds[level + 1] + 1)) for level in range(3)
+        ]
+        self.part_department = {}
+        parts = []
+        for level, ids in enumerate(self.levels):
+            kind = ("Component", "Subassembly", "Assembly")[level]
+            for p in ids:
+                d = rng.randint(1, s.departments)
+                self.part_department[p] = d
+                parts.append({"id": p, "name": f"{kind} {p:06d}", "department_id": d})
+        out.write(Part, parts)
+
+        boms, items = [], []
+        for level in (1, 2):
+            below = self.levels[0] + (self.levels[1] if level == 2 else [])
+            for p in self.levels[level]:
+                bom = len(boms) + 1
+                boms.append({"id": bom, "part_id": p, "revision": "A"})
+                for component in rng.sample(below, min(len(below), rng.randint(2, 6))):
+                    items.append(
+                        {
+                            "id": len(items) + 1,
+                            "bom_id": bom,
+                            "component_part_id": component,
+                            "quantity": rng.randint(1, 8),
+                        }
+                    )
+        out.write(BOM, boms)
+        out.write(BOMItem, items)
+
+        # routing per part: 2-6 steps at work centers of the part's department
+        self.routing_steps: dict[int, list[tuple[int, int, int]]] = {}
+        routings, steps = [], []
+        for p in range(1, s.parts + 1):
+            centers = self.work_centers[self.part_department[p]]
+            routing = p
+            routings.append(
+                {
+                    "id": routing,
+                    "name": f"Routing {p:06d}",
+                    "part_id": p,
+                    "version": "A",
+                }
+            )
+            sequence = []
+            for n in range(1, rng.randint(2, 6) + 1):
+                step = (n * 10, rng.choice(centers), rng.randint(5, 120))
+                sequence.append(step)
+                steps.append(
+                    {
+                        "id": len(steps) + 1,
+                        "routing_id": routing,
+                        "sequence": step[0],
+                        "work_center_id": step[1],
+                        "description": f"Op {step[0]}",
+                        "standard_minutes": step[2],
+                    }
+                )
+            self.routing_steps[p] = sequence
+        out.write(Routing, routings)
+        out.write(RoutingStep, steps)
+
+    # --- transactions ---
+    def production(self, out: _Writer) -> None:
+        s, rng = self.scale, self.rng
+        span = (self.end - self.start).total_seconds()
+        # assemblies and subassemblies are ordered more often than components
+        weights = [1 if p <= len(self.levels[0]) else 3 for p in range(1, s.parts + 1)]
+        parts = list(range(1, s.parts + 1))
+        ids = {"op": 0, "quality": 0, "defect": 0, "log": 0}
+
+        for first in range(1, s.work_orders + 1, BATCH):
+            orders, ops, qualities, defects, logs = [], [], [], [], []
+            # work orders are numbered in release order: each batch covers its
+            # share of the timeline
+            last = min(first + BATCH, s.work_orders + 1)
+            window = span * (last - first) / s.work_orders
+            offset = span * (first - 1) / s.work_orders
+            released = sorted(
+                self.start + timedelta(seconds=offset + rng.random() * window)
+                for _ in range(first, last)
+            )
+            for wo, created in enumerate(released, first):
+                part = rng.choices(parts, weights)[0]
+                department = self.part_department[part]
+                route = self.routing_steps[part]
+                quantity = rng.randint(1, 100)
+                user = rng.choice(self.users[department])
+
+                def log(
+                    event,
+                    at,
+                    message,
+                    user=user,
+                    part=part,
+                    department=department,
+                    wo=wo,
+                ):
+                    ids["log"] += 1
+                    logs.append(
+                        {
+                            "id": ids["log"],
+                            "user_id": user,
+                            "part_id": part,
+                            "department_id": department,
+                            "work_order_id": wo,
+                            "event_type": event,
+                            "message": message,
+                            "created_at": at.replace(tzinfo=timezone.utc),
+                        }
+                    )
+
+                log(
+                    "work_order_created",
+                    created,
+                    f"WO-{wo:07d} released, qty {quantity}",
+                )
+                clock = created + timedelta(minutes=rng.randint(30, 48 * 60))
+                statuses = []
+                for sequence, center, minutes in route:
+                    ids["op"] += 1
+                    started = completed = None
+                    if clock < self.end:
+                        started = clock
+                        # setup plus a per-piece share of the standard time
+                        clock = started + timedelta(
+                            minutes=minutes
+                            + minutes * quantity / 20 * rng.uniform(0.8, 1.3)
+                        )
+                        log(
+                            "op_started",
+                            started,
+                            f"Op {sequence} started at WC-{center:04d}",
+                        )
+                        if clock < self.end:
+                            completed = clock
+                            log("op_completed", completed, f"Op {sequence} completed")
+                        clock += timedelta(minutes=rng.randint(10, 12 * 60))
+                    status = (
+                        "done" if completed else "in_progress" if started else "pending"
+                    )
+                    statuses.append(status)
+                    ops.append(
+                        {
+                            "id": ids["op"],
+                            "work_order_id": wo,
+                            "sequence": sequence,
+                            "work_center_id": center,
+                            "status": status,
+                            "started_at": started,
+                            "completed_at": completed,
+                        }
+                    )
+
+                if all(st == "done" for st in statuses):
+                    status = "done"
+                    passed = rng.random() > 0.05
+                    count = 0 if passed else rng.randint(1, 3)
+                    ids["quality"] += 1
+                    qualities.append(
+                        {
+                            "id": ids["quality"],
+                            "pass_fail": passed,
+                            "defect_count": count,
+                            "part_id": part,
+                        }
+                    )
+                    for _ in range(count):
+                        ids["defect"] += 1
+                        category = rng.choice(self.categories[department])
+                        title = rng.choice(DEFECTS)
+                        defects.append(
+                            {
+                                "id": ids["defect"],
+                                "title": title,
+                                "description": f"{title} found on WO-{wo:07d}",
+                                "part_id": part,
+                                "defect_category_id": category,
+                                "created_at": ops[-1]["completed_at"],
+                            }
+                        )
+                    log(
+                        "quality_check",
+                        ops[-1]["completed_at"],
+                        "passed" if passed else f"failed with {count} defect(s)",
+                    )
+                else:
+                    status = "open" if statuses[0] == "pending" else "in_progress"
+                orders.append(
+                    {
+                        "id": wo,
+                        "number": f"WO-{wo:07d}",
+                        "status": status,
+                        "quantity": quantity,
+                        "part_id": part,
+                        "department_id": department,
+                        "work_center_id": route[0][1],
+                    }
+                )
+
+            out.write(WorkOrder, orders)
+            out.write(WorkOrderOp, ops)
+            out.write(Quality, qualities)
+            out.write(Defect, defects)
+            out.write(ActivityLog, logs)
+
+    def generate(self, out: _Writer) -> None:
+        self.plant(out)
+        self.products(out)
+        self.production(out)
+
+
+def _reset_sequences(conn) -> None:
+    """Explicit ids bypass Postgres sequences; move them past the loaded rows."""
+    for table in Base.metadata.sorted_tables:
+        if "id" not in table.c:
+            continue
+        conn.execute(
+            text(
+                "SELECT setval(pg_get_serial_sequence(:t, 'id'),"
+                f" coalesce((SELECT max(id) FROM {table.name}), 0) + 1, false)"
+            ),
+            {"t": table.name},
+        )
+
+
+def load(
+    engine,
+    scale: float = 1.0,
+    seed: int = 0,
+    years: float = 3.0,
+    end: datetime = datetime(2026, 1, 1),
+    reset: bool = False,
+    method: str = "auto",
+) -> dict[str, int]:
+    """Generate into `engine` in one transaction; returns rows per table."""
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    postgres = engine.dialect.name == "postgresql"
+    use_copy = method == "copy" or (
+        method == "auto" and postgres and engine.dialect.driver == "psycopg"
+    )
+    with engine.begin() as conn:
+        if conn.scalar(select(func.count()).select_from(Part)):
+            raise SystemExit("target database already has data; pass --reset")
+        out = _Writer(conn, use_copy)
+        Generator(Scale.of(scale), seed, years, end).generate(out)
+        with Session(bind=conn) as session:
+            out.counts[DefectDailyCount.__tablename__] = rebuild(session)
+        if postgres:
+            _reset_sequences(conn)
+    return out.counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="1 = ~10k work orders")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--years", type=float, default=3.0, help="history length")
+    parser.add_argument(
+        "--end",
+        type=datetime.fromisoformat,
+        default=datetime(2026, 1, 1),
+        help="'now' of the generated history (ISO date)",
+    )
+    parser.add_argument(
+        "--reset", action="store_true", help="drop and recreate all tables first"
+    )
+    parser.add_argument("--method", choices=("auto", "copy", "insert"), default="auto")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    started = time.perf_counter()
+    counts = load(
+        engine, args.scale, args.seed, args.years, args.end, args.reset, args.method
+    )
+    report = {"seconds": round(time.perf_counter() - started, 2), "rows": counts}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""CPU cost of parse + validate per request, with and without the document cache.
+
+Runs the FloorMapView query through `schema.execute` against an in-memory
+SQLite database (reference rows come from the reference cache after the
+first call, so the timing is dominated by GraphQL work) and reports CPU
+time per request for both settings:
+
+    python -m benchmarks.document_cache --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from graphql import parse, validate
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.documents import document_cache
+from app.api.loaders import Loaders
+from app.core.cache import reference_cache
+from main import schema
+from models.models import Base, Department, Floor, FloorZone, WorkCenter
+
+# Same document FloorMapView.vue sends on every refresh
+FLOOR_MAP_QUERY = """
+      query FloorMapData {
+        floors {
+          id
+          name
+          description
+        }
+        floorZones {
+          id
+          floorId
+          name
+          zoneType
+          departmentId
+          workCenterId
+          polygon
+        }
+        departments {
+          id
+          title
+        }
+        workCenters {
+          id
+          name
+          code
+          departmentId
+        }
+      }
+"""
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    sess = sessionmaker(bind=engine)()
+    dept = Department(title="Assembly")
+    floor = Floor(name="Main")
+    centers = [WorkCenter(name=f"WC{i}", department=dept) for i in range(10)]
+    zones = [
+        FloorZone(floor=floor, name=f"Z{i}", polygon="0,0 1,0 1,1", work_center=wc)
+        for i, wc in enumerate(centers)
+    ]
+    sess.add_all([dept, floor, *centers, *zones])
+    sess.commit()
+    return sess
+
+
+def _cpu_per_call(fn, iterations: int) -> float:
+    fn()  # warm up caches
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations
+
+
+def run(iterations: int) -> dict:
+    sess = _session()
+    context = {"db": sess, "loaders": Loaders(sess)}
+    gql_schema = schema._schema
+
+    def parse_and_validate():
+        assert not validate(gql_schema, parse(FLOOR_MAP_QUERY))
+
+    def execute():
+        result = asyncio.run(schema.execute(FLOOR_MAP_QUERY, context_value=context))
+        assert result.errors is None
+
+    maxsize = document_cache.maxsize
+    try:
+        document_cache.maxsize = 0
+        document_cache.clear()
+        uncached = _cpu_per_call(execute, iterations)
+        document_cache.maxsize = maxsize
+        cached = _cpu_per_call(execute, iterations)
+    finally:
+        document_cache.maxsize = maxsize
+        reference_cache.clear()
+        sess.close()
+
+    return {
+        "iterations": iterations,
+        "parse_validate_us": round(
+            _cpu_per_call(parse_and_validate, iterations) * 1e6, 1
+        ),
+        "execute_uncached_us": round(uncached * 1e6, 1),
+        "execute_cached_us": round(cached * 1e6, 1),
+        "saved_per_request_us": round((uncached - cached) * 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Fan-out latency and throughput of the event bus (app/core/events.py).
+
+Publishes --transactions commits of --batch events each and measures, per
+receiving worker, how long every event took from before COMMIT to its
+handler, and how many events/sec each worker took in.
+
+With --backend postgres (the default) the --workers receivers are separate
+processes, each LISTENing like a uvicorn worker would, against the database
+at DATABASE_URL:
+
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.event_bus --workers 8
+
+--backend memory runs the receivers as handlers in this process instead,
+which measures dispatch overhead only; it cannot cross processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.events import Event, InMemoryBus, PostgresBus
+
+
+def _events(transaction: int, size: int) -> list[Event]:
+    sent = time.time()
+    return [
+        Event("work_order_op", transaction, {"i": i, "sent": sent}) for i in range(size)
+    ]
+
+
+def _summary(latencies: list[float], seconds: float) -> dict:
+    received = len(latencies)
+    latencies = sorted(latencies) or [0.0]
+
+    def pick(q: float) -> float:
+        return round(
+            latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1e3, 3
+        )
+
+    return {
+        "received": received,
+        "events_per_sec": round(received / seconds) if seconds else None,
+        "latency_ms": {
+            "p50": pick(0.50),
+            "p95": pick(0.95),
+            "p99": pick(0.99),
+            "max": pick(1.0),
+        },
+    }
+
+
+def _receiver(url: str, expected: int, ready, results) -> None:
+    """One worker process: LISTEN, record latencies until `expected` events arrived."""
+    bus = PostgresBus(make_url(url))
+    latencies: list[float] = []
+    first: list[float] = []
+
+    def handler(batch):
+        now = time.time()
+        if not first:
+            first.append(now)
+        latencies.extend(now - e.data["sent"] for e in batch)
+
+    bus.subscribe(["work_order_op"], handler)
+    bus.start()
+    time.sleep(0.5)  # let LISTEN register before the publisher starts
+    ready.put(True)
+    deadline = time.time() + 300
+    while len(latencies) < expected and time.time() < deadline:
+        time.sleep(0.01)
+    bus.close()
+    seconds = (time.time() - first[0]) if first else 0.0
+    results.put(_summary(latencies, seconds))
+
+
+def run_postgres(url: str, workers: int, transactions: int, batch: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    ready, results = ctx.Queue(), ctx.Queue()
+    expected = transactions * batch
+    procs = [
+        ctx.Process(target=_receiver, args=(url, expected, ready, results))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    for _ in procs:
+        ready.get(timeout=60)
+
+    engine = create_engine(url)
+    publisher = PostgresBus(engine.url)
+    start = time.perf_counter()
+    for t in range(transactions):
+        with engine.begin() as conn:
+            publisher.publish(_events(t, batch), conn)
+    publish_seconds = time.perf_counter() - start
+
+    per_worker = [results.get(timeout=330) for _ in procs]
+    for p in procs:
+        p.join()
+    return {
+        "published_events_per_sec": round(expected / publish_seconds),
+        "workers": per_worker,
+    }
+
+
+def run_memory(workers: int, transactions: int, batch: int) -> dict:
+    bus = InMemoryBus()
+    latencies: list[list[float]] = [[] for _ in range(workers)]
+    for i in range(workers):
+        bus.subscribe(
+            ["work_order_op"],
+            lambda b, out=latencies[i]: out.extend(
+                time.time() - e.data["sent"] for e in b
+            ),
+        )
+    start = time.perf_counter()
+    for t in range(transactions):
+        bus.publish(_events(t, batch))
+    seconds = time.perf_counter() - start
+    return {
+        "published_events_per_sec": round(transactions * batch / seconds),
+        "workers": [_summary(out, seconds) for out in latencies],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("postgres", "memory"), default="postgres")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--transactions", type=int, default=2_000)
+    parser.add_argument("--batch", type=int, default=5, help="events per commit")
+    args = parser.parse_args()
+
+    if args.backend == "postgres":
+        url = make_url(settings.DATABASE_URL).render_as_string(hide_password=False)
+        report = run_postgres(url, args.workers, args.transactions, args.batch)
+    else:
+        report = run_memory(args.workers, args.transactions, args.batch)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
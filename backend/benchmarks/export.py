@@ -0,0 +1,87 @@
+"""Rows/sec of the /export streams, in-process or against a running server.
+
+In-process (default) seeds DATABASE_URL like the benchmark suite (--rows
+per table, 1M by default) and drains `stream_rows` for each entity and
+format, which covers the cursor, serialization and chunking but not the
+HTTP transport. With --url it streams from a live server instead:
+
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.export --rows 1000000
+    python -m benchmarks.export --url http://localhost:8000
+
+Peak RSS is reported as well; it should not grow with --rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import time
+
+import httpx
+from sqlalchemy import create_engine
+
+from app.api.export import EXPORTS, ExportFormat, export_query, stream_rows
+from app.core.config import settings
+from benchmarks.seed import is_seeded, seed
+
+
+def _drain_local(engine, entity: str, fmt: ExportFormat) -> tuple[int, int]:
+    stmt = export_query(EXPORTS[entity], None, None, None, None)
+    rows = size = 0
+    for chunk in stream_rows(engine, stmt, fmt):
+        rows += chunk.count("\n")
+        size += len(chunk)
+    return rows - (fmt is ExportFormat.csv), size
+
+
+def _drain_remote(url: str, entity: str, fmt: ExportFormat) -> tuple[int, int]:
+    rows = size = 0
+    with httpx.stream(
+        "GET", f"{url}/export/{entity}", params={"format": fmt.value}, timeout=None
+    ) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            rows += chunk.count(b"\n")
+            size += len(chunk)
+    return rows - (fmt is ExportFormat.csv), size
+
+
+def run(drain) -> dict:
+    results = {}
+    for entity in EXPORTS:
+        for fmt in ExportFormat:
+            start = time.perf_counter()
+            rows, size = drain(entity, fmt)
+            seconds = time.perf_counter() - start
+            results[f"{entity}.{fmt.value}"] = {
+                "rows": rows,
+                "seconds": round(seconds, 3),
+                "rows_per_sec": round(rows / seconds) if seconds else None,
+                "mb": round(size / 1e6, 1),
+            }
+    # ru_maxrss is KiB on Linux
+    results["peak_rss_mb"] = round(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows per table")
+    parser.add_argument("--url", help="stream from this server instead of in-process")
+    args = parser.parse_args()
+
+    if args.url:
+        report = run(lambda e, f: _drain_remote(args.url.rstrip("/"), e, f))
+    else:
+        engine = create_engine(settings.DATABASE_URL)
+        if not is_seeded(engine, args.rows):
+            seed(engine, args.rows)
+        report = run(lambda e, f: _drain_local(engine, e, f))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
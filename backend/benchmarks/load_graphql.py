@@ -0,0 +1,82 @@
+"""Closed-loop GraphQL load generator: requests/sec and latency percentiles.
+
+Compare the sync and async DB stacks by running the API twice against the
+same database and pointing this script at each:
+
+    DB_ASYNC=false uvicorn main:app --port 8000 --workers 1
+    DB_ASYNC=true  uvicorn main:app --port 8001 --workers 1
+
+    python -m benchmarks.load_graphql --url http://localhost:8000/graphql
+    python -m benchmarks.load_graphql --url http://localhost:8001/graphql
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+DEFAULT_QUERY = "{ workCenters { id name } workOrders(limit: 50) { id number status } }"
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    url: str,
+    body: dict,
+    deadline: float,
+    latencies: list[float],
+    errors: list[int],
+) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        resp = await client.post(url, json=body)
+        latencies.append(time.perf_counter() - start)
+        if resp.status_code != 200 or "errors" in resp.json():
+            errors.append(resp.status_code)
+
+
+async def run(url: str, query: str, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors: list[int] = []
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            *(
+                _worker(client, url, {"query": query}, deadline, latencies, errors)
+                for _ in range(concurrency)
+            )
+        )
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000/graphql")
+    parser.add_argument("--query", default=DEFAULT_QUERY)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30.0)
+    args = parser.parse_args()
+    result = asyncio.run(run(args.url, args.query, args.concurrency, args.duration))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
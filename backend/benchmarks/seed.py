@@ -0,0 +1,193 @@
+"""Bulk-seed every table for the benchmark suite.
+
+Transactional tables get `rows` rows each; reference tables (departments,
+work centers, floors, ...) are capped at REFERENCE_ROWS, as in a real plant.
+Foreign keys spread evenly over their parents. Rows go in through Core
+`insert()` executemany in chunks, not ORM add/commit; the defect rollup is
+then rebuilt from the defects.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.api.rollups import rebuild
+from models.models import (
+    BOM,
+    ActivityLog,
+    Base,
+    BOMItem,
+    Defect,
+    DefectCategory,
+    Department,
+    Floor,
+    FloorZone,
+    Part,
+    Quality,
+    Routing,
+    RoutingStep,
+    User,
+    WorkCenter,
+    WorkOrder,
+    WorkOrderOp,
+)
+
+REFERENCE_ROWS = 100
+CHUNK = 10_000
+EPOCH = datetime(2024, 1, 1)
+POLYGON = "0,0 10,0 10,10 0,10"
+
+
+def _fk(i: int, parents: int) -> int:
+    return i % parents + 1
+
+
+def _tables(rows: int) -> list[tuple[type, int, object]]:
+    """(model, row count, row factory) in FK order."""
+    ref = min(rows, REFERENCE_ROWS)
+    return [
+        (Department, ref, lambda i: {"title": f"Department {i}"}),
+        (Floor, ref, lambda i: {"name": f"Floor {i}"}),
+        (
+            WorkCenter,
+            ref,
+            lambda i: {
+                "name": f"Work center {i}",
+                "code": f"WC{i}",
+                "department_id": _fk(i, ref),
+            },
+        ),
+        (
+            FloorZone,
+            ref,
+            lambda i: {
+                "floor_id": _fk(i, ref),
+                "name": f"Zone {i}",
+                "zone_type": "work_center",
+                "work_center_id": _fk(i, ref),
+                "polygon": POLYGON,
+            },
+        ),
+        (
+            DefectCategory,
+            ref,
+            lambda i: {"title": f"Category {i}", "department_id": _fk(i, ref)},
+        ),
+        (
+            User,
+            rows,
+            lambda i: {
+                "username": f"user{i}",
+                "department_id": _fk(i, ref),
+                "job": "operator",
+                "time": 8,
+            },
+        ),
+        (Part, rows, lambda i: {"name": f"Part {i}", "department_id": _fk(i, ref)}),
+        (
+            Defect,
+            rows,
+            lambda i: {
+                "title": f"Defect {i}",
+                "description": "benchmark",
+                "part_id": _fk(i, rows),
+                "defect_category_id": _fk(i, ref),
+                "created_at": EPOCH + timedelta(minutes=i),
+            },
+        ),
+        (
+            Quality,
+            rows,
+            lambda i: {
+                "pass_fail": i % 10 != 0,
+                "defect_count": i % 3,
+                "part_id": _fk(i, rows),
+            },
+        ),
+        (
+            WorkOrder,
+            rows,
+            lambda i: {
+                "number": f"WO-{i:08d}",
+                "status": ("open", "in_progress", "done")[i % 3],
+                "quantity": 1 + i % 50,
+                "part_id": _fk(i, rows),
+                "department_id": _fk(i, ref),
+                "work_center_id": _fk(i, ref),
+            },
+        ),
+        (
+            WorkOrderOp,
+            rows,
+            lambda i: {
+                "work_order_id": _fk(i, rows),
+                "sequence": 10,
+                "work_center_id": _fk(i, ref),
+                "status": "done",
+                "started_at": EPOCH + timedelta(minutes=i),
+                "completed_at": EPOCH + timedelta(minutes=i + 30),
+            },
+        ),
+        (
+            Routing,
+            rows,
+            lambda i: {"name": f"Routing {i}", "part_id": _fk(i, rows), "version": "A"},
+        ),
+        (
+            RoutingStep,
+            rows,
+            lambda i: {
+                "routing_id": _fk(i, rows),
+                "sequence": 10,
+                "work_center_id": _fk(i, ref),
+                "standard_minutes": 15,
+            },
+        ),
+        (BOM, rows, lambda i: {"part_id": _fk(i, rows), "revision": "A"}),
+        (
+            BOMItem,
+            rows,
+            lambda i: {
+                "bom_id": _fk(i, rows),
+                "component_part_id": _fk(i + 1, rows),
+                "quantity": 2,
+            },
+        ),
+        (
+            ActivityLog,
+            rows,
+            lambda i: {
+                "user_id": _fk(i, rows),
+                "part_id": _fk(i, rows),
+                "department_id": _fk(i, ref),
+                "work_order_id": _fk(i, rows),
+                "event_type": "status_change",
+                "message": "benchmark",
+                "created_at": EPOCH + timedelta(minutes=i),
+            },
+        ),
+    ]
+
+
+def is_seeded(engine, rows: int) -> bool:
+    with engine.connect() as conn:
+        try:
+            return conn.scalar(select(func.count()).select_from(Part)) == rows
+        except Exception:  # tables missing
+            return False
+
+
+def seed(engine, rows: int) -> None:
+    """Drop, recreate and fill every table with `rows` rows."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for model, count, factory in _tables(rows):
+            for start in range(0, count, CHUNK):
+                batch = [factory(i) for i in range(start, min(start + CHUNK, count))]
+                conn.execute(insert(model), batch)
+        with Session(bind=conn) as session:
+            rebuild(session)
@@ -0,0 +1,567 @@
+"""Service-layer benchmark suite: repo methods, GraphQL fields, ORM conversion.
+
+Seeds the database at DATABASE_URL (a SQLite file or a local Postgres) with
+--rows rows per table (see benchmarks/seed.py; reseeded only when the row
+count differs), then times:
+
+- every public method of every repo in app/api/services.py;
+- every Query and Mutation field, POSTed through TestClient to the real app;
+- every `*Type.from_model` conversion in app/schema.py over a MAX_LIMIT page,
+  alone and wrapped in a connection as core.py does.
+
+Arguments are derived from parameter and GraphQL argument names (`*_id`
+picks a row in the middle of the matching table). Writes run in a
+transaction that is rolled back after every iteration, so the data does not
+drift between runs; mutations are therefore timed without their COMMIT.
+
+    DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.suite \\
+        --rows 100000 --output bench-head.json --baseline bench-main.json
+
+Results are JSON (median/p95/min ms per benchmark, plus the SQL statement
+count for GraphQL fields). With --baseline, exits 1 if any median regressed
+by more than --threshold, or any field started issuing more statements.
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import itertools
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+from graphql import (
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    Undefined,
+    get_named_type,
+    is_leaf_type,
+)
+from sqlalchemy import Boolean, DateTime, Integer, String, create_engine, func, insert
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import app.schema as types
+from app.api import services
+from app.api.loaders import Loaders
+from app.api.services import MAX_LIMIT
+from app.core.config import settings
+from benchmarks.seed import EPOCH, POLYGON, is_seeded, seed
+from core import _connection
+from main import app, get_context, schema
+from models.models import Base
+
+# entities only: rollups (no `id`) are reached through their query fields
+MODELS = {
+    m.class_.__name__.lower(): m.class_
+    for m in Base.registry.mappers
+    if "id" in m.local_table.c
+}
+MODELS_BY_TABLE = {m.__tablename__: m for m in MODELS.values()}
+
+# `<prefix>_id` / `<prefix>_ids` parameter -> model it refers to
+ID_PARAMS = {
+    "floor": "floor",
+    "zone": "floorzone",
+    "user": "user",
+    "department": "department",
+    "part": "part",
+    "component_part": "part",
+    "defect_category": "defectcategory",
+    "defect": "defect",
+    "quality": "quality",
+    "work_center": "workcenter",
+    "work_order": "workorder",
+    "op": "workorderop",
+    "routing": "routing",
+    "step": "routingstep",
+    "bom": "bom",
+    "item": "bomitem",
+    "log": "activitylog",
+}
+# parameters left at their defaults
+DEFAULTED = {"limit", "offset", "first", "after", "filters", "order_by"}
+DEFAULTED_PREFIX = "per_"
+LOOKUPS = {"name", "title", "code", "number", "username"}
+BULK_ITEMS = 10
+MIN_DELTA_MS = 0.05  # below this, a "regression" is timer noise
+
+
+class Skip(Exception):
+    """The benchmark cannot derive arguments for this method or field."""
+
+
+def _snake(name: str) -> str:
+    return "".join(f"_{c.lower()}" if c.isupper() else c for c in name)
+
+
+def _model_for(name: str):
+    """Model named by `name` (`WorkOrderOpInput`, `BomItem`, `PartDetailType`)."""
+    for suffix in ("Input", "Type", "Detail"):
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+    try:
+        return MODELS[name.lower()]
+    except KeyError:
+        raise Skip(f"no model for {name}") from None
+
+
+def _id_model(param: str):
+    prefix = param[: param.rindex("_")]
+    if prefix not in ID_PARAMS:
+        raise Skip(f"unknown id parameter {param}")
+    return MODELS[ID_PARAMS[prefix]]
+
+
+class SeedData:
+    """Existing ids and column values to build arguments from."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.samples: dict[type, dict] = {}
+        self._serial = itertools.count(1)
+        with engine.connect() as conn:
+            for model in MODELS.values():
+                top = conn.scalar(select(func.max(model.id))) or 1
+                row = conn.execute(
+                    select(model.__table__).where(model.id == max(top // 2, 1))
+                ).first()
+                self.samples[model] = dict(row._mapping) if row else {"id": 1}
+
+    def id(self, model) -> int:
+        return self.samples[model]["id"]
+
+    def ids(self, model) -> list[int]:
+        return list(range(1, min(self.id(model) * 2, 50) + 1))
+
+    def lookup(self, model, column: str):
+        if column not in self.samples[model]:
+            raise Skip(f"{model.__name__} has no {column}")
+        return self.samples[model][column]
+
+    def values(self, model) -> dict:
+        """Column values for a new row; FKs point at existing rows."""
+        n = next(self._serial)
+        values = {}
+        for column in model.__table__.columns:
+            if column.primary_key or column.server_default is not None:
+                continue
+            if column.foreign_keys:
+                target = next(iter(column.foreign_keys)).column.table.name
+                values[column.key] = self.id(MODELS_BY_TABLE[target])
+            elif column.key == "polygon":
+                values[column.key] = POLYGON
+            elif isinstance(column.type, String):
+                values[column.key] = f"bench{n}"
+            elif isinstance(column.type, Boolean):
+                values[column.key] = True
+            elif isinstance(column.type, Integer):
+                values[column.key] = 1
+            elif isinstance(column.type, DateTime):
+                values[column.key] = EPOCH
+        return values
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(
+            ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4
+        ),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "iterations": len(ordered),
+    }
+
+
+def _measure(run_once, iterations: int) -> dict:
+    """`run_once()` returns its own elapsed seconds; the first run is warm-up."""
+    run_once()
+    return _summary([run_once() for _ in range(iterations)])
+
+
+# --- Repo methods ---
+def _repo_arguments(method, model, data: SeedData):
+    """Function of the session returning kwargs for `method`."""
+    builders = {}
+    for name, param in list(inspect.signature(method).parameters.items())[1:]:
+        annotation = param.annotation if isinstance(param.annotation, str) else ""
+        if name in DEFAULTED or name.startswith(DEFAULTED_PREFIX):
+            continue
+        if annotation.lower() in MODELS:
+            target = MODELS[annotation.lower()]
+            if method.__name__ == "delete":
+                builders[name] = lambda s, m=target: _persisted(s, m, data)
+            else:
+                builders[name] = lambda s, m=target: m(**data.values(m))
+        elif name == "values":
+            builders[name] = lambda s: data.values(model)
+        elif name == "rows":
+            builders[name] = lambda s: [data.values(model) for _ in range(BULK_ITEMS)]
+        elif name == "ids":
+            builders[name] = lambda s, ids=data.ids(model): ids
+        elif name.endswith("_ids"):
+            builders[name] = lambda s, ids=data.ids(_id_model(name)): ids
+        elif name.endswith("_id"):
+            builders[name] = lambda s, i=data.id(_id_model(name)): i
+        elif name in LOOKUPS:
+            builders[name] = lambda s, v=data.lookup(model, name): v
+        elif name == "numbers":
+            builders[name] = lambda s, v=data.lookup(model, "number"): [v]
+        else:
+            raise Skip(f"cannot derive parameter {name}")
+    return lambda session: {name: build(session) for name, build in builders.items()}
+
+
+def _persisted(session: Session, model, data: SeedData):
+    row = model(**data.values(model))
+    session.add(row)
+    session.flush()
+    return row
+
+
+def repo_benchmarks(data: SeedData):
+    """(name, run_once) for every public repo method."""
+    for repo_name, repo in sorted(vars(services).items()):
+        if not (repo_name.endswith("Repo") and inspect.isclass(repo)):
+            continue
+        model = _model_for(repo_name[: -len("Repo")])
+        for method_name, method in vars(repo).items():
+            if method_name.startswith("_") or not callable(method):
+                continue
+            name = f"repo.{repo_name}.{method_name}"
+            try:
+                arguments = _repo_arguments(method, model, data)
+            except Skip as exc:
+                yield name, exc
+                continue
+
+            def run_once(repo=repo, method_name=method_name, arguments=arguments):
+                with Session(data.engine) as session:  # closed unflushed = rolled back
+                    kwargs = arguments(session)
+                    call = getattr(repo(session), method_name)
+                    start = time.perf_counter()
+                    call(**kwargs)
+                    return time.perf_counter() - start
+
+            yield name, run_once
+
+
+# --- GraphQL fields ---
+def _selection(gql_type, depth: int, under_list: bool) -> str:
+    """Leaf fields, plus object fields `depth` levels down.
+
+    Below a list only to-one fields are followed, so the document stays
+    within the query cost budget.
+    """
+    named = get_named_type(gql_type)
+    fields = []
+    for name, field in named.fields.items():
+        if any(isinstance(a.type, GraphQLNonNull) for a in field.args.values()):
+            continue
+        child = get_named_type(field.type)
+        if is_leaf_type(child):
+            fields.append(name)
+            continue
+        field_type = (
+            field.type.of_type if isinstance(field.type, GraphQLNonNull) else field.type
+        )
+        is_list = isinstance(field_type, GraphQLList)
+        if (
+            depth
+            and isinstance(child, GraphQLObjectType)
+            and not (under_list and is_list)
+        ):
+            fields.append(
+                f"{name} {_selection(field.type, depth - 1, under_list or is_list)}"
+            )
+    return "{ " + " ".join(fields) + " }"
+
+
+def _graphql_argument(field_name: str, return_type, arg: str, data: SeedData):
+    param = _snake(arg)
+    if param == "id":
+        return data.id(_model_for(get_named_type(return_type).name))
+    if param.endswith("_id"):
+        return data.id(_id_model(param))
+    if param in LOOKUPS:
+        return data.lookup(_model_for(get_named_type(return_type).name), param)
+    raise Skip(f"cannot derive argument {arg} of {field_name}")
+
+
+def _input(input_type, model, data: SeedData) -> dict:
+    values = data.values(model)
+    result = {}
+    for name in get_named_type(input_type).fields:
+        value = values.get(_snake(name))
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        if value is not None:
+            result[name] = value
+    return result
+
+
+def _operation(kind: str, field_name: str, field, data: SeedData):
+    """(document, variables builder taking the connection) for one root field."""
+    variables, builders = [], {}
+    for arg_name, arg in field.args.items():
+        optional = arg.default_value is not Undefined
+        if optional or not isinstance(arg.type, GraphQLNonNull):
+            continue
+        arg_type = arg.type.of_type
+        if arg_name == "data":
+            model = _model_for(get_named_type(arg_type).name)
+            if isinstance(arg_type, GraphQLList):
+                builders[arg_name] = lambda c, m=model, t=arg_type: [
+                    _input(t, m, data) for _ in range(BULK_ITEMS)
+                ]
+            else:
+                builders[arg_name] = lambda c, m=model, t=arg_type: _input(t, m, data)
+        elif arg_name == "id" and field_name.startswith("delete"):
+            model = _model_for(field_name[len("delete") :])
+            builders[arg_name] = lambda c, m=model: c.execute(
+                insert(m).values(**data.values(m)).returning(m.id)
+            ).scalar_one()
+        else:
+            value = _graphql_argument(field_name, field.type, arg_name, data)
+            builders[arg_name] = lambda c, v=value: v
+        variables.append(f"${arg_name}: {arg.type}")
+
+    args = ", ".join(f"{a}: ${a}" for a in builders)
+    call = f"{field_name}({args})" if args else field_name
+    header = f"{kind} Bench{field_name[0].upper()}{field_name[1:]}"
+    if variables:
+        header += f"({', '.join(variables)})"
+    if is_leaf_type(get_named_type(field.type)):
+        body = call
+    else:
+        depth = 1 if kind == "mutation" else 2
+        is_list = isinstance(
+            (
+                field.type.of_type
+                if isinstance(field.type, GraphQLNonNull)
+                else field.type
+            ),
+            GraphQLList,
+        )
+        body = f"{call} {_selection(field.type, depth, is_list)}"
+    document = f"{header} {{ {body} }}"
+    return document, lambda c: {name: build(c) for name, build in builders.items()}
+
+
+def graphql_benchmarks(data: SeedData, client: TestClient, bound: dict):
+    """(name, run_once) for every Query and Mutation field.
+
+    `bound["conn"]` is the connection (inside a transaction) the overridden
+    context getter hands to the request's session.
+    """
+    gql = schema._schema
+    for kind, root in (("query", gql.query_type), ("mutation", gql.mutation_type)):
+        for field_name, field in root.fields.items():
+            name = f"graphql.{root.name}.{field_name}"
+            try:
+                document, build_variables = _operation(kind, field_name, field, data)
+            except Skip as exc:
+                yield name, exc
+                continue
+
+            def run_once(document=document, build_variables=build_variables, name=name):
+                with data.engine.connect() as conn:
+                    transaction = conn.begin()
+                    try:
+                        variables = build_variables(conn)
+                        bound["conn"] = conn
+                        start = time.perf_counter()
+                        response = client.post(
+                            "/graphql", json={"query": document, "variables": variables}
+                        )
+                        elapsed = time.perf_counter() - start
+                    finally:
+                        if transaction.is_active:  # queries already rolled it back
+                            transaction.rollback()
+                body = response.json()
+                if body.get("errors"):
+                    raise RuntimeError(body["errors"][0]["message"])
+                bound["queries"][name] = int(response.headers["X-DB-Queries"])
+                return elapsed
+
+            yield name, run_once
+
+
+def _client(bound: dict) -> TestClient:
+    async def bench_context():
+        # commits inside the app leave the outer transaction to the suite
+        db = Session(
+            bind=bound["conn"],
+            join_transaction_mode="rollback_only",
+            expire_on_commit=False,
+        )
+        return {"db": db, "loaders": Loaders(db)}
+
+    app.dependency_overrides[get_context] = bench_context
+    return TestClient(app)
+
+
+# --- ORM -> Strawberry conversion ---
+def conversion_benchmarks(data: SeedData):
+    for type_name, gql_type in sorted(vars(types).items()):
+        if not (type_name.endswith("Type") and hasattr(gql_type, "from_model")):
+            continue
+        model = MODELS.get(type_name[: -len("Type")].lower())
+        if model is None:
+            continue  # detail types convert composite results, not rows
+        with Session(data.engine) as session:
+            rows = session.scalars(select(model).limit(MAX_LIMIT)).all()
+
+        def convert(rows=rows, convert=gql_type.from_model):
+            start = time.perf_counter()
+            [convert(row) for row in rows]
+            return time.perf_counter() - start
+
+        def connection(rows=rows, convert=gql_type.from_model):
+            start = time.perf_counter()
+            _connection(rows, True, False, convert)
+            return time.perf_counter() - start
+
+        yield f"convert.{type_name}", convert
+        yield f"convert.{type_name}.connection", connection
+
+
+def run(engine, rows: int, iterations: int, only: str | None = None) -> dict:
+    if not is_seeded(engine, rows):
+        seed(engine, rows)
+    data = SeedData(engine)
+    bound = {"queries": {}}
+    client = _client(bound)
+    results, skipped, errors = {}, {}, {}
+    benchmarks = itertools.chain(
+        repo_benchmarks(data),
+        graphql_benchmarks(data, client, bound),
+        conversion_benchmarks(data),
+    )
+    try:
+        for name, run_once in benchmarks:
+            if only and only not in name:
+                continue
+            if isinstance(run_once, Skip):
+                skipped[name] = str(run_once)
+                continue
+            try:
+                results[name] = _measure(run_once, iterations)
+            except Exception as exc:  # report and carry on with the rest
+                errors[name] = f"{type(exc).__name__}: {exc}"
+    finally:
+        app.dependency_overrides.pop(get_context, None)
+    for name, count in bound["queries"].items():
+        if name in results:
+            results[name]["queries"] = count
+    return {
+        "meta": {
+            "rows": rows,
+            "iterations": iterations,
+            "dialect": engine.dialect.name,
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+        "skipped": skipped,
+        "errors": errors,
+    }
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Regressions of `current` against `baseline`, one line each."""
+    regressions = []
+    before = baseline["results"]
+    for name, now in sorted(current["results"].items()):
+        if name not in before:
+            continue
+        old = before[name]
+        if now.get("queries", 0) > old.get("queries", now.get("queries", 0)):
+            regressions.append(
+                f"{name}: {old['queries']} -> {now['queries']} SQL statements"
+            )
+        slower = now["median_ms"] - old["median_ms"]
+        if slower > MIN_DELTA_MS and now["median_ms"] > old["median_ms"] * (
+            1 + threshold
+        ):
+            regressions.append(
+                f"{name}: median {old['median_ms']}ms -> {now['median_ms']}ms"
+                f" (+{slower / old['median_ms']:.0%})"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=10_000,
+        help="rows per table (10000, 100000, 1000000)",
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--only", help="run benchmarks whose name contains this")
+    parser.add_argument(
+        "--reseed", action="store_true", help="reseed even if the row count matches"
+    )
+    parser.add_argument("--output", help="write results JSON here instead of stdout")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed median slowdown (0.25 = 25%%)",
+    )
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # per-request access and cost logs
+
+    connect_args = {}
+    if settings.DATABASE_URL.startswith("sqlite"):
+        connect_args["check_same_thread"] = False  # TestClient serves from a thread
+    engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+    if args.reseed:
+        seed(engine, args.rows)
+
+    report = run(engine, args.rows, args.iterations, args.only)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    for name, error in report["errors"].items():
+        print(f"error {name}: {error}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(report, json.load(fh), args.threshold)
+        for line in regressions:
+            print(f"regression {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
-from typing import List, Optional
+import inspect
+from datetime import date
+from typing import Annotated, AsyncGenerator, Callable, Hashable, List, Optional
 import strawberry
-from sqlalchemy.orm import Session
+from app.core.events import restore
+from app.core.pubsub import broker
+from app.core.session import DbSession, end_unit_of_work
 from app.schema import (
     UserType,
     DefectCategoryType,
+    DefectParetoType,
     DefectType,
     DepartmentType,
     PartType,
@@ -34,17 +39,103 @@ from app.schema import (
     ActivityLogInput,
     FloorInput,
     FloorZoneInput,
+    Connection,
+    Edge,
+    PageInfo,
+    BulkResult,
+    WorkCenterDetailType,
+    PartDetailType,
+    DepartmentDetailType,
+    WorkOrderFilter,
+    WorkOrderOrderBy,
+    RoutingFilter,
+    RoutingStepFilter,
+    BOMFilter,
+    FloorZoneFilter,
 )
-from app.api.services import MutationService, QueryService
+from app.api.errors import integrity_errors
+from app.api.services import (
+    AsyncMutationService,
+    AsyncQueryService,
+    activity_log_buffer,
+    activity_log_values,
+    cursor_for,
+    decode_cursor,
+)
+from app.api.loaders import Loaders
+from models.models import WorkOrder, WorkOrderOp
+
+
+def _connection(
+    rows, has_next: bool, has_previous: bool, convert, order_by=None
+) -> Connection:
+    edges = [Edge(cursor=cursor_for(row, order_by), node=convert(row)) for row in rows]
+    return Connection(
+        edges=edges,
+        page_info=PageInfo(
+            has_next_page=has_next,
+            has_previous_page=has_previous,
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+        ),
+    )
+
+
+def _connection_field(entity: str, node, filter_type=None, order_type=None):
+    """`<entity>Connection(first, after[, filter][, orderBy])` over get_<entity>_page.
+
+    The optional arguments mirror the entity's list field; the resolver's
+    signature is built here so Strawberry sees exactly those arguments.
+    """
+
+    async def resolve(self, info, first=None, after=None, filter=None, order_by=None):
+        db: DbSession = info.context["db"]
+        criteria = {}
+        if filter_type is not None:
+            criteria["filters"] = filter
+        if order_type is not None:
+            criteria["order_by"] = order_by
+        rows, has_next, has_previous = await getattr(
+            AsyncQueryService(db), f"get_{entity}_page"
+        )(first=first, after=decode_cursor(after), **criteria)
+        return _connection(rows, has_next, has_previous, node.from_model, order_by)
+
+    keyword = inspect.Parameter.KEYWORD_ONLY
+    params = [
+        inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD),
+        inspect.Parameter("info", inspect.Parameter.POSITIONAL_OR_KEYWORD),
+        inspect.Parameter("first", keyword, default=None, annotation=Optional[int]),
+        inspect.Parameter("after", keyword, default=None, annotation=Optional[str]),
+    ]
+    if filter_type is not None:
+        params.append(
+            inspect.Parameter(
+                "filter", keyword, default=None, annotation=Optional[filter_type]
+            )
+        )
+    if order_type is not None:
+        params.append(
+            inspect.Parameter(
+                "order_by", keyword, default=None, annotation=Optional[order_type]
+            )
+        )
+    resolve.__signature__ = inspect.Signature(
+        params, return_annotation=Connection[node]
+    )
+    resolve.__annotations__ = {
+        p.name: p.annotation for p in params if p.annotation is not p.empty
+    }
+    resolve.__annotations__["return"] = Connection[node]
+    return strawberry.field(resolver=resolve)
 
 
 @strawberry.type
 class Mutation:
     # ---- Floors (shop-floor layouts) ----
     @strawberry.mutation
-    def add_floor(self, data: FloorInput, info) -> FloorType:
-        db: Session = info.context["db"]
-        floor = MutationService(db).add_floor(data)
+    async def add_floor(self, data: FloorInput, info) -> FloorType:
+        db: DbSession = info.context["db"]
+        floor = await AsyncMutationService(db).add_floor(data)
         return FloorType(
             id=floor.id,
             name=floor.name,
@@ -52,9 +143,9 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def update_floor(self, id: int, data: FloorInput, info) -> FloorType:
-        db: Session = info.context["db"]
-        floor = MutationService(db).update_floor(id, data)
+    async def update_floor(self, id: int, data: FloorInput, info) -> FloorType:
+        db: DbSession = info.context["db"]
+        floor = await AsyncMutationService(db).update_floor(id, data)
         return FloorType(
             id=floor.id,
             name=floor.name,
@@ -62,15 +153,15 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def delete_floor(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_floor(id)
+    async def delete_floor(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_floor(id)
 
     # ---- Floor Zones (SVG regions) ----
     @strawberry.mutation
-    def add_floor_zone(self, data: FloorZoneInput, info) -> FloorZoneType:
-        db: Session = info.context["db"]
-        zone = MutationService(db).add_floor_zone(data)
+    async def add_floor_zone(self, data: FloorZoneInput, info) -> FloorZoneType:
+        db: DbSession = info.context["db"]
+        zone = await AsyncMutationService(db).add_floor_zone(data)
         return FloorZoneType(
             id=zone.id,
             floor_id=zone.floor_id,
@@ -82,9 +173,9 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def update_floor_zone(self, id: int, data: FloorZoneInput, info) -> FloorZoneType:
-        db: Session = info.context["db"]
-        zone = MutationService(db).update_floor_zone(id, data)
+    async def update_floor_zone(self, id: int, data: FloorZoneInput, info) -> FloorZoneType:
+        db: DbSession = info.context["db"]
+        zone = await AsyncMutationService(db).update_floor_zone(id, data)
         return FloorZoneType(
             id=zone.id,
             floor_id=zone.floor_id,
@@ -96,15 +187,15 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def delete_floor_zone(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_floor_zone(id)
+    async def delete_floor_zone(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_floor_zone(id)
 
     @strawberry.mutation
-    def add_user(self, data: UserInput, info) -> UserType:
+    async def add_user(self, data: UserInput, info) -> UserType:
         db = info.context.get("db")
-        service = MutationService(db)
-        user = service.add_user(data)
+        service = AsyncMutationService(db)
+        user = await service.add_user(data)
         return UserType(
             id=user.id,
             username=user.username,
@@ -114,10 +205,10 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def add_department(self, data: DepartmentInput, info) -> DepartmentType:
+    async def add_department(self, data: DepartmentInput, info) -> DepartmentType:
         db = info.context.get("db")
-        service = MutationService(db)
-        department = service.add_department(data)
+        service = AsyncMutationService(db)
+        department = await service.add_department(data)
         return DepartmentType(
             id=department.id,
             title=department.title,
@@ -125,21 +216,21 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def update_department(self, id: int, data: DepartmentInput, info) -> DepartmentType:
-        db: Session = info.context["db"]
-        d = MutationService(db).update_department(id, data)
+    async def update_department(self, id: int, data: DepartmentInput, info) -> DepartmentType:
+        db: DbSession = info.context["db"]
+        d = await AsyncMutationService(db).update_department(id, data)
         return DepartmentType(id=d.id, title=d.title, description=d.description)
 
     @strawberry.mutation
-    def delete_department(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_department(id)
+    async def delete_department(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_department(id)
 
     @strawberry.mutation
-    def add_part(self, data: PartInput, info) -> PartType:
+    async def add_part(self, data: PartInput, info) -> PartType:
         db = info.context.get("db")
-        service = MutationService(db)
-        part = service.add_part(data)
+        service = AsyncMutationService(db)
+        part = await service.add_part(data)
         return PartType(
             id=part.id,
             name=part.name,
@@ -147,12 +238,12 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def add_defect_category(
+    async def add_defect_category(
         self, data: DefectCategoryInput, info
     ) -> DefectCategoryType:
         db = info.context.get("db")
-        service = MutationService(db)
-        defect_category = service.add_defect_category(data)
+        service = AsyncMutationService(db)
+        defect_category = await service.add_defect_category(data)
         return DefectCategoryType(
             id=defect_category.id,
             title=defect_category.title,
@@ -160,10 +251,10 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def add_defect(self, data: DefectInput, info) -> DefectType:
+    async def add_defect(self, data: DefectInput, info) -> DefectType:
         db = info.context.get("db")
-        service = MutationService(db)
-        defect = service.add_defect(data)
+        service = AsyncMutationService(db)
+        defect = await service.add_defect(data)
         return DefectType(
             id=defect.id,
             title=defect.title,
@@ -173,10 +264,10 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def add_quality(self, data: QualityInput, info) -> QualityType:
+    async def add_quality(self, data: QualityInput, info) -> QualityType:
         db = info.context.get("db")
-        service = MutationService(db)
-        quality = service.add_quality(data)
+        service = AsyncMutationService(db)
+        quality = await service.add_quality(data)
         return QualityType(
             id=quality.id,
             pass_fail=quality.pass_fail,
@@ -187,9 +278,9 @@ class Mutation:
         # ---- User CRUD ----
 
     @strawberry.mutation
-    def update_user(self, id: int, data: UserInput, info) -> UserType:
-        db: Session = info.context["db"]
-        u = MutationService(db).update_user(id, data)
+    async def update_user(self, id: int, data: UserInput, info) -> UserType:
+        db: DbSession = info.context["db"]
+        u = await AsyncMutationService(db).update_user(id, data)
         return UserType(
             id=u.id,
             username=u.username,
@@ -199,43 +290,43 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def delete_user(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_user(id)
+    async def delete_user(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_user(id)
 
     # ---- Part CRUD ----
     @strawberry.mutation
-    def update_part(self, id: int, data: PartInput, info) -> PartType:
-        db: Session = info.context["db"]
-        p = MutationService(db).update_part(id, data)
+    async def update_part(self, id: int, data: PartInput, info) -> PartType:
+        db: DbSession = info.context["db"]
+        p = await AsyncMutationService(db).update_part(id, data)
         return PartType(id=p.id, name=p.name, department_id=p.department_id)
 
     @strawberry.mutation
-    def delete_part(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_part(id)
+    async def delete_part(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_part(id)
 
     # ---- DefectCategory CRUD ----
     @strawberry.mutation
-    def update_defect_category(
+    async def update_defect_category(
         self, id: int, data: DefectCategoryInput, info
     ) -> DefectCategoryType:
-        db: Session = info.context["db"]
-        dc = MutationService(db).update_defect_category(id, data)
+        db: DbSession = info.context["db"]
+        dc = await AsyncMutationService(db).update_defect_category(id, data)
         return DefectCategoryType(
             id=dc.id, title=dc.title, department_id=dc.department_id
         )
 
     @strawberry.mutation
-    def delete_defect_category(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_defect_category(id)
+    async def delete_defect_category(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_defect_category(id)
 
     # ---- Defect CRUD ----
     @strawberry.mutation
-    def update_defect(self, id: int, data: DefectInput, info) -> DefectType:
-        db: Session = info.context["db"]
-        d = MutationService(db).update_defect(id, data)
+    async def update_defect(self, id: int, data: DefectInput, info) -> DefectType:
+        db: DbSession = info.context["db"]
+        d = await AsyncMutationService(db).update_defect(id, data)
         return DefectType(
             id=d.id,
             title=d.title,
@@ -245,15 +336,15 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def delete_defect(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_defect(id)
+    async def delete_defect(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_defect(id)
 
     # ---- Quality CRUD ----
     @strawberry.mutation
-    def update_quality(self, id: int, data: QualityInput, info) -> QualityType:
-        db: Session = info.context["db"]
-        q = MutationService(db).update_quality(id, data)
+    async def update_quality(self, id: int, data: QualityInput, info) -> QualityType:
+        db: DbSession = info.context["db"]
+        q = await AsyncMutationService(db).update_quality(id, data)
         return QualityType(
             id=q.id,
             pass_fail=q.pass_fail,
@@ -262,14 +353,14 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def delete_quality(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_quality(id)
+    async def delete_quality(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_quality(id)
 
     @strawberry.mutation
-    def add_work_center(self, data: WorkCenterInput, info) -> WorkCenterType:
-        db: Session = info.context["db"]
-        wc = MutationService(db).add_work_center(data)
+    async def add_work_center(self, data: WorkCenterInput, info) -> WorkCenterType:
+        db: DbSession = info.context["db"]
+        wc = await AsyncMutationService(db).add_work_center(data)
         return WorkCenterType(
             id=wc.id,
             name=wc.name,
@@ -278,9 +369,9 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def add_work_order(self, data: WorkOrderInput, info) -> WorkOrderType:
-        db: Session = info.context["db"]
-        wo = MutationService(db).add_work_order(data)
+    async def add_work_order(self, data: WorkOrderInput, info) -> WorkOrderType:
+        db: DbSession = info.context["db"]
+        wo = await AsyncMutationService(db).add_work_order(data)
         return WorkOrderType(
             id=wo.id,
             number=wo.number,
@@ -292,9 +383,9 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def add_work_order_op(self, data: WorkOrderOpInput, info) -> WorkOrderOpType:
-        db: Session = info.context["db"]
-        op = MutationService(db).add_work_order_op(data)
+    async def add_work_order_op(self, data: WorkOrderOpInput, info) -> WorkOrderOpType:
+        db: DbSession = info.context["db"]
+        op = await AsyncMutationService(db).add_work_order_op(data)
         return WorkOrderOpType(
             id=op.id,
             work_order_id=op.work_order_id,
@@ -306,9 +397,9 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def add_routing(self, data: RoutingInput, info) -> RoutingType:
-        db: Session = info.context["db"]
-        r = MutationService(db).add_routing(data)
+    async def add_routing(self, data: RoutingInput, info) -> RoutingType:
+        db: DbSession = info.context["db"]
+        r = await AsyncMutationService(db).add_routing(data)
         return RoutingType(
             id=r.id,
             name=r.name,
@@ -317,9 +408,9 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def add_routing_step(self, data: RoutingStepInput, info) -> RoutingStepType:
-        db: Session = info.context["db"]
-        s = MutationService(db).add_routing_step(data)
+    async def add_routing_step(self, data: RoutingStepInput, info) -> RoutingStepType:
+        db: DbSession = info.context["db"]
+        s = await AsyncMutationService(db).add_routing_step(data)
         return RoutingStepType(
             id=s.id,
             routing_id=s.routing_id,
@@ -330,9 +421,9 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def add_bom(self, data: BOMInput, info) -> BOMType:
-        db: Session = info.context["db"]
-        b = MutationService(db).add_bom(data)
+    async def add_bom(self, data: BOMInput, info) -> BOMType:
+        db: DbSession = info.context["db"]
+        b = await AsyncMutationService(db).add_bom(data)
         return BOMType(
             id=b.id,
             part_id=b.part_id,
@@ -340,9 +431,9 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def add_bom_item(self, data: BOMItemInput, info) -> BOMItemType:
-        db: Session = info.context["db"]
-        i = MutationService(db).add_bom_item(data)
+    async def add_bom_item(self, data: BOMItemInput, info) -> BOMItemType:
+        db: DbSession = info.context["db"]
+        i = await AsyncMutationService(db).add_bom_item(data)
         return BOMItemType(
             id=i.id,
             bom_id=i.bom_id,
@@ -352,21 +443,21 @@ class Mutation:
 
     # ---- WorkCenter CRUD ----
     @strawberry.mutation
-    def update_work_center(self, id: int, data: WorkCenterInput, info) -> WorkCenterType:
-        db: Session = info.context["db"]
-        wc = MutationService(db).update_work_center(id, data)
+    async def update_work_center(self, id: int, data: WorkCenterInput, info) -> WorkCenterType:
+        db: DbSession = info.context["db"]
+        wc = await AsyncMutationService(db).update_work_center(id, data)
         return WorkCenterType(id=wc.id, name=wc.name, code=wc.code, department_id=wc.department_id)
 
     @strawberry.mutation
-    def delete_work_center(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_work_center(id)
+    async def delete_work_center(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_work_center(id)
 
     # ---- WorkOrder CRUD ----
     @strawberry.mutation
-    def update_work_order(self, id: int, data: WorkOrderInput, info) -> WorkOrderType:
-        db: Session = info.context["db"]
-        wo = MutationService(db).update_work_order(id, data)
+    async def update_work_order(self, id: int, data: WorkOrderInput, info) -> WorkOrderType:
+        db: DbSession = info.context["db"]
+        wo = await AsyncMutationService(db).update_work_order(id, data)
         return WorkOrderType(
             id=wo.id,
             number=wo.number,
@@ -378,15 +469,15 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def delete_work_order(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_work_order(id)
+    async def delete_work_order(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_work_order(id)
 
     # ---- WorkOrderOp CRUD ----
     @strawberry.mutation
-    def update_work_order_op(self, id: int, data: WorkOrderOpInput, info) -> WorkOrderOpType:
-        db: Session = info.context["db"]
-        op = MutationService(db).update_work_order_op(id, data)
+    async def update_work_order_op(self, id: int, data: WorkOrderOpInput, info) -> WorkOrderOpType:
+        db: DbSession = info.context["db"]
+        op = await AsyncMutationService(db).update_work_order_op(id, data)
         return WorkOrderOpType(
             id=op.id,
             work_order_id=op.work_order_id,
@@ -398,27 +489,27 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def delete_work_order_op(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_work_order_op(id)
+    async def delete_work_order_op(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_work_order_op(id)
 
     # ---- Routing CRUD ----
     @strawberry.mutation
-    def update_routing(self, id: int, data: RoutingInput, info) -> RoutingType:
-        db: Session = info.context["db"]
-        r = MutationService(db).update_routing(id, data)
+    async def update_routing(self, id: int, data: RoutingInput, info) -> RoutingType:
+        db: DbSession = info.context["db"]
+        r = await AsyncMutationService(db).update_routing(id, data)
         return RoutingType(id=r.id, name=r.name, part_id=r.part_id, version=r.version)
 
     @strawberry.mutation
-    def delete_routing(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_routing(id)
+    async def delete_routing(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_routing(id)
 
     # ---- RoutingStep CRUD ----
     @strawberry.mutation
-    def update_routing_step(self, id: int, data: RoutingStepInput, info) -> RoutingStepType:
-        db: Session = info.context["db"]
-        s = MutationService(db).update_routing_step(id, data)
+    async def update_routing_step(self, id: int, data: RoutingStepInput, info) -> RoutingStepType:
+        db: DbSession = info.context["db"]
+        s = await AsyncMutationService(db).update_routing_step(id, data)
         return RoutingStepType(
             id=s.id,
             routing_id=s.routing_id,
@@ -429,27 +520,27 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def delete_routing_step(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_routing_step(id)
+    async def delete_routing_step(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_routing_step(id)
 
     # ---- BOM CRUD ----
     @strawberry.mutation
-    def update_bom(self, id: int, data: BOMInput, info) -> BOMType:
-        db: Session = info.context["db"]
-        b = MutationService(db).update_bom(id, data)
+    async def update_bom(self, id: int, data: BOMInput, info) -> BOMType:
+        db: DbSession = info.context["db"]
+        b = await AsyncMutationService(db).update_bom(id, data)
         return BOMType(id=b.id, part_id=b.part_id, revision=b.revision)
 
     @strawberry.mutation
-    def delete_bom(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_bom(id)
+    async def delete_bom(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_bom(id)
 
     # ---- BOMItem CRUD ----
     @strawberry.mutation
-    def update_bom_item(self, id: int, data: BOMItemInput, info) -> BOMItemType:
-        db: Session = info.context["db"]
-        i = MutationService(db).update_bom_item(id, data)
+    async def update_bom_item(self, id: int, data: BOMItemInput, info) -> BOMItemType:
+        db: DbSession = info.context["db"]
+        i = await AsyncMutationService(db).update_bom_item(id, data)
         return BOMItemType(
             id=i.id,
             bom_id=i.bom_id,
@@ -458,14 +549,26 @@ class Mutation:
         )
 
     @strawberry.mutation
-    def delete_bom_item(self, id: int, info) -> bool:
-        db: Session = info.context["db"]
-        return MutationService(db).delete_bom_item(id)
+    async def delete_bom_item(self, id: int, info) -> bool:
+        db: DbSession = info.context["db"]
+        return await AsyncMutationService(db).delete_bom_item(id)
 
     @strawberry.mutation
-    def add_activity_log(self, data: ActivityLogInput, info) -> ActivityLogType:
-        db: Session = info.context["db"]
-        log = MutationService(db).add_activity_log(data)
+    async def add_activity_log(
+        self, data: ActivityLogInput, info, fire_and_forget: bool = False
+    ) -> Optional[ActivityLogType]:
+        """With write-behind on, the row is batched with others; `fireAndForget`
+        then returns null as soon as it is queued instead of after its insert."""
+        if activity_log_buffer.running:
+            pending = await activity_log_buffer.submit(
+                activity_log_values(data), wait=not fire_and_forget
+            )
+            if pending is None:
+                return None
+            with integrity_errors():
+                return ActivityLogType.from_model(await pending)
+        db: DbSession = info.context["db"]
+        log = await AsyncMutationService(db).add_activity_log(data)
         return ActivityLogType(
             id=log.id,
             user_id=log.user_id,
@@ -477,15 +580,54 @@ class Mutation:
             created_at=log.created_at.isoformat() if log.created_at else "",
         )
 
+    # ---- Bulk inserts ----
+    @strawberry.mutation
+    async def add_work_orders(
+        self, data: List[WorkOrderInput], info
+    ) -> BulkResult[WorkOrderType]:
+        db: DbSession = info.context["db"]
+        created, errors = await AsyncMutationService(db).add_work_orders(data)
+        return BulkResult(
+            created=[WorkOrderType.from_model(wo) for wo in created], errors=errors
+        )
+
+    @strawberry.mutation
+    async def add_work_order_ops(
+        self, data: List[WorkOrderOpInput], info
+    ) -> BulkResult[WorkOrderOpType]:
+        db: DbSession = info.context["db"]
+        created, errors = await AsyncMutationService(db).add_work_order_ops(data)
+        return BulkResult(
+            created=[WorkOrderOpType.from_model(op) for op in created], errors=errors
+        )
+
+    @strawberry.mutation
+    async def add_qualities(
+        self, data: List[QualityInput], info
+    ) -> BulkResult[QualityType]:
+        db: DbSession = info.context["db"]
+        created, errors = await AsyncMutationService(db).add_qualities(data)
+        return BulkResult(
+            created=[QualityType.from_model(q) for q in created], errors=errors
+        )
+
+    @strawberry.mutation
+    async def add_defects(self, data: List[DefectInput], info) -> BulkResult[DefectType]:
+        db: DbSession = info.context["db"]
+        created, errors = await AsyncMutationService(db).add_defects(data)
+        return BulkResult(
+            created=[DefectType.from_model(d) for d in created], errors=errors
+        )
+
 
 @strawberry.type
 class Query:
     @strawberry.field
-    def users(
+    async def users(
         self, info, limit: int | None = None, offset: int | None = None
     ) -> List[UserType]:
-        db: Session = info.context.get("db")
-        users = QueryService(db).get_all_users(limit=limit, offset=offset)
+        db: DbSession = info.context.get("db")
+        users = await AsyncQueryService(db).get_all_users(limit=limit, offset=offset)
         return [
             UserType(
                 id=user.id,
@@ -498,9 +640,9 @@ class Query:
         ]
 
     @strawberry.field
-    def user(self, info, id: int) -> UserType:
-        db: Session = info.context["db"]
-        user = QueryService(db).get_user(id)
+    async def user(self, info, id: int) -> UserType:
+        db: DbSession = info.context["db"]
+        user = await AsyncQueryService(db).get_user(id)
         return UserType(
             id=user.id,
             username=user.username,
@@ -510,12 +652,12 @@ class Query:
         )
 
     @strawberry.field
-    def departments(
+    async def departments(
         self, info, limit: int | None = None, offset: int | None = None
     ) -> List[DepartmentType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
-        departments = service.get_all_departments(limit=limit, offset=offset)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
+        departments = await service.get_all_departments(limit=limit, offset=offset)
         return [
             DepartmentType(
                 id=department.id,
@@ -526,28 +668,47 @@ class Query:
         ]
 
     @strawberry.field
-    def department(self, info, id: int) -> DepartmentType:
-        db: Session = info.context["db"]
-        department = QueryService(db).get_department(id)
+    async def department(self, info, id: int) -> DepartmentType:
+        db: DbSession = info.context["db"]
+        department = await AsyncQueryService(db).get_department(id)
         return DepartmentType(
             id=department.id, title=department.title, description=department.description
         )
 
+    # ---- Detail pages: entity plus bounded related collections ----
+    @strawberry.field
+    async def work_center_detail(self, info, id: int) -> WorkCenterDetailType:
+        db: DbSession = info.context["db"]
+        detail = await AsyncQueryService(db).get_work_center_detail(id)
+        return WorkCenterDetailType.from_model(detail)
+
     @strawberry.field
-    def department_by_title(self, info, title: str) -> DepartmentType:
-        db: Session = info.context["db"]
-        department = QueryService(db).get_department_by_title(title)
+    async def part_detail(self, info, id: int) -> PartDetailType:
+        db: DbSession = info.context["db"]
+        detail = await AsyncQueryService(db).get_part_detail(id)
+        return PartDetailType.from_model(detail)
+
+    @strawberry.field
+    async def department_detail(self, info, id: int) -> DepartmentDetailType:
+        db: DbSession = info.context["db"]
+        detail = await AsyncQueryService(db).get_department_detail(id)
+        return DepartmentDetailType.from_model(detail)
+
+    @strawberry.field
+    async def department_by_title(self, info, title: str) -> DepartmentType:
+        db: DbSession = info.context["db"]
+        department = await AsyncQueryService(db).get_department_by_title(title)
         return DepartmentType(
             id=department.id, title=department.title, description=department.description
         )
 
     @strawberry.field
-    def parts(
+    async def parts(
         self, info, limit: int | None = None, offset: int | None = None
     ) -> List[PartType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
-        parts = service.get_all_parts(limit=limit, offset=offset)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
+        parts = await service.get_all_parts(limit=limit, offset=offset)
         return [
             PartType(
                 id=part.id,
@@ -558,18 +719,18 @@ class Query:
         ]
 
     @strawberry.field
-    def part(self, info, id: int) -> PartType:
-        db: Session = info.context["db"]
-        part = QueryService(db).get_part(id)
+    async def part(self, info, id: int) -> PartType:
+        db: DbSession = info.context["db"]
+        part = await AsyncQueryService(db).get_part(id)
         return PartType(id=part.id, name=part.name, department_id=part.department_id)
 
     @strawberry.field
-    def defect_categories(
+    async def defect_categories(
         self, info, limit: int | None = None, offset: int | None = None
     ) -> List[DefectCategoryType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
-        defect_categories = service.get_all_defect_categories(
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
+        defect_categories = await service.get_all_defect_categories(
             limit=limit, offset=offset
         )
         return [
@@ -582,9 +743,9 @@ class Query:
         ]
 
     @strawberry.field
-    def defect_category(self, info, id: int) -> DefectCategoryType:
-        db: Session = info.context["db"]
-        defect_category = QueryService(db).get_defect_category(id)
+    async def defect_category(self, info, id: int) -> DefectCategoryType:
+        db: DbSession = info.context["db"]
+        defect_category = await AsyncQueryService(db).get_defect_category(id)
         return DefectCategoryType(
             id=defect_category.id,
             title=defect_category.title,
@@ -592,12 +753,12 @@ class Query:
         )
 
     @strawberry.field
-    def defects(
+    async def defects(
         self, info, limit: int | None = None, offset: int | None = None
     ) -> List[DefectType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
-        defects = service.get_all_defects(limit=limit, offset=offset)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
+        defects = await service.get_all_defects(limit=limit, offset=offset)
         return [
             DefectType(
                 id=defect.id,
@@ -610,9 +771,9 @@ class Query:
         ]
 
     @strawberry.field
-    def defect(self, info, id: int) -> DefectType:
-        db: Session = info.context["db"]
-        defect = QueryService(db).get_defect(id)
+    async def defect(self, info, id: int) -> DefectType:
+        db: DbSession = info.context["db"]
+        defect = await AsyncQueryService(db).get_defect(id)
         return DefectType(
             id=defect.id,
             title=defect.title,
@@ -622,12 +783,31 @@ class Query:
         )
 
     @strawberry.field
-    def qualities(
+    async def defect_pareto(
+        self,
+        info,
+        department_id: Optional[int] = None,
+        from_: Annotated[Optional[date], strawberry.argument(name="from")] = None,
+        to: Optional[date] = None,
+        top: int = 10,
+    ) -> List[DefectParetoType]:
+        """Defect categories by count over days `from`..`to`, most frequent first.
+
+        Reads the defect_daily_counts rollup only, never the defects table.
+        """
+        db: DbSession = info.context["db"]
+        rows = await AsyncQueryService(db).get_defect_pareto(
+            department_id, from_, to, top
+        )
+        return [DefectParetoType.from_model(r) for r in rows]
+
+    @strawberry.field
+    async def qualities(
         self, info, limit: int | None = None, offset: int | None = None
     ) -> List[QualityType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
-        qualities = service.get_all_qualities(limit=limit, offset=offset)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
+        qualities = await service.get_all_qualities(limit=limit, offset=offset)
         return [
             QualityType(
                 id=quality.id,
@@ -639,9 +819,9 @@ class Query:
         ]
 
     @strawberry.field
-    def quality(self, info, id: int) -> QualityType:
-        db: Session = info.context["db"]
-        quality = QueryService(db).get_quality(id)
+    async def quality(self, info, id: int) -> QualityType:
+        db: DbSession = info.context["db"]
+        quality = await AsyncQueryService(db).get_quality(id)
         return QualityType(
             id=quality.id,
             pass_fail=quality.pass_fail,
@@ -650,12 +830,12 @@ class Query:
         )
 
     @strawberry.field
-    def work_centers(
+    async def work_centers(
         self, info, limit: int | None = None, offset: int | None = None
     ) -> List[WorkCenterType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
-        centers = service.get_all_work_centers(limit=limit, offset=offset)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
+        centers = await service.get_all_work_centers(limit=limit, offset=offset)
         return [
             WorkCenterType(
                 id=wc.id,
@@ -667,18 +847,25 @@ class Query:
         ]
 
     @strawberry.field
-    def work_center(self, info, id: int) -> WorkCenterType:
-        db: Session = info.context["db"]
-        wc = QueryService(db).get_work_center(id)
+    async def work_center(self, info, id: int) -> WorkCenterType:
+        db: DbSession = info.context["db"]
+        wc = await AsyncQueryService(db).get_work_center(id)
         return WorkCenterType(id=wc.id, name=wc.name, code=wc.code, department_id=wc.department_id)
 
     @strawberry.field
-    def work_orders(
-        self, info, limit: int | None = None, offset: int | None = None
+    async def work_orders(
+        self,
+        info,
+        limit: int | None = None,
+        offset: int | None = None,
+        filter: Optional[WorkOrderFilter] = None,
+        order_by: Optional[WorkOrderOrderBy] = None,
     ) -> List[WorkOrderType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
-        orders = service.get_all_work_orders(limit=limit, offset=offset)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
+        orders = await service.get_all_work_orders(
+            limit=limit, offset=offset, filters=filter, order_by=order_by
+        )
         return [
             WorkOrderType(
                 id=wo.id,
@@ -693,9 +880,9 @@ class Query:
         ]
 
     @strawberry.field
-    def work_order(self, info, id: int) -> WorkOrderType:
-        db: Session = info.context["db"]
-        wo = QueryService(db).get_work_order(id)
+    async def work_order(self, info, id: int) -> WorkOrderType:
+        db: DbSession = info.context["db"]
+        wo = await AsyncQueryService(db).get_work_order(id)
         return WorkOrderType(
             id=wo.id,
             number=wo.number,
@@ -707,19 +894,19 @@ class Query:
         )
 
     @strawberry.field
-    def work_order_ops(
+    async def work_order_ops(
         self,
         info,
         work_order_id: Optional[int] = None,
         limit: int | None = None,
         offset: int | None = None,
     ) -> List[WorkOrderOpType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
         if work_order_id is not None:
-            ops = service.get_work_order_ops_by_work_order(work_order_id)
+            ops = await service.get_work_order_ops_by_work_order(work_order_id)
         else:
-            ops = service.get_all_work_order_ops(limit=limit, offset=offset)
+            ops = await service.get_all_work_order_ops(limit=limit, offset=offset)
         return [
             WorkOrderOpType(
                 id=op.id,
@@ -734,9 +921,9 @@ class Query:
         ]
 
     @strawberry.field
-    def work_order_op(self, info, id: int) -> WorkOrderOpType:
-        db: Session = info.context["db"]
-        op = QueryService(db).get_work_order_op(id)
+    async def work_order_op(self, info, id: int) -> WorkOrderOpType:
+        db: DbSession = info.context["db"]
+        op = await AsyncQueryService(db).get_work_order_op(id)
         return WorkOrderOpType(
             id=op.id,
             work_order_id=op.work_order_id,
@@ -748,12 +935,18 @@ class Query:
         )
 
     @strawberry.field
-    def routings(
-        self, info, limit: int | None = None, offset: int | None = None
+    async def routings(
+        self,
+        info,
+        limit: int | None = None,
+        offset: int | None = None,
+        filter: Optional[RoutingFilter] = None,
     ) -> List[RoutingType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
-        routings = service.get_all_routings(limit=limit, offset=offset)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
+        routings = await service.get_all_routings(
+            limit=limit, offset=offset, filters=filter
+        )
         return [
             RoutingType(
                 id=r.id,
@@ -765,25 +958,28 @@ class Query:
         ]
 
     @strawberry.field
-    def routing(self, info, id: int) -> RoutingType:
-        db: Session = info.context["db"]
-        r = QueryService(db).get_routing(id)
+    async def routing(self, info, id: int) -> RoutingType:
+        db: DbSession = info.context["db"]
+        r = await AsyncQueryService(db).get_routing(id)
         return RoutingType(id=r.id, name=r.name, part_id=r.part_id, version=r.version)
 
     @strawberry.field
-    def routing_steps(
+    async def routing_steps(
         self,
         info,
         routing_id: Optional[int] = None,
         limit: int | None = None,
         offset: int | None = None,
+        filter: Optional[RoutingStepFilter] = None,
     ) -> List[RoutingStepType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
         if routing_id is not None:
-            steps = service.get_routing_steps_by_routing(routing_id)
+            steps = await service.get_routing_steps_by_routing(routing_id)
         else:
-            steps = service.get_all_routing_steps(limit=limit, offset=offset)
+            steps = await service.get_all_routing_steps(
+                limit=limit, offset=offset, filters=filter
+            )
         return [
             RoutingStepType(
                 id=s.id,
@@ -797,9 +993,9 @@ class Query:
         ]
 
     @strawberry.field
-    def routing_step(self, info, id: int) -> RoutingStepType:
-        db: Session = info.context["db"]
-        s = QueryService(db).get_routing_step(id)
+    async def routing_step(self, info, id: int) -> RoutingStepType:
+        db: DbSession = info.context["db"]
+        s = await AsyncQueryService(db).get_routing_step(id)
         return RoutingStepType(
             id=s.id,
             routing_id=s.routing_id,
@@ -810,12 +1006,16 @@ class Query:
         )
 
     @strawberry.field
-    def boms(
-        self, info, limit: int | None = None, offset: int | None = None
+    async def boms(
+        self,
+        info,
+        limit: int | None = None,
+        offset: int | None = None,
+        filter: Optional[BOMFilter] = None,
     ) -> List[BOMType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
-        boms = service.get_all_boms(limit=limit, offset=offset)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
+        boms = await service.get_all_boms(limit=limit, offset=offset, filters=filter)
         return [
             BOMType(
                 id=b.id,
@@ -826,25 +1026,25 @@ class Query:
         ]
 
     @strawberry.field
-    def bom(self, info, id: int) -> BOMType:
-        db: Session = info.context["db"]
-        b = QueryService(db).get_bom(id)
+    async def bom(self, info, id: int) -> BOMType:
+        db: DbSession = info.context["db"]
+        b = await AsyncQueryService(db).get_bom(id)
         return BOMType(id=b.id, part_id=b.part_id, revision=b.revision)
 
     @strawberry.field
-    def bom_items(
+    async def bom_items(
         self,
         info,
         bom_id: Optional[int] = None,
         limit: int | None = None,
         offset: int | None = None,
     ) -> List[BOMItemType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
         if bom_id is not None:
-            items = service.get_bom_items_by_bom(bom_id)
+            items = await service.get_bom_items_by_bom(bom_id)
         else:
-            items = service.get_all_bom_items(limit=limit, offset=offset)
+            items = await service.get_all_bom_items(limit=limit, offset=offset)
         return [
             BOMItemType(
                 id=i.id,
@@ -856,9 +1056,9 @@ class Query:
         ]
 
     @strawberry.field
-    def bom_item(self, info, id: int) -> BOMItemType:
-        db: Session = info.context["db"]
-        i = QueryService(db).get_bom_item(id)
+    async def bom_item(self, info, id: int) -> BOMItemType:
+        db: DbSession = info.context["db"]
+        i = await AsyncQueryService(db).get_bom_item(id)
         return BOMItemType(
             id=i.id,
             bom_id=i.bom_id,
@@ -867,12 +1067,12 @@ class Query:
         )
 
     @strawberry.field
-    def activity_logs(
+    async def activity_logs(
         self, info, limit: int | None = None, offset: int | None = None
     ) -> List[ActivityLogType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
-        logs = service.get_all_activity_logs(limit=limit, offset=offset)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
+        logs = await service.get_all_activity_logs(limit=limit, offset=offset)
         return [
             ActivityLogType(
                 id=log.id,
@@ -888,11 +1088,11 @@ class Query:
         ]
 
     @strawberry.field
-    def activity_logs_for_work_order(
+    async def activity_logs_for_work_order(
         self, info, work_order_id: int
     ) -> List[ActivityLogType]:
-        db: Session = info.context["db"]
-        logs = QueryService(db).get_activity_logs_for_work_order(work_order_id)
+        db: DbSession = info.context["db"]
+        logs = await AsyncQueryService(db).get_activity_logs_for_work_order(work_order_id)
         return [
             ActivityLogType(
                 id=log.id,
@@ -908,12 +1108,12 @@ class Query:
         ]
 
     @strawberry.field
-    def floors(
+    async def floors(
         self, info, limit: int | None = None, offset: int | None = None
     ) -> List[FloorType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
-        floors = service.get_all_floors(limit=limit, offset=offset)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
+        floors = await service.get_all_floors(limit=limit, offset=offset)
         return [
             FloorType(
                 id=f.id,
@@ -924,9 +1124,9 @@ class Query:
         ]
 
     @strawberry.field
-    def floor(self, info, id: int) -> FloorType:
-        db: Session = info.context["db"]
-        f = QueryService(db).get_floor(id)
+    async def floor(self, info, id: int) -> FloorType:
+        db: DbSession = info.context["db"]
+        f = await AsyncQueryService(db).get_floor(id)
         return FloorType(
             id=f.id,
             name=f.name,
@@ -934,19 +1134,22 @@ class Query:
         )
 
     @strawberry.field
-    def floor_zones(
+    async def floor_zones(
         self,
         info,
         floor_id: Optional[int] = None,
         limit: int | None = None,
         offset: int | None = None,
+        filter: Optional[FloorZoneFilter] = None,
     ) -> List[FloorZoneType]:
-        db: Session = info.context.get("db")
-        service = QueryService(db)
+        db: DbSession = info.context.get("db")
+        service = AsyncQueryService(db)
         if floor_id is not None:
-            zones = service.get_floor_zones_by_floor(floor_id)
+            zones = await service.get_floor_zones_by_floor(floor_id)
         else:
-            zones = service.get_all_floor_zones(limit=limit, offset=offset)
+            zones = await service.get_all_floor_zones(
+                limit=limit, offset=offset, filters=filter
+            )
         return [
             FloorZoneType(
                 id=z.id,
@@ -959,3 +1162,76 @@ class Query:
             )
             for z in zones
         ]
+
+    # ---- Cursor (keyset) connections ----
+    users_connection = _connection_field("users", UserType)
+    departments_connection = _connection_field("departments", DepartmentType)
+    parts_connection = _connection_field("parts", PartType)
+    defect_categories_connection = _connection_field(
+        "defect_categories", DefectCategoryType
+    )
+    defects_connection = _connection_field("defects", DefectType)
+    qualities_connection = _connection_field("qualities", QualityType)
+    work_centers_connection = _connection_field("work_centers", WorkCenterType)
+    work_orders_connection = _connection_field(
+        "work_orders", WorkOrderType, WorkOrderFilter, WorkOrderOrderBy
+    )
+    work_order_ops_connection = _connection_field("work_order_ops", WorkOrderOpType)
+    routings_connection = _connection_field("routings", RoutingType, RoutingFilter)
+    routing_steps_connection = _connection_field(
+        "routing_steps", RoutingStepType, RoutingStepFilter
+    )
+    boms_connection = _connection_field("boms", BOMType, BOMFilter)
+    bom_items_connection = _connection_field("bom_items", BOMItemType)
+    activity_logs_connection = _connection_field("activity_logs", ActivityLogType)
+    floors_connection = _connection_field("floors", FloorType)
+    floor_zones_connection = _connection_field(
+        "floor_zones", FloorZoneType, FloorZoneFilter
+    )
+
+
+async def _changes(info, topic: Hashable, convert: Callable) -> AsyncGenerator:
+    """Yield `convert(data)` for each committed change published on `topic`.
+
+    The operation's own session is closed by UnitOfWork once the subscription
+    starts, so nested fields of each event resolve on a fresh lazy session
+    and loaders, closed again before waiting for the next event; an idle
+    subscription holds neither stale rows nor a pooled connection.
+    """
+    context = info.context
+    with broker.subscribe(topic) as subscriber:
+        async for data in subscriber:
+            db = context["db"] = context["db"].fresh()
+            context["loaders"] = Loaders(db)
+            try:
+                yield convert(data)
+            finally:
+                await end_unit_of_work(db, commit=False)
+                await db.aclose()
+
+
+@strawberry.type
+class Subscription:
+    @strawberry.subscription
+    async def work_order_op_changed(
+        self, info, work_center_id: int
+    ) -> AsyncGenerator[WorkOrderOpType, None]:
+        """Operations created or updated at (or moved off) a work center."""
+        async for op in _changes(
+            info,
+            ("work_order_op", work_center_id),
+            lambda data: WorkOrderOpType.from_model(restore(WorkOrderOp, data)),
+        ):
+            yield op
+
+    @strawberry.subscription
+    async def work_order_changed(
+        self, info, department_id: int
+    ) -> AsyncGenerator[WorkOrderType, None]:
+        """Work orders created or updated in (or moved out of) a department."""
+        async for wo in _changes(
+            info,
+            ("work_order", department_id),
+            lambda data: WorkOrderType.from_model(restore(WorkOrder, data)),
+        ):
+            yield wo
@@ -1,16 +1,36 @@
 from __future__ import annotations
 import logging
+from contextlib import asynccontextmanager
 import strawberry
 from strawberry.schema.config import StrawberryConfig
 from fastapi import FastAPI, Request
+from starlette.requests import HTTPConnection
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from strawberry.fastapi import GraphQLRouter
-from core import Mutation, Query
+from fastapi.responses import JSONResponse, Response
+from core import Mutation, Query, Subscription
+from app.api.conditional import conditional_get
+from app.api.cost import QueryCostLimit
+from app.api.documents import CachedDocuments, document_cache
+from app.api.errors import classify_error
+from app.api.export import export_router
+from app.api.extensions import Metrics, QueryCounter, UnitOfWork
+from app.api.imports import import_router
+from app.api.loaders import Loaders
+from app.api.services import activity_log_buffer
+from app.api.persisted_queries import (
+    PersistedQueryAllowlist,
+    PersistedQueryRouter,
+    persisted_queries,
+)
 from app.core.config import settings
 from sqlalchemy import text
-from app.core.database import SessionLocal, engine
+from app.core.database import AsyncSessionLocal, SessionLocal, engine, instrument_pool
+from app.core.session import LazySession, lazy_session_stats
+from app.core.cache import reference_cache
+from app.core.events import bus
+from app.core.pubsub import broker
+from app.core import metrics
 
 
 logging.basicConfig(
@@ -28,9 +48,50 @@ def _as_list(v):
 schema = strawberry.Schema(
     query=Query,
     mutation=Mutation,
+    subscription=Subscription,
     config=StrawberryConfig(auto_camel_case=True),
+    extensions=[
+        PersistedQueryAllowlist,
+        Metrics,
+        QueryCounter,
+        CachedDocuments,
+        QueryCostLimit,
+        UnitOfWork,
+    ],
 )
-app = FastAPI(title=settings.PROJECT_NAME)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # committed work-order / op changes feed the GraphQL subscriptions, from
+    # this worker or (EVENT_BUS=postgres) any other
+    bus.subscribe(("work_order", "work_order_op"), broker.forward)
+    bus.start()
+    if settings.ACTIVITY_LOG_WRITE_BEHIND:
+        activity_log_buffer.start(engine)
+    try:
+        yield
+    finally:
+        # flush queued activity logs before the process exits
+        await activity_log_buffer.close()
+        bus.close()
+
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+
+# pool gauges and checkout wait on /metrics (server databases only)
+instrument_pool()
+
+# ETag / If-None-Match for GET queries (inside CORS, so 304s carry its headers).
+# Validators come from per-process table versions, so one worker could answer
+# 304 for a write another worker committed: only served with a single worker.
+if settings.WEB_CONCURRENCY == 1:
+    app.middleware("http")(conditional_get(schema._schema, persisted_queries))
+else:
+    log.warning(
+        "WEB_CONCURRENCY=%d: ETags on GET /graphql disabled (single worker only)",
+        settings.WEB_CONCURRENCY,
+    )
 
 # CORS
 app.add_middleware(
@@ -43,87 +104,50 @@ app.add_middleware(
 
 
 # Per-request DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-async def get_context(request: Request):
-    # allocate a per-request session for GraphQL
-    db_gen = get_db()
-    db = next(db_gen)
-    request.state._db_gen = db_gen
+async def get_context(request: HTTPConnection):
+    # HTTPConnection rather than Request: also resolves for /graphql WebSockets
+    # Lazily allocate the per-request session; UnitOfWork commits and closes it once
+    # execution finishes (AsyncSession when DB_ASYNC)
+    db = LazySession(AsyncSessionLocal if settings.DB_ASYNC else SessionLocal)
     request.state.db = db
-    return {"db": db}
-
-
-@app.middleware("http")
-async def close_db_after_request(request: Request, call_next):
-    try:
-        return await call_next(request)
-    finally:
-        db_gen = getattr(request.state, "_db_gen", None)
-        if db_gen:
-            try:
-                next(db_gen)
-            except StopIteration:
-                pass
+    return {"db": db, "loaders": Loaders(db)}
 
 
 # --- GraphQL error formatting with codes ---
 def graphql_error_formatter(error):
-    # Try to unwrap the original exception raised in resolvers/services
-    original = getattr(error, "original_error", None) or error
-    message = str(original) if original else str(error)
-
-    # Prefer an explicit extensions.code if provided on the original error
-    ext = (
-        getattr(original, "extensions", None)
-        or getattr(error, "extensions", None)
-        or {}
-    )
-    code = ext.get("code")
-
-    # If no explicit code, fall back to the prefix convention
-    if not code and isinstance(message, str):
-        if message.startswith("NOT_FOUND:"):
-            code = "NOT_FOUND"
-            message = message.split(":", 1)[1].strip()
-        elif message.startswith("CONFLICT:"):
-            code = "CONFLICT"
-            message = message.split(":", 1)[1].strip()
-        elif message.startswith("VALIDATION:"):
-            code = "BAD_REQUEST"
-            message = message.split(":", 1)[1].strip()
-
-    if not code:
-        code = "INTERNAL_SERVER_ERROR"
+    code, message, ext = classify_error(error)
 
     # Build a GraphQL-compliant error dict with extensions.code
+    formatted = getattr(error, "formatted", {})
     return {
         "message": message,
-        "locations": getattr(error, "locations", None),
-        "path": getattr(error, "path", None),
-        "extensions": {"code": code},
+        "locations": formatted.get("locations"),
+        "path": formatted.get("path"),
+        "extensions": {**ext, "code": code},
     }
 
 
 try:
-    graphql_app = GraphQLRouter(
+    graphql_app = PersistedQueryRouter(
         schema,
+        store=persisted_queries,
         context_getter=get_context,
         error_formatter=graphql_error_formatter,  # newer Strawberry
     )
 except TypeError:
-    graphql_app = GraphQLRouter(
+    graphql_app = PersistedQueryRouter(
         schema,
+        store=persisted_queries,
         context_getter=get_context,
     )
 app.include_router(graphql_app, prefix="/graphql")
 
+# Bulk extracts (NDJSON/CSV) streamed straight from a server-side cursor
+app.include_router(export_router(engine))
+
+# Bulk CSV loads of parts / work centers / work orders through a staging table
+app.include_router(import_router(SessionLocal))
+
 
 # Health & readiness
 @app.get("/healthz")
@@ -131,6 +155,30 @@ def healthz():
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+def prometheus_metrics():
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return {
+        "reference": {**reference_cache.stats.as_dict(), "entries": len(reference_cache)},
+        "documents": {**document_cache.stats.as_dict(), "entries": len(document_cache)},
+        # GraphQL requests served, and how many never checked out a connection
+        "sessions": lazy_session_stats.as_dict(),
+    }
+
+
+@app.get("/persisted-queries")
+def persisted_query_registry():
+    # save as a manifest for APQ_MANIFEST_PATH / APQ_ALLOWLIST_ONLY
+    return {
+        "stats": persisted_queries.stats.as_dict(),
+        "queries": persisted_queries.as_dict(),
+    }
+
+
 @app.get("/readyz")
 def readyz():
     if not settings.DATABASE_URL:
@@ -1,7 +1,27 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, func
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Boolean,
+    ForeignKey,
+    Date,
+    DateTime,
+    Index,
+    MetaData,
+    func,
+)
 from sqlalchemy.orm import declarative_base, relationship
 
-Base = declarative_base()
+# Postgres' default constraint names, so app/api/errors.py can map the
+# constraint reported by the server back to the model that declared it.
+NAMING_CONVENTION = {
+    "ix": "ix_%(column_0_label)s",
+    "uq": "%(table_name)s_%(column_0_name)s_key",
+    "fk": "%(table_name)s_%(column_0_name)s_fkey",
+    "pk": "%(table_name)s_pkey",
+}
+
+Base = declarative_base(metadata=MetaData(naming_convention=NAMING_CONVENTION))
 
 
 class User(Base):
@@ -9,7 +29,7 @@ class User(Base):
 
     id = Column(Integer, primary_key=True)
     username = Column(String(50), unique=True, nullable=False)
-    department_id = Column(Integer, ForeignKey("departments.id"))
+    department_id = Column(Integer, ForeignKey("departments.id"), index=True)
     job = Column(String(50))
     time = Column(Integer)
 
@@ -51,31 +71,57 @@ class DefectCategory(Base):
 
     id = Column(Integer, primary_key=True)
     title = Column(String(50), unique=True, nullable=False)
-    department_id = Column(Integer, ForeignKey("departments.id"))
+    department_id = Column(Integer, ForeignKey("departments.id"), index=True)
 
     department = relationship("Department", back_populates="defect_categories")
 
 
 class Defect(Base):
     __tablename__ = "defects"
+    # Fetch created_at in the INSERT's RETURNING; the rollup needs its day
+    __mapper_args__ = {"eager_defaults": True}
+    # part_id leads, so part-only lookups use the same index
+    __table_args__ = (
+        Index("ix_defects_part_id_defect_category_id", "part_id", "defect_category_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String(50), nullable=False)
     description = Column(String(255))
     part_id = Column(Integer, ForeignKey("parts.id"))
-    defect_category_id = Column(Integer, ForeignKey("defect_categories.id"))
+    defect_category_id = Column(Integer, ForeignKey("defect_categories.id"), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     part = relationship("Part", back_populates="defects")
     defect_category = relationship("DefectCategory")
 
 
+class DefectDailyCount(Base):
+    """Defects per category, part and day; see app/api/rollups.py.
+
+    Derived from `defects` (and rebuildable from it), so no foreign keys.
+    """
+
+    __tablename__ = "defect_daily_counts"
+    # defectPareto filters by department and day range
+    __table_args__ = (
+        Index("ix_defect_daily_counts_department_id_day", "department_id", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    defect_category_id = Column(Integer, primary_key=True)
+    part_id = Column(Integer, primary_key=True)
+    department_id = Column(Integer)
+    count = Column(Integer, nullable=False)
+
+
 class Quality(Base):
     __tablename__ = "quality"
 
     id = Column(Integer, primary_key=True)
     pass_fail = Column(Boolean, nullable=False)
     defect_count = Column(Integer, default=0)
-    part_id = Column(Integer, ForeignKey("parts.id"))
+    part_id = Column(Integer, ForeignKey("parts.id"), index=True)
 
     part = relationship("Part", back_populates="quality_records")
 
@@ -86,7 +132,9 @@ class WorkCenter(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     code = Column(String(50), unique=True, nullable=True)
-    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
+    department_id = Column(
+        Integer, ForeignKey("departments.id"), index=True, nullable=True
+    )
 
     department = relationship("Department", back_populates="work_centers")
     work_orders = relationship("WorkOrder", back_populates="work_center")
@@ -103,8 +151,12 @@ class WorkOrder(Base):
     status = Column(String(30), nullable=False, default="open")
     quantity = Column(Integer, nullable=False, default=1)
     part_id = Column(Integer, ForeignKey("parts.id"), index=True, nullable=False)
-    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
-    work_center_id = Column(Integer, ForeignKey("work_centers.id"), nullable=True)
+    department_id = Column(
+        Integer, ForeignKey("departments.id"), index=True, nullable=True
+    )
+    work_center_id = Column(
+        Integer, ForeignKey("work_centers.id"), index=True, nullable=True
+    )
 
     part = relationship("Part", back_populates="work_orders")
     department = relationship("Department")
@@ -115,11 +167,17 @@ class WorkOrder(Base):
 
 class WorkOrderOp(Base):
     __tablename__ = "work_order_ops"
+    # serves list_by_work_order's filter and its ORDER BY sequence
+    __table_args__ = (
+        Index("ix_work_order_ops_work_order_id_sequence", "work_order_id", "sequence"),
+    )
 
     id = Column(Integer, primary_key=True)
     work_order_id = Column(Integer, ForeignKey("work_orders.id"), nullable=False)
     sequence = Column(Integer, nullable=False)
-    work_center_id = Column(Integer, ForeignKey("work_centers.id"), nullable=True)
+    work_center_id = Column(
+        Integer, ForeignKey("work_centers.id"), index=True, nullable=True
+    )
     status = Column(String(30), nullable=False, default="pending")
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
@@ -142,11 +200,16 @@ class Routing(Base):
 
 class RoutingStep(Base):
     __tablename__ = "routing_steps"
+    __table_args__ = (
+        Index("ix_routing_steps_routing_id_sequence", "routing_id", "sequence"),
+    )
 
     id = Column(Integer, primary_key=True)
     routing_id = Column(Integer, ForeignKey("routings.id"), nullable=False)
     sequence = Column(Integer, nullable=False)
-    work_center_id = Column(Integer, ForeignKey("work_centers.id"), nullable=True)
+    work_center_id = Column(
+        Integer, ForeignKey("work_centers.id"), index=True, nullable=True
+    )
     description = Column(String(255))
     standard_minutes = Column(Integer, nullable=True)
 
@@ -158,7 +221,9 @@ class BOM(Base):
     __tablename__ = "boms"
 
     id = Column(Integer, primary_key=True)
-    part_id = Column(Integer, ForeignKey("parts.id"), nullable=False)  # parent/assembly
+    part_id = Column(
+        Integer, ForeignKey("parts.id"), index=True, nullable=False
+    )  # parent/assembly
     revision = Column(String(20), nullable=True)
 
     part = relationship("Part", back_populates="boms")
@@ -169,8 +234,10 @@ class BOMItem(Base):
     __tablename__ = "bom_items"
 
     id = Column(Integer, primary_key=True)
-    bom_id = Column(Integer, ForeignKey("boms.id"), nullable=False)
-    component_part_id = Column(Integer, ForeignKey("parts.id"), nullable=False)
+    bom_id = Column(Integer, ForeignKey("boms.id"), index=True, nullable=False)
+    component_part_id = Column(
+        Integer, ForeignKey("parts.id"), index=True, nullable=False
+    )
     quantity = Column(Integer, nullable=False, default=1)
 
     bom = relationship("BOM", back_populates="items")
@@ -179,16 +246,26 @@ class BOMItem(Base):
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
+    # Fetch created_at in the INSERT's RETURNING instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+    # a work order's history, oldest first
+    __table_args__ = (
+        Index(
+            "ix_activity_logs_work_order_id_created_at", "work_order_id", "created_at"
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    part_id = Column(Integer, ForeignKey("parts.id"), nullable=True)
-    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=True)
+    part_id = Column(Integer, ForeignKey("parts.id"), index=True, nullable=True)
+    department_id = Column(
+        Integer, ForeignKey("departments.id"), index=True, nullable=True
+    )
     work_order_id = Column(Integer, ForeignKey("work_orders.id"), nullable=True)
     event_type = Column(String(50), nullable=False)
     message = Column(String(255))
     created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=func.now(), index=True, nullable=False
     )
 
     user = relationship("User")
@@ -202,7 +279,7 @@ class Floor(Base):
     __tablename__ = "floors"
 
     id = Column(Integer, primary_key=True)
-    name = Column(String(100), nullable=False)
+    name = Column(String(100), unique=True, nullable=False)
     description = Column(String(255))
 
     zones = relationship(
@@ -214,12 +291,16 @@ class FloorZone(Base):
     __tablename__ = "floor_zones"
 
     id = Column(Integer, primary_key=True)
-    floor_id = Column(Integer, ForeignKey("floors.id"), nullable=False)
+    floor_id = Column(Integer, ForeignKey("floors.id"), index=True, nullable=False)
     name = Column(String(100), nullable=False)
     # Semantic type of the zone, e.g. 'department', 'work_center', 'storage'
     zone_type = Column(String(50), nullable=True)
-    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
-    work_center_id = Column(Integer, ForeignKey("work_centers.id"), nullable=True)
+    department_id = Column(
+        Integer, ForeignKey("departments.id"), index=True, nullable=True
+    )
+    work_center_id = Column(
+        Integer, ForeignKey("work_centers.id"), index=True, nullable=True
+    )
     # Simple, DB-agnostic encoding of the polygon: "x1,y1 x2,y2 ..."
     polygon = Column(String(2000), nullable=False)
 
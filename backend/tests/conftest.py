@@ -2,45 +2,48 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from app.api.loaders import Loaders
+from app.core.session import LazySession
+from main import app, get_context
 from models.models import Base
-from main import app
-from backend.app.core.database import get_db as real_get_db
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-
-@pytest.fixture(scope="session", autouse=True)
-def prepare_database():
+@pytest.fixture
+def engine():
+    # one in-memory database per test; StaticPool shares its single connection
+    # with the threadpool that runs sync resolvers
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
     Base.metadata.create_all(bind=engine)
-    yield
-    Base.metadata.drop_all(bind=engine)
-
-
-@pytest.fixture(scope="function")
-def db_session():
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
-    try:
-        yield session
-    finally:
-        session.close()
-        transaction.rollback()
-        connection.close()
-
-
-@pytest.fixture(scope="function")
-def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-
-    app.dependency_overrides[real_get_db] = override_get_db
-    return TestClient(app)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def maker(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def session(maker):
+    sess = maker()
+    yield sess
+    sess.close()
+
+
+@pytest.fixture
+def client(engine):
+    maker = sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def override_get_context():
+        db = LazySession(maker)
+        return {"db": db, "loaders": Loaders(db)}
+
+    app.dependency_overrides[get_context] = override_get_context
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_context, None)
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from models.models import Base
+from app.api.loaders import Loaders
+from main import schema
+
+pytest.importorskip("aiosqlite")
+
+
+async def _run(*documents):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    results = []
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        for document in documents:
+            context = {"db": db, "loaders": Loaders(db)}
+            results.append(await schema.execute(document, context_value=context))
+    await engine.dispose()
+    return results
+
+
+def test_resolvers_run_on_async_session():
+    added, listed = asyncio.run(
+        _run(
+            'mutation { addDepartment(data: {title: "Paint"}) { id title } }',
+            # sibling fields resolve concurrently on the same AsyncSession
+            "{ departments { title } parts { id } workCenters { id }"
+            " floors { id } users { id } }",
+        )
+    )
+
+    assert added.errors is None
+    assert added.data["addDepartment"]["title"] == "Paint"
+    assert listed.errors is None
+    assert listed.data["departments"] == [{"title": "Paint"}]
+    assert listed.data["parts"] == []
@@ -0,0 +1,45 @@
+from sqlalchemy import create_engine
+
+from benchmarks.suite import compare, run
+
+
+def _report(**results):
+    return {"results": results}
+
+
+def test_compare_flags_slowdowns_past_threshold_and_extra_statements():
+    baseline = _report(
+        a={"median_ms": 10.0, "queries": 2},
+        b={"median_ms": 10.0},
+        c={"median_ms": 0.01},
+    )
+    current = _report(
+        a={"median_ms": 11.0, "queries": 3},
+        b={"median_ms": 13.0},
+        c={"median_ms": 0.03},  # 3x, but within timer noise
+        d={"median_ms": 99.0},  # new benchmark, nothing to compare
+    )
+
+    regressions = compare(current, baseline, threshold=0.25)
+
+    assert regressions == [
+        "a: 2 -> 3 SQL statements",
+        "b: median 10.0ms -> 13.0ms (+30%)",
+    ]
+
+
+def test_every_repo_method_field_and_conversion_runs(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'bench.db'}",
+        connect_args={"check_same_thread": False},
+    )
+
+    report = run(engine, rows=20, iterations=1)
+
+    assert report["errors"] == {}
+    assert report["skipped"] == {}
+    names = report["results"]
+    assert "repo.WorkOrderRepo.list_by_work_centers" in names
+    assert "graphql.Mutation.deleteWorkOrderOp" in names
+    assert "convert.WorkOrderType.connection" in names
+    assert names["graphql.Query.workOrders"]["queries"] >= 1
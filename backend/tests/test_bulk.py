@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import event
+
+from models.models import Department, Part, WorkCenter, WorkOrder
+from app.api.services import MutationService
+from app.schema import DefectInput, WorkOrderInput
+
+
+@pytest.fixture
+def session(session):
+    dept = Department(title="Machining")
+    session.add_all([dept, Part(name="Shaft", department=dept), WorkCenter(name="Lathe")])
+    session.commit()
+    return session
+
+
+def test_add_work_orders_inserts_valid_rows_and_reports_the_rest(engine, session):
+    items = [WorkOrderInput(number=f"WO-{i}", status="open", quantity=1, part_id=1)
+             for i in range(500)]
+    items += [
+        WorkOrderInput(number="WO-0", status="open", quantity=1, part_id=1),
+        WorkOrderInput(number="WO-X", status="open", quantity=1, part_id=99),
+        WorkOrderInput(number="WO-Y", status="open", quantity=1, part_id=1,
+                       work_center_id=42),
+    ]
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    created, errors = MutationService(session).add_work_orders(items)
+    # parts + work centers + numbers lookups, then the inserts; never per row
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 3
+
+    assert len(created) == 500
+    assert [wo.number for wo in created[:2]] == ["WO-0", "WO-1"]
+    assert created[0].department_id == 1
+    assert [(e.index, e.code) for e in errors] == [
+        (500, "CONFLICT"),
+        (501, "NOT_FOUND"),
+        (502, "NOT_FOUND"),
+    ]
+    assert session.query(WorkOrder).count() == 500
+
+
+def test_add_defects_validates_categories(session):
+    created, errors = MutationService(session).add_defects(
+        [DefectInput(title="Scratch", description="", part_id=1, defect_category_id=7)]
+    )
+
+    assert created == []
+    assert errors[0].code == "NOT_FOUND"
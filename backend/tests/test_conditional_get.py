@@ -0,0 +1,111 @@
+import pytest
+from graphql import parse
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models.models import DefectCategory, Department, Floor, Part
+from app.api.conditional import DocumentTables
+from main import schema
+
+DEPARTMENTS = "{ departments { id title } }"
+
+
+@pytest.fixture
+def engine(engine):
+    with Session(engine) as sess:
+        sess.add(Department(title="Assembly"))
+        sess.commit()
+    return engine
+
+
+@pytest.fixture
+def statements(engine):
+    captured = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, params, context, executemany):
+        captured.append(statement)
+
+    return captured
+
+
+def _get(client, query, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get("/graphql", params={"query": query}, headers=headers)
+
+
+def test_matching_etag_is_answered_without_touching_the_db(client, statements):
+    first = _get(client, DEPARTMENTS)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+    statements.clear()
+
+    again = _get(client, DEPARTMENTS, first.headers["etag"])
+    assert again.status_code == 304
+    assert again.content == b""
+    assert statements == []
+
+
+def test_committed_write_changes_only_affected_etags(client, maker):
+    etag = _get(client, DEPARTMENTS).headers["etag"]
+
+    with maker() as sess:
+        sess.add(Floor(name="Main"))
+        sess.commit()
+    assert _get(client, DEPARTMENTS, etag).status_code == 304
+
+    with maker() as sess:
+        sess.add(Department(title="Rolled back"))
+        sess.flush()
+        sess.rollback()
+    assert _get(client, DEPARTMENTS, etag).status_code == 304
+
+    with maker() as sess:
+        sess.add(Department(title="Paint"))
+        sess.commit()
+    fresh = _get(client, DEPARTMENTS, etag)
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert len(fresh.json()["data"]["departments"]) == 2
+
+
+def test_error_responses_are_not_validated(client):
+    response = _get(client, "{ departmentDetail(id: 999) { department { id } } }")
+    assert response.json()["errors"]
+    assert "etag" not in response.headers
+
+
+def test_mutations_over_get_are_not_cached(client):
+    response = _get(client, 'mutation { addDepartment(data: {title: "X"}) { id } }')
+    assert "etag" not in response.headers
+
+
+def test_wrapper_types_count_rows_they_do_not_select():
+    tables = DocumentTables(schema._schema)
+    detail = parse("{ workCenterDetail(id: 1) { workCenter { name } } }")
+    assert {"work_centers", "work_orders", "floor_zones"} <= tables(detail)
+    # a connection's pageInfo still depends on the paged table
+    page = parse("{ departmentsConnection { pageInfo { hasNextPage } } }")
+    assert "departments" in tables(page)
+
+
+def test_defect_pareto_etag_follows_the_rollup(client, engine):
+    with Session(engine) as sess:
+        sess.add_all(
+            [Part(name="Shaft", department_id=1), DefectCategory(title="Burr")]
+        )
+        sess.commit()
+    add_defect = (
+        'mutation { addDefect(data: {title: "d", description: "",'
+        " partId: 1, defectCategoryId: 1}) { id } }"
+    )
+    pareto = "{ defectPareto(departmentId: 1) { defectCategoryId count } }"
+    assert client.post("/graphql", json={"query": add_defect}).status_code == 200
+    first = _get(client, pareto)
+    assert first.json()["data"]["defectPareto"] == [{"defectCategoryId": 1, "count": 1}]
+
+    client.post("/graphql", json={"query": add_defect})
+
+    fresh = _get(client, pareto, first.headers["etag"])
+    assert fresh.status_code == 200
+    assert fresh.json()["data"]["defectPareto"] == [{"defectCategoryId": 1, "count": 2}]
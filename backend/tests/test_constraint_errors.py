@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import event
+from strawberry.exceptions import GraphQLError
+
+from models.models import Department, Part
+from app.api.services import MutationService
+from app.schema import DepartmentInput, WorkOrderInput
+
+
+@pytest.fixture
+def engine(engine):
+    # the pool holds a single connection, so the pragma sticks
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+    return engine
+
+
+@pytest.fixture
+def session(session):
+    dept = Department(title="Assembly")
+    session.add_all([dept, Part(name="Bracket", department=dept)])
+    session.commit()
+    return session
+
+
+def _work_order(**overrides):
+    values = dict(number="WO-1", status="open", quantity=1, part_id=1)
+    values.update(overrides)
+    return WorkOrderInput(**values)
+
+
+def test_add_work_order_is_one_statement(engine, session):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    wo = MutationService(session).add_work_order(_work_order())
+
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT INTO work_orders")
+    # department defaults to the part's, resolved inside the INSERT
+    assert wo.department_id == 1
+
+
+def test_duplicate_title_is_conflict(session):
+    with pytest.raises(GraphQLError) as err:
+        MutationService(session).add_department(DepartmentInput(title="Assembly"))
+    assert err.value.extensions == {"code": "CONFLICT"}
+    assert err.value.message == "Department already exists; check title."
+
+
+def test_duplicate_number_is_conflict(session):
+    service = MutationService(session)
+    service.add_work_order(_work_order())
+    with pytest.raises(GraphQLError) as err:
+        service.add_work_order(_work_order())
+    assert err.value.extensions == {"code": "CONFLICT"}
+
+
+def test_unknown_part_is_not_found(session):
+    with pytest.raises(GraphQLError) as err:
+        MutationService(session).add_work_order(_work_order(part_id=99))
+    assert err.value.extensions == {"code": "NOT_FOUND"}
@@ -0,0 +1,72 @@
+from sqlalchemy import create_engine, func, select
+
+from benchmarks.datagen import load
+from models.models import (
+    BOMItem,
+    FloorZone,
+    Part,
+    Routing,
+    RoutingStep,
+    WorkOrder,
+    WorkOrderOp,
+)
+
+
+def _engine(path):
+    return create_engine(f"sqlite:///{path}")
+
+
+def _digest(engine) -> list:
+    with engine.connect() as conn:
+        return [
+            conn.execute(select(model.__table__).order_by(model.id)).all()
+            for model in (WorkOrder, WorkOrderOp, BOMItem, FloorZone)
+        ]
+
+
+def test_same_seed_same_rows(tmp_path):
+    a, b = _engine(tmp_path / "a.db"), _engine(tmp_path / "b.db")
+    counts = load(a, scale=0.02, seed=7)
+    assert load(b, scale=0.02, seed=7) == counts
+    assert _digest(a) == _digest(b)
+    assert counts["work_orders"] == 200
+    assert counts["activity_logs"] > counts["work_orders"]
+
+
+def test_rows_follow_the_model_relationships(tmp_path):
+    engine = _engine(tmp_path / "gen.db")
+    load(engine, scale=0.02, seed=1)
+    with engine.connect() as conn:
+        # BOM components come from a lower level of the product structure
+        parts = dict(conn.execute(select(Part.id, Part.name)).all())
+        for parent, component in conn.execute(
+            select(Part.id, BOMItem.component_part_id)
+            .join_from(BOMItem, BOMItem.bom)
+            .join(Part)
+        ):
+            assert parts[component].split()[0] != "Assembly"
+            assert parts[parent].split()[0] != "Component"
+
+        # ops follow the routing in sequence and in time
+        for wo in conn.execute(select(WorkOrder.id, WorkOrder.part_id).limit(50)):
+            ops = conn.execute(
+                select(WorkOrderOp)
+                .where(WorkOrderOp.work_order_id == wo.id)
+                .order_by(WorkOrderOp.sequence)
+            ).all()
+            steps = conn.execute(
+                select(RoutingStep.sequence, RoutingStep.work_center_id)
+                .join(RoutingStep.routing)
+                .where(Routing.part_id == wo.part_id)
+                .order_by(RoutingStep.sequence)
+            ).all()
+            assert [(o.sequence, o.work_center_id) for o in ops] == list(
+                map(tuple, steps)
+            )
+            times = [t for o in ops for t in (o.started_at, o.completed_at) if t]
+            assert times == sorted(times)
+
+        # zones are closed rectangles with four points
+        for polygon in conn.scalars(select(FloorZone.polygon)):
+            assert len(polygon.split()) == 4
+        assert conn.scalar(select(func.count()).select_from(FloorZone)) > 0
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models.models import (
+    BOM,
+    BOMItem,
+    Base,
+    Defect,
+    DefectCategory,
+    Department,
+    FloorZone,
+    Floor,
+    Part,
+    Quality,
+    Routing,
+    RoutingStep,
+    WorkCenter,
+    WorkOrder,
+    WorkOrderOp,
+)
+from app.api.loaders import Loaders
+from app.api.services import DETAIL_LIMIT
+from main import schema
+
+WORK_CENTER_DETAIL = """{ workCenterDetail(id: 1) {
+  workCenter { name } department { title } openWorkOrders { number }
+  activeOperations { sequence } routingSteps { sequence } floorZones { name } } }"""
+PART_DETAIL = """{ partDetail(id: 1) {
+  part { name } department { title } openWorkOrders { number }
+  routings { name } routingSteps { sequence } boms { revision }
+  bomItems { quantity } recentQuality { passFail } recentDefects { title } } }"""
+DEPARTMENT_DETAIL = """{ departmentDetail(id: 1) {
+  department { title } parts { name } workCenters { name } floorZones { name }
+  defectCategories { title } openWorkOrders { number } } }"""
+
+
+def _seed(session, n: int) -> None:
+    dept = Department(title="Assembly")
+    wc = WorkCenter(name="Press", department=dept)
+    part = Part(name="Bracket", department=dept)
+    floor = Floor(name="Main")
+    session.add_all([dept, wc, part, floor])
+    session.flush()
+    for i in range(n):
+        wo = WorkOrder(
+            number=f"WO-{i}",
+            status="open",
+            quantity=1,
+            part=part,
+            department=dept,
+            work_center=wc,
+        )
+        routing = Routing(name=f"R{i}", part=part)
+        bom = BOM(part=part, revision=str(i))
+        session.add_all(
+            [
+                wo,
+                WorkOrderOp(work_order=wo, sequence=i, work_center=wc),
+                routing,
+                RoutingStep(routing=routing, sequence=i, work_center=wc),
+                bom,
+                BOMItem(bom=bom, component_part=part, quantity=i),
+                Quality(pass_fail=True, part=part),
+                Defect(title=f"D{i}", part=part),
+                FloorZone(
+                    floor=floor,
+                    name=f"Z{i}",
+                    polygon="0,0",
+                    work_center=wc,
+                    department=dept,
+                ),
+                Part(name=f"P{i}", department=dept),
+                WorkCenter(name=f"WC{i}", department=dept),
+                DefectCategory(title=f"C{i}", department=dept),
+            ]
+        )
+    session.commit()
+
+
+def _count_statements(n: int, query: str):
+    # a fresh database per call; StaticPool so the threadpool sees it too
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    _seed(session, n)
+    session.expunge_all()
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    result = asyncio.run(
+        schema.execute(
+            query, context_value={"db": session, "loaders": Loaders(session)}
+        )
+    )
+    session.close()
+    assert result.errors is None
+    return len(statements), result.data
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        # center (+department join), steps, zones, open orders, active ops
+        (WORK_CENTER_DETAIL, 5),
+        # part (+department join), routings, steps, boms, items, orders, quality, defects
+        (PART_DETAIL, 8),
+        # department, parts, centers, zones, categories, open orders
+        (DEPARTMENT_DETAIL, 6),
+    ],
+)
+def test_detail_statement_count_is_fixed(query, expected):
+    few, _ = _count_statements(3, query)
+    many, _ = _count_statements(DETAIL_LIMIT + 20, query)
+    assert few == many == expected
+
+
+def test_history_collections_are_bounded():
+    _, data = _count_statements(DETAIL_LIMIT + 20, PART_DETAIL)
+    detail = data["partDetail"]
+    assert detail["part"]["name"] == "Bracket"
+    assert len(detail["openWorkOrders"]) == DETAIL_LIMIT
+    assert len(detail["recentDefects"]) == DETAIL_LIMIT
+    # newest first
+    assert detail["recentDefects"][0]["title"] == f"D{DETAIL_LIMIT + 19}"
+
+
+def test_structural_collections_are_bounded():
+    n = DETAIL_LIMIT + 20
+    _, data = _count_statements(n, DEPARTMENT_DETAIL)
+    department = data["departmentDetail"]
+    for name in ("parts", "workCenters", "floorZones", "defectCategories"):
+        assert len(department[name]) == DETAIL_LIMIT
+    # lowest id first
+    assert department["parts"][0]["name"] == "Bracket"
+
+    _, data = _count_statements(n, WORK_CENTER_DETAIL)
+    center = data["workCenterDetail"]
+    assert len(center["routingSteps"]) == len(center["floorZones"]) == DETAIL_LIMIT
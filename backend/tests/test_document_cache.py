@@ -0,0 +1,53 @@
+import asyncio
+
+from graphql import parse
+
+from app.api.documents import DocumentCache, document_cache
+from main import schema
+
+
+def _execute(query):
+    # no resolver touches the db for these documents
+    return asyncio.run(schema.execute(query, context_value={"db": None}))
+
+
+def test_repeat_documents_skip_parse_and_validation():
+    query = "query DocCacheRepeat { __typename }"
+    stats = document_cache.stats
+    hits, validation_hits = stats.hits, stats.validation_hits
+
+    assert _execute(query).errors is None
+    assert _execute(query).errors is None
+
+    assert stats.hits == hits + 1
+    assert stats.validation_hits == validation_hits + 1
+
+
+def test_validation_errors_are_cached_with_the_document():
+    query = "query DocCacheInvalid { noSuchField }"
+    first = _execute(query)
+    validation_hits = document_cache.stats.validation_hits
+    second = _execute(query)
+
+    assert document_cache.stats.validation_hits == validation_hits + 1
+    assert [e.message for e in second.errors] == [e.message for e in first.errors]
+    assert "noSuchField" in second.errors[0].message
+
+
+def test_syntax_errors_are_not_cached():
+    size = len(document_cache)
+    assert _execute("{ unterminated").errors
+    assert len(document_cache) == size
+
+
+def test_lru_bound():
+    cache = DocumentCache(maxsize=2)
+    for name in ("A", "B", "C"):
+        cache.parse(f"query {name} {{ __typename }}")
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    assert cache.get("query A { __typename }") is None
+
+    document = cache.parse("query C { __typename }")
+    assert cache.stats.hits == 1
+    assert document == parse("query C { __typename }")
@@ -0,0 +1,124 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy.engine import make_url
+
+from app.core import events
+from app.core.cache import reference_cache, table_versions
+from app.core.events import Event, InMemoryBus, PostgresBus, _pack, emit
+from models.models import Department, WorkOrderOp
+
+URL = make_url("postgresql+psycopg://shop:secret@db:5432/shop")
+
+
+def _use(monkeypatch, bus):
+    monkeypatch.setattr(events, "bus", bus)
+    return bus
+
+
+def test_handlers_get_one_batch_per_commit_filtered_by_topic(monkeypatch, maker):
+    bus = _use(monkeypatch, InMemoryBus())
+    orders, everything = [], []
+    bus.subscribe(["work_order"], orders.append)
+    bus.subscribe(["work_order", "work_order_op"], everything.append)
+    bus.subscribe(["work_order"], orders.append)  # idempotent
+
+    with maker() as session:
+        session.add(Department(title="Paint"))
+        session.flush()
+        emit(session, Event("work_order", 1, {"id": 1}))
+        emit(session, Event("work_order_op", 2, {"id": 5}))
+        emit(session, Event("work_order", 1, {"id": 2}))
+        assert orders == []  # nothing before commit
+        session.commit()
+
+        session.add(Department(title="Weld"))
+        session.flush()
+        emit(session, Event("work_order", 1, {"id": 3}))
+        session.rollback()
+
+    assert [[e.data["id"] for e in batch] for batch in orders] == [[1, 2]]
+    assert [[e.data["id"] for e in batch] for batch in everything] == [[1, 5, 2]]
+
+
+def test_a_failing_handler_does_not_stop_the_others():
+    bus = InMemoryBus()
+    received = []
+
+    def broken(batch):
+        raise RuntimeError("boom")
+
+    bus.subscribe(["t"], broken)
+    bus.subscribe(["t"], received.append)
+    bus.publish([Event("t", None, {})])
+    assert len(received) == 1
+
+
+def test_payloads_are_packed_under_the_notify_limit():
+    messages = [{"topic": "t", "key": i, "data": {"pad": "x" * 90}} for i in range(100)]
+    payloads = _pack(messages, limit=1000)
+
+    assert len(payloads) > 1
+    assert all(len(p) <= 1000 for p in payloads)
+    assert [m for p in payloads for m in json.loads(p)] == messages
+
+
+def test_postgres_bus_notifies_inside_the_transaction(monkeypatch, maker):
+    sent = []
+
+    class Recording(PostgresBus):
+        def publish(self, batch, connection=None):
+            sent.append((batch, connection.in_transaction()))
+
+    _use(monkeypatch, Recording(URL))
+    with maker() as session:
+        session.add(Department(title="Paint"))
+        emit(session, Event("work_order", 1, {"id": 1}))
+        session.commit()
+
+    [(batch, in_transaction)] = sent
+    assert in_transaction
+    assert [e.topic for e in batch] == ["work_order", "tables"]
+    assert batch[1].data == {"tables": ["departments"]}
+
+
+def test_other_workers_table_writes_invalidate_the_cache():
+    bus = PostgresBus(URL)
+    received = []
+    bus.subscribe(["work_order_op"], received.append)
+    reference_cache.get_or_load(("departments", "all"), lambda: ["cached"])
+    before = table_versions.snapshot(["departments"])
+
+    def notify(origin):
+        return json.dumps(
+            [
+                {"topic": "work_order_op", "key": 3, "data": {"id": 9}},
+                {"topic": "tables", "key": origin, "data": {"tables": ["departments"]}},
+            ]
+        )
+
+    bus.receive(notify(bus.origin))  # our own commit: already applied locally
+    assert table_versions.snapshot(["departments"]) == before
+
+    bus.receive(notify("another-worker"))
+    assert table_versions.snapshot(["departments"]) != before
+    assert reference_cache.get_or_load(("departments", "all"), lambda: ["fresh"]) == [
+        "fresh"
+    ]
+    assert [[e.key for e in batch] for batch in received] == [[3], [3]]
+
+
+def test_snapshots_round_trip_through_json():
+    op = WorkOrderOp(
+        id=1,
+        work_order_id=2,
+        sequence=10,
+        status="running",
+        started_at=datetime(2024, 5, 1, 8),
+    )
+    data = json.loads(json.dumps(events.snapshot(op)))
+    restored = events.restore(WorkOrderOp, data)
+
+    assert restored.started_at == datetime(2024, 5, 1, 8)
+    assert (restored.status, restored.completed_at) == ("running", None)
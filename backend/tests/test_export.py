@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.api import export
+from app.api.export import ExportFormat, export_router, stream_rows
+from benchmarks.datagen import load
+from models.models import (
+    ActivityLog,
+    Base,
+    Defect,
+    DefectCategory,
+    Department,
+    Part,
+    WorkOrder,
+)
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    engine = create_engine(
+        f"sqlite:///{tmp_path_factory.mktemp('export') / 'export.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    load(engine, scale=0.01, seed=3)
+    return engine
+
+
+@pytest.fixture
+def client(engine):
+    app = FastAPI()
+    app.include_router(export_router(engine))
+    return TestClient(app)
+
+
+def _count(engine, stmt):
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(stmt.subquery()))
+
+
+def test_ndjson_streams_every_row_in_id_order(client, engine):
+    response = client.get("/export/activity-logs")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+
+    assert len(rows) == _count(engine, select(ActivityLog.id))
+    assert [r["id"] for r in rows] == sorted(r["id"] for r in rows)
+    assert rows[0]["created_at"].startswith("20")
+
+
+def test_rows_are_serialized_one_cursor_batch_at_a_time(engine, monkeypatch):
+    monkeypatch.setattr(export, "YIELD_PER", 100)
+    stmt = select(*ActivityLog.__table__.columns).order_by(ActivityLog.id)
+    for fmt in ExportFormat:
+        chunks = list(stream_rows(engine, stmt, fmt))
+        assert len(chunks) == -(-_count(engine, stmt) // 100)
+
+
+def test_csv_filters_by_department_time_and_work_center(client, engine):
+    params = {
+        "format": "csv",
+        "department_id": 1,
+        "since": "2024-01-01T00:00:00",
+        "until": "2025-01-01T00:00:00",
+    }
+    response = client.get("/export/activity-logs", params=params)
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+
+    assert header[:2] == ["id", "user_id"]
+    assert rows and len(rows) == _count(
+        engine,
+        select(ActivityLog.id).where(
+            ActivityLog.department_id == 1,
+            ActivityLog.created_at >= "2024-01-01",
+            ActivityLog.created_at < "2025-01-01",
+        ),
+    )
+
+    response = client.get("/export/activity-logs", params={"work_center_id": 1})
+    assert len(response.text.splitlines()) == _count(
+        engine,
+        select(ActivityLog.id).join(WorkOrder).where(WorkOrder.work_center_id == 1),
+    )
+
+
+def test_unsupported_filters_and_entities_are_rejected(client):
+    response = client.get("/export/defects", params={"work_center_id": 1})
+    assert response.status_code == 400
+    assert client.get("/export/users").status_code == 404
+    empty = client.get(
+        "/export/defects", params={"format": "csv", "department_id": 999}
+    )
+    assert (
+        empty.text.strip()
+        == "id,title,description,part_id,defect_category_id,created_at"
+    )
+
+
+def test_defects_follow_their_parts_department(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'defects.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        machining, paint = Department(title="Machining"), Department(title="Paint")
+        part = Part(name="Shaft", department=machining)
+        category = DefectCategory(title="Scratch", department=paint)
+        session.add_all([machining, paint, part, category])
+        session.flush()
+        session.add(Defect(title="d", part_id=part.id, defect_category_id=category.id))
+        session.commit()
+    app = FastAPI()
+    app.include_router(export_router(engine))
+    client = TestClient(app)
+
+    # the rollup and Pareto count this defect under the part's department
+    by_part = client.get("/export/defects", params={"department_id": 1})
+    by_category = client.get("/export/defects", params={"department_id": 2})
+    assert [json.loads(line)["title"] for line in by_part.text.splitlines()] == ["d"]
+    assert by_category.text == ""
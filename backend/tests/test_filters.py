@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from models.models import Department, Part, WorkCenter, WorkOrder
+from app.api.loaders import Loaders
+from main import schema
+
+
+@pytest.fixture
+def session(session):
+    depts = [Department(title=f"D{i}") for i in range(2)]
+    parts = [Part(name=f"P{i}", department=depts[i % 2]) for i in range(4)]
+    centers = [WorkCenter(name=f"WC{i}", department=depts[i % 2]) for i in range(2)]
+    session.add_all(depts + parts + centers)
+    session.flush()
+    statuses = ["open", "in_progress", "complete", "cancelled"]
+    session.add_all(
+        WorkOrder(
+            number=f"WO-{i:03d}",
+            status=statuses[i % 4],
+            quantity=i,
+            part_id=parts[i % 4].id,
+            department_id=parts[i % 4].department_id,
+            work_center_id=centers[i % 2].id,
+        )
+        for i in range(40)
+    )
+    session.commit()
+    return session
+
+
+def _execute(session, query):
+    return asyncio.run(
+        schema.execute(
+            query, context_value={"db": session, "loaders": Loaders(session)}
+        )
+    )
+
+
+def test_work_order_filter_is_pushed_into_sql(engine, session):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    result = _execute(
+        session,
+        '{ workOrders(filter: {partId: 1, statusIn: ["open", "complete"]},'
+        " orderBy: {field: QUANTITY, direction: DESC}) { partId status quantity } }",
+    )
+
+    assert result.errors is None
+    orders = result.data["workOrders"]
+    assert orders and all(o["partId"] == 1 for o in orders)
+    assert {o["status"] for o in orders} == {"open"}
+    assert [o["quantity"] for o in orders] == sorted(
+        (o["quantity"] for o in orders), reverse=True
+    )
+    assert len(statements) == 1
+    assert "work_orders.part_id = ?" in statements[0]
+    assert "work_orders.status IN" in statements[0]
+
+
+def test_unset_filter_fields_do_not_constrain(session):
+    result = _execute(
+        session, "{ workOrders(filter: {workCenterId: 2}) { workCenterId } }"
+    )
+
+    assert result.errors is None
+    assert len(result.data["workOrders"]) == 20
@@ -0,0 +1,151 @@
+import io
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.imports import CsvImportError, import_csv, import_router
+from app.core.cache import table_versions
+from models.models import Base, Department, Part, WorkCenter, WorkOrder
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'import.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            [
+                Department(id=1, title="Assembly"),
+                Part(id=1, name="Bracket", department_id=1),
+                WorkCenter(id=1, name="Press", code="WC-1", department_id=1),
+                WorkOrder(id=1, number="WO-1", part_id=1, department_id=1),
+            ]
+        )
+        session.commit()
+    return engine
+
+
+def _import(engine, entity, text):
+    with Session(engine) as session:
+        result = import_csv(session, entity, io.StringIO(text))
+        session.commit()
+    return result
+
+
+def test_work_orders_are_merged_on_number(engine):
+    result = _import(
+        engine,
+        "work_orders",
+        "number,part_id,status,quantity,work_center_id\n"
+        "WO-1,1,done,5,1\n"
+        "WO-2,1,,,\n"
+        "WO-3,1,open,2,\n",
+    )
+
+    assert result.as_dict() == {
+        "inserted": 2,
+        "updated": 1,
+        "rejected": 0,
+        "rejects": [],
+    }
+    with Session(engine) as session:
+        orders = {o.number: o for o in session.scalars(select(WorkOrder))}
+    assert (orders["WO-1"].status, orders["WO-1"].quantity) == ("done", 5)
+    assert orders["WO-1"].work_center_id == 1
+    assert (orders["WO-2"].status, orders["WO-2"].quantity) == ("open", 1)
+
+
+
+def test_updates_keep_columns_the_header_omits(engine):
+    with Session(engine) as session:
+        session.add_all(
+            [
+                Department(id=2, title="Paint"),
+                Part(id=2, name="Panel", department_id=2),
+            ]
+        )
+        order = session.get(WorkOrder, 1)
+        order.status, order.quantity, order.work_center_id = "done", 7, 1
+        session.commit()
+
+    _import(engine, "work_orders", "number,part_id\nWO-1,2\nWO-9,2\n")
+
+    with Session(engine) as session:
+        orders = {o.number: o for o in session.scalars(select(WorkOrder))}
+    wo1, wo9 = orders["WO-1"], orders["WO-9"]
+    assert (wo1.status, wo1.quantity, wo1.work_center_id) == ("done", 7, 1)
+    # the department follows the part, as in updateWorkOrder
+    assert (wo1.part_id, wo1.department_id) == (2, 2)
+    assert (wo9.status, wo9.quantity, wo9.department_id) == ("open", 1, 2)
+
+def test_bad_rows_are_rejected_with_their_line_and_the_rest_load(engine):
+    result = _import(
+        engine,
+        "work_orders",
+        "number,part_id,work_center_id\n"
+        "WO-2,1,\n"  # line 2, superseded by line 6
+        "WO-3,abc,\n"
+        "WO-4,99,\n"
+        "WO-5,1,42\n"
+        "WO-2,1,1\n"
+        ",1,\n",
+    )
+
+    assert (result.inserted, result.updated, result.rejected) == (1, 0, 5)
+    assert result.rejects == [
+        {"line": 2, "error": "duplicate number, superseded by line 6"},
+        {"line": 3, "error": "part_id 'abc' is not an integer"},
+        {"line": 4, "error": "part_id does not exist"},
+        {"line": 5, "error": "work_center_id does not exist"},
+        {"line": 7, "error": "number is required"},
+    ]
+    with Session(engine) as session:
+        assert session.scalars(select(WorkOrder.number)).all() == ["WO-1", "WO-2"]
+        wo2 = session.scalar(select(WorkOrder).where(WorkOrder.number == "WO-2"))
+        assert wo2.work_center_id == 1
+
+
+def test_parts_and_work_centers(engine):
+    parts = _import(engine, "parts", "id,name,department_id\n1,Bolt,1\n7,Nut,1\n")
+    centers = _import(
+        engine, "work_centers", "code,name,department_id\nWC-1,Lathe,\nWC-2,Mill,1\n"
+    )
+
+    assert (parts.inserted, parts.updated) == (1, 1)
+    assert (centers.inserted, centers.updated) == (1, 1)
+    with Session(engine) as session:
+        assert session.get(Part, 7).name == "Nut"
+        assert session.get(Part, 1).name == "Bolt"
+        lathe = session.scalar(select(WorkCenter).where(WorkCenter.code == "WC-1"))
+        assert (lathe.name, lathe.department_id) == ("Lathe", None)
+
+
+def test_header_must_name_required_columns(engine):
+    with Session(engine) as session, pytest.raises(CsvImportError, match="part_id"):
+        import_csv(session, "work_orders", io.StringIO("number\nWO-9\n"))
+    with Session(engine) as session, pytest.raises(CsvImportError):
+        import_csv(session, "users", io.StringIO("id\n1\n"))
+
+
+def test_endpoint_commits_and_bumps_table_versions(engine):
+    app = FastAPI()
+    app.include_router(import_router(sessionmaker(engine)))
+    client = TestClient(app)
+    before = table_versions.snapshot(["work_orders"])
+
+    response = client.post(
+        "/import/work_orders",
+        files={"file": ("orders.csv", b"\xef\xbb\xbfnumber,part_id\nWO-8,1\n")},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 1
+    assert table_versions.snapshot(["work_orders"]) != before
+    bad = client.post("/import/work_orders", files={"file": ("x.csv", b"number\n")})
+    assert bad.status_code == 400
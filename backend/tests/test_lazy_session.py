@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from app.api.loaders import Loaders
+from app.core.session import LazySession, lazy_session_stats
+from main import schema
+
+
+@pytest.fixture
+def factory(maker):
+    created = []
+
+    def make():
+        created.append(maker())
+        return created[-1]
+
+    make.created = created
+    return make
+
+
+def _execute(db, query):
+    return asyncio.run(
+        schema.execute(query, context_value={"db": db, "loaders": Loaders(db)})
+    )
+
+
+def test_db_free_operation_never_opens_a_session(factory):
+    before = lazy_session_stats.requests_without_checkout
+    db = LazySession(factory)
+
+    result = _execute(db, "{ __typename }")
+
+    assert result.errors is None
+    assert factory.created == []
+    assert lazy_session_stats.requests_without_checkout == before + 1
+
+
+def test_session_released_when_execution_finishes(factory):
+    db = LazySession(factory)
+
+    result = _execute(db, "{ departments { id } }")
+
+    assert result.errors is None
+    assert len(factory.created) == 1
+    # closed by the UnitOfWork extension, not by the HTTP layer
+    assert not factory.created[0].in_transaction()
+    assert db.checked_out
+
+
+def test_cache_stats_report_requests_without_checkout(client):
+    before = client.get("/cache/stats").json()["sessions"]
+
+    client.post("/graphql", json={"query": "{ __typename }"})
+
+    after = client.get("/cache/stats").json()["sessions"]
+    assert after["requests"] == before["requests"] + 1
+    assert after["requests_without_checkout"] == before["requests_without_checkout"] + 1
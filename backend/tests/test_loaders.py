@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from models.models import Department, Part, WorkCenter, WorkOrder
+from app.api.loaders import Loaders
+from main import schema
+
+
+@pytest.fixture
+def session(session):
+    depts = [Department(title=f"D{i}") for i in range(4)]
+    parts = [Part(name=f"P{i}", department=depts[i % 4]) for i in range(20)]
+    centers = [WorkCenter(name=f"WC{i}", department=depts[i % 4]) for i in range(10)]
+    session.add_all(depts + parts + centers)
+    session.flush()
+    session.add_all(
+        WorkOrder(
+            number=f"WO-{i}",
+            status="open",
+            quantity=1,
+            part_id=parts[i % 20].id,
+            department_id=parts[i % 20].department_id,
+            work_center_id=centers[i % 10].id,
+        )
+        for i in range(200)
+    )
+    session.commit()
+    return session
+
+
+def _execute(session, query):
+    return asyncio.run(
+        schema.execute(query, context_value={"db": session, "loaders": Loaders(session)})
+    )
+
+
+def test_nested_fields_batch_per_type(engine, session):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    result = _execute(
+        session,
+        "{ workOrders(limit: 200) { id part { name department { title } }"
+        " workCenter { name } } }",
+    )
+
+    assert result.errors is None
+    orders = result.data["workOrders"]
+    assert len(orders) == 200
+    assert orders[0]["part"]["name"] == "P0"
+    assert orders[0]["workCenter"]["name"] == "WC0"
+    # work orders + parts + departments + work centers, independent of row count
+    assert len(statements) == 4
+
+
+def test_work_center_work_orders_one_query_for_all_centers(engine, session):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    result = _execute(session, "{ workCenters { id workOrders { number } } }")
+
+    assert result.errors is None
+    centers = result.data["workCenters"]
+    assert all(len(c["workOrders"]) == 20 for c in centers)
+    assert len(statements) == 2
@@ -0,0 +1,54 @@
+import asyncio
+
+from app.api.loaders import Loaders
+from app.core import metrics
+from app.core.metrics import Histogram, Registry
+from main import schema
+
+
+def test_histogram_exposition_is_cumulative():
+    registry = Registry()
+    hist = registry.histogram(
+        "latency_seconds", "help", labels=("field",), buckets=(0.1, 1)
+    )
+    for value in (0.05, 0.1, 0.5, 3):
+        hist.observe(value, field="Query.x")
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == [
+        "# HELP latency_seconds help",
+        "# TYPE latency_seconds histogram",
+    ]
+    assert 'latency_seconds_bucket{field="Query.x",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{field="Query.x",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{field="Query.x",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{field="Query.x"} 4' in lines
+
+
+def test_label_sets_are_bounded(monkeypatch):
+    monkeypatch.setattr(metrics, "MAX_SERIES", 2)
+    hist = Histogram("ops", "help", labels=("operation",))
+    for name in ("a", "b", "c", "d"):
+        hist.observe(0.01, operation=name)
+    assert hist.count(operation=metrics.OVERFLOW) == 2
+
+
+def test_extension_records_resolvers_and_error_codes(session):
+    field_count = metrics.resolver_duration.count(field="Query.department")
+    op_count = metrics.operation_duration.count(operation="MetricsProbe", type="query")
+    not_found = metrics.graphql_errors.value(code="NOT_FOUND")
+
+    result = asyncio.run(
+        schema.execute(
+            "query MetricsProbe { department(id: 1) { id } }",
+            context_value={"db": session, "loaders": Loaders(session)},
+        )
+    )
+
+    assert result.errors
+    assert metrics.resolver_duration.count(field="Query.department") == field_count + 1
+    assert (
+        metrics.operation_duration.count(operation="MetricsProbe", type="query")
+        == op_count + 1
+    )
+    assert metrics.graphql_errors.value(code="NOT_FOUND") == not_found + 1
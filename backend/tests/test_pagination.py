@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from strawberry.exceptions import GraphQLError
+
+from app.api.loaders import Loaders
+from main import schema
+from models.models import Department, Floor, Part, WorkOrder
+from app.api.services import (
+    Cursor,
+    QueryService,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+@pytest.fixture
+def session(session):
+    session.add_all([Floor(name=f"Floor {i}") for i in range(1, 126)])
+    session.commit()
+    return session
+
+
+def test_keyset_pages_walk_every_row_once(session):
+    service = QueryService(session)
+    seen, after = [], None
+    while True:
+        rows, has_next, _ = service.get_floors_page(first=50, after=after)
+        seen.extend(r.id for r in rows)
+        if not has_next:
+            break
+        after = rows[-1].id
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen)) == 125
+
+
+def test_deep_page_seeks_instead_of_offsetting(engine, session):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, params, context, executemany):
+        statements.append((statement, params))
+
+    rows, has_next, has_previous = QueryService(session).get_floors_page(
+        first=10, after=100
+    )
+
+    assert [r.id for r in rows] == list(range(101, 111))
+    assert has_next and has_previous
+    assert len(statements) == 1
+    statement, params = statements[0]
+    assert "floors.id >" in statement
+    # SQLite always renders an OFFSET clause; the seek must keep it at zero.
+    assert params[-1] == 0
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor(42)) == Cursor(42)
+    assert decode_cursor(encode_cursor(42, "WO-7")) == Cursor(42, "WO-7")
+    assert decode_cursor(None) is None
+    with pytest.raises(GraphQLError):
+        decode_cursor("not-a-cursor")
+
+
+def test_has_previous_page_is_exact(session):
+    service = QueryService(session)
+    _, _, at_start = service.get_floors_page(first=10)
+    _, _, past_first = service.get_floors_page(first=10, after=1)
+    _, _, past_the_end = service.get_floors_page(first=10, after=500)
+    assert (at_start, past_first, past_the_end) == (False, True, True)
+    # a cursor before every matching row has nothing before it
+    session.query(Floor).filter(Floor.id <= 5).delete()
+    _, _, before_all = service.get_floors_page(first=10, after=3)
+    assert before_all is False
+
+
+def test_connections_walk_filtered_and_ordered_rows(maker, session):
+    session.add(Department(title="Machining"))
+    session.add(Part(name="Shaft", department_id=1))
+    session.add_all(
+        WorkOrder(
+            number=f"WO-{i:03d}",
+            quantity=i % 4,
+            status="open" if i % 3 else "done",
+            part_id=1,
+        )
+        for i in range(1, 31)
+    )
+    session.commit()
+    db = maker()
+    query = (
+        "query($after: String) { workOrdersConnection(first: 4, after: $after,"
+        ' filter: {statusIn: ["open"]}, orderBy: {field: QUANTITY, direction: DESC})'
+        " { edges { cursor node { id quantity status } }"
+        " pageInfo { hasNextPage hasPreviousPage endCursor } } }"
+    )
+    seen, after, previous = [], None, []
+    while True:
+        result = asyncio.run(
+            schema.execute(
+                query,
+                variable_values={"after": after},
+                context_value={"db": db, "loaders": Loaders(db)},
+            )
+        )
+        assert result.errors is None
+        page = result.data["workOrdersConnection"]
+        seen += [edge["node"] for edge in page["edges"]]
+        previous.append(page["pageInfo"]["hasPreviousPage"])
+        if not page["pageInfo"]["hasNextPage"]:
+            break
+        after = page["pageInfo"]["endCursor"]
+    db.close()
+
+    expected = sorted(
+        ((i % 4, i) for i in range(1, 31) if i % 3), key=lambda k: (-k[0], -k[1])
+    )
+    assert [(n["quantity"], int(n["id"])) for n in seen] == expected
+    assert {n["status"] for n in seen} == {"open"}
+    assert previous == [False] + [True] * (len(previous) - 1)
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from graphql import GraphQLError, parse
+
+from app.api.cost import estimate_cost
+from app.api.services import DEFAULT_LIMIT, MAX_LIMIT
+from app.core.config import settings
+from main import graphql_error_formatter, schema
+
+
+def _cost(query, variables=None):
+    return estimate_cost(schema._schema, parse(query), variables, None)
+
+
+def test_list_fields_are_priced_at_their_clamped_limit():
+    assert _cost("{ departments { id } }").cost == DEFAULT_LIMIT
+    assert _cost("{ departments(limit: 10) { id } }").cost == 10
+    query = "query($n: Int) { departments(limit: $n) { id } }"
+    assert _cost(query, {"n": 10_000}).cost == MAX_LIMIT
+
+
+def test_relationship_lists_multiply():
+    estimate = _cost(
+        "{ parts(limit: 10) { name workOrders { number part { name } } } }"
+    )
+    assert estimate.cost == 10 * (1 + MAX_LIMIT * (1 + 1))
+    assert estimate.depth == 4
+
+
+def test_connection_edges_are_bounded_by_first():
+    estimate = _cost(
+        "{ departmentsConnection(first: 10) {"
+        " edges { node { id } } pageInfo { hasNextPage } } }"
+    )
+    assert estimate.cost == 10 * (1 + 1 * (1 + 1) + 1)
+
+
+def test_fragments_count_and_introspection_is_free():
+    query = """
+      query { workOrders(limit: 5) { ...wo } }
+      fragment wo on WorkOrderType { part { name } }
+    """
+    assert _cost(query).cost == 5 * (1 + 1)
+    assert _cost("{ __schema { types { name fields { name } } } }").cost == 0
+
+
+@pytest.mark.parametrize(
+    "setting, value",
+    [("QUERY_MAX_COST", 100), ("QUERY_MAX_DEPTH", 3)],
+)
+def test_over_budget_operations_are_rejected_before_execution(
+    monkeypatch, setting, value
+):
+    monkeypatch.setattr(settings, setting, value)
+    query = "{ parts(limit: 10) { workOrders { part { name } } } }"
+    # db=None: any resolver that ran would fail
+    result = asyncio.run(schema.execute(query, context_value={"db": None}))
+
+    assert result.data is None
+    [error] = result.errors
+    assert error.extensions["code"] == "QUERY_TOO_COMPLEX"
+    assert graphql_error_formatter(error)["extensions"]["code"] == "QUERY_TOO_COMPLEX"
+
+
+def test_formatter_understands_query_too_complex_prefix():
+    formatted = graphql_error_formatter(GraphQLError("QUERY_TOO_COMPLEX: too deep"))
+    assert formatted["extensions"] == {"code": "QUERY_TOO_COMPLEX"}
+    assert formatted["message"] == "too deep"
@@ -0,0 +1,216 @@
+"""EXPLAIN every filtered repo query against seeded tables; no seq scans allowed.
+
+Runs on in-memory SQLite by default. Point TEST_DATABASE_URL at a scratch
+Postgres database to check the real planner (the tables are dropped after).
+"""
+
+import os
+import random
+
+import pytest
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from models.models import (
+    Base,
+    BOM,
+    BOMItem,
+    ActivityLog,
+    Defect,
+    DefectCategory,
+    Department,
+    Floor,
+    FloorZone,
+    Part,
+    Quality,
+    Routing,
+    RoutingStep,
+    WorkCenter,
+    WorkOrder,
+    WorkOrderOp,
+)
+from app.api.services import (
+    ActivityLogRepo,
+    BOMItemRepo,
+    DefectRepo,
+    FloorZoneRepo,
+    PartRepo,
+    QualityRepo,
+    RoutingStepRepo,
+    WorkOrderOpRepo,
+    WorkOrderRepo,
+)
+
+ROWS = 20_000
+LARGE_TABLES = {
+    "work_orders",
+    "work_order_ops",
+    "activity_logs",
+    "defects",
+    "quality",
+    "routing_steps",
+    "bom_items",
+    "floor_zones",
+}
+
+REPO_QUERIES = {
+    "floor_zones.list_by_floor": lambda s: FloorZoneRepo(s).list_by_floor(7),
+    "parts.department_ids": lambda s: PartRepo(s).department_ids([1, 2, 3]),
+    "defects.first_by_part": lambda s: DefectRepo(s).first_by_part(7),
+    "defects.first_by_defect_category": lambda s: DefectRepo(
+        s
+    ).first_by_defect_category(7),
+    "defects.first_by_part_and_defect_category": lambda s: DefectRepo(
+        s
+    ).first_by_part_and_defect_category(7, 3),
+    "defects.first_by_part_and_department": lambda s: DefectRepo(
+        s
+    ).first_by_part_and_department(7, 3),
+    "quality.first_by_part": lambda s: QualityRepo(s).first_by_part(7),
+    "work_orders.by_number": lambda s: WorkOrderRepo(s).by_number("WO-7"),
+    "work_orders.list_by_parts": lambda s: WorkOrderRepo(s).list_by_parts([1, 2]),
+    "work_orders.list_by_work_centers": lambda s: WorkOrderRepo(s).list_by_work_centers(
+        [1, 2]
+    ),
+    "work_order_ops.list_by_work_order": lambda s: WorkOrderOpRepo(
+        s
+    ).list_by_work_order(7),
+    "routing_steps.list_by_routing": lambda s: RoutingStepRepo(s).list_by_routing(7),
+    "bom_items.list_by_bom": lambda s: BOMItemRepo(s).list_by_bom(7),
+    "activity_logs.list_by_work_order": lambda s: ActivityLogRepo(s).list_by_work_order(
+        7
+    ),
+}
+
+
+def _seed(conn) -> None:
+    rnd = random.Random(8)
+    few, many = ROWS // 100, ROWS
+
+    def ids(n):
+        return rnd.randint(1, n)
+
+    conn.execute(insert(Department), [{"title": f"D{i}"} for i in range(20)])
+    conn.execute(
+        insert(DefectCategory),
+        [{"title": f"DC{i}", "department_id": ids(20)} for i in range(50)],
+    )
+    conn.execute(
+        insert(Part), [{"name": f"P{i}", "department_id": ids(20)} for i in range(few)]
+    )
+    conn.execute(
+        insert(WorkCenter),
+        [{"name": f"WC{i}", "department_id": ids(20)} for i in range(few)],
+    )
+    conn.execute(insert(Floor), [{"name": f"F{i}"} for i in range(few)])
+    conn.execute(
+        insert(Routing), [{"name": f"R{i}", "part_id": ids(few)} for i in range(few)]
+    )
+    conn.execute(insert(BOM), [{"part_id": ids(few)} for _ in range(few)])
+    conn.execute(
+        insert(WorkOrder),
+        [
+            {
+                "number": f"WO-{i}",
+                "status": "open",
+                "quantity": 1,
+                "part_id": ids(few),
+                "department_id": ids(20),
+                "work_center_id": ids(few),
+            }
+            for i in range(many)
+        ],
+    )
+    conn.execute(
+        insert(WorkOrderOp),
+        [
+            {"work_order_id": ids(many), "sequence": i % 10, "status": "pending"}
+            for i in range(many)
+        ],
+    )
+    conn.execute(
+        insert(ActivityLog),
+        [{"work_order_id": ids(many), "event_type": "scan"} for _ in range(many)],
+    )
+    conn.execute(
+        insert(Defect),
+        [
+            {"title": "d", "part_id": ids(few), "defect_category_id": ids(50)}
+            for _ in range(many)
+        ],
+    )
+    conn.execute(
+        insert(Quality), [{"pass_fail": True, "part_id": ids(few)} for _ in range(many)]
+    )
+    conn.execute(
+        insert(RoutingStep),
+        [{"routing_id": ids(few), "sequence": i % 10} for i in range(many)],
+    )
+    conn.execute(
+        insert(BOMItem),
+        [{"bom_id": ids(few), "component_part_id": ids(few)} for _ in range(many)],
+    )
+    conn.execute(
+        insert(FloorZone),
+        [
+            {"floor_id": ids(few), "name": "z", "polygon": "0,0 1,0 1,1"}
+            for _ in range(many)
+        ],
+    )
+    conn.execute(text("ANALYZE"))
+
+
+@pytest.fixture(scope="module")
+def engine():
+    url = os.environ.get("TEST_DATABASE_URL", "sqlite://")
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        _seed(conn)
+    yield engine
+    if engine.dialect.name != "sqlite":
+        Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def _seq_scans_sqlite(conn, statement, params) -> list[str]:
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params).all()
+    return [
+        row[3]
+        for row in rows
+        if row[3].startswith("SCAN ") and row[3].split()[1] in LARGE_TABLES
+    ]
+
+
+def _seq_scans_postgres(conn, statement, params) -> list[str]:
+    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, params).scalar()
+    found, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if node["Node Type"] == "Seq Scan" and node["Relation Name"] in LARGE_TABLES:
+            found.append(f"Seq Scan on {node['Relation Name']}")
+        stack.extend(node.get("Plans", []))
+    return found
+
+
+@pytest.mark.parametrize("name", sorted(REPO_QUERIES))
+def test_repo_query_uses_an_index(engine, name):
+    captured = []
+
+    def _capture(conn, cursor, statement, params, context, executemany):
+        captured.append((statement, params))
+
+    session = sessionmaker(bind=engine)()
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        REPO_QUERIES[name](session)
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+        session.close()
+
+    explain = (
+        _seq_scans_sqlite if engine.dialect.name == "sqlite" else _seq_scans_postgres
+    )
+    with engine.connect() as conn:
+        for statement, params in captured:
+            assert explain(conn, statement, params) == [], statement
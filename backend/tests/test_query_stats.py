@@ -0,0 +1,90 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from strawberry.fastapi import GraphQLRouter
+
+from models.models import Base, Part
+from app.api.loaders import Loaders
+from app.core.config import settings
+from app.core.query_stats import (
+    QueryStats,
+    RepeatedStatementError,
+    normalize,
+    track_queries,
+)
+from main import schema
+
+
+@pytest.fixture
+def maker():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    maker = sessionmaker(bind=engine, expire_on_commit=False)
+    with maker() as sess:
+        sess.add_all([Part(name=f"P{i}") for i in range(3)])
+        sess.commit()
+    return maker
+
+
+def test_normalize_groups_parameter_variants():
+    assert normalize("SELECT a\n  FROM t WHERE id IN (?, ?, ?)") == normalize(
+        "SELECT a FROM t WHERE id IN (%(id_1)s)"
+    )
+    assert normalize("SELECT a FROM t WHERE id = $1") == "SELECT a FROM t WHERE id = ?"
+
+
+def test_only_tracked_sessions_are_counted(maker):
+    stats = QueryStats()
+    with maker() as tracked:
+        track_queries(tracked, stats)
+        tracked.scalars(select(Part)).all()
+        tracked.get(Part, 1)
+    # same pooled connection, but the stats were unbound when it was checked in
+    with maker() as other:
+        other.scalars(select(Part)).all()
+    assert stats.count == 2
+    assert stats.seconds > 0
+
+
+def test_repeated_statements_warn_or_raise(maker, caplog):
+    stats = QueryStats(threshold=2)
+    with maker() as sess:
+        track_queries(sess, stats)
+        for i in range(1, 4):
+            sess.scalar(select(Part).where(Part.id == i))
+    assert "repeated 3 times" in caplog.text
+
+    stats = QueryStats(threshold=2, raise_on_repeat=True)
+    with maker() as sess:
+        track_queries(sess, stats)
+        with pytest.raises(RepeatedStatementError):
+            for i in range(1, 4):
+                sess.scalar(select(Part).where(Part.id == i))
+
+
+def test_counts_are_returned_in_headers_and_extensions(maker, monkeypatch):
+    async def get_context():
+        db = maker()
+        return {"db": db, "loaders": Loaders(db)}
+
+    app = FastAPI()
+    app.include_router(
+        GraphQLRouter(schema, context_getter=get_context), prefix="/graphql"
+    )
+    response = TestClient(app).post("/graphql", json={"query": "{ parts { name } }"})
+
+    assert response.json()["data"]["parts"][0]["name"] == "P0"
+    assert response.headers["X-DB-Queries"] == "1"
+    assert float(response.headers["X-DB-Time"]) > 0
+    assert response.json()["extensions"]["db"]["queries"] == 1
+
+    monkeypatch.setattr(settings, "DB_REPEAT_THRESHOLD", 0)
+    response = TestClient(app).post("/graphql", json={"query": "{ __typename }"})
+    assert response.headers["X-DB-Queries"] == "0"
@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import event
+
+from models.models import Department
+from app.api.services import MutationService, QueryService
+from app.core.cache import TTLCache, reference_cache
+from app.schema import DepartmentInput
+
+
+@pytest.fixture
+def maker(maker):
+    with maker() as sess:
+        sess.add_all([Department(title="Assembly"), Department(title="Paint")])
+        sess.commit()
+    return maker
+
+
+@pytest.fixture
+def statements(engine):
+    captured = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, params, context, executemany):
+        captured.append(statement)
+
+    return captured
+
+
+def _titles(maker):
+    with maker() as sess:
+        return [d.title for d in QueryService(sess).get_all_departments()]
+
+
+def test_steady_state_reads_skip_the_database(maker, statements):
+    assert _titles(maker) == ["Assembly", "Paint"]
+    hits = reference_cache.stats.hits
+    statements.clear()
+
+    assert _titles(maker) == ["Assembly", "Paint"]
+    assert statements == []
+    assert reference_cache.stats.hits == hits + 1
+
+
+def test_committed_write_invalidates(maker):
+    _titles(maker)
+    with maker() as sess:
+        MutationService(sess).add_department(DepartmentInput(title="Weld"))
+        # not visible to others until commit, so the cache stays
+        assert "Weld" not in _titles(maker)
+        sess.commit()
+    assert _titles(maker) == ["Assembly", "Paint", "Weld"]
+
+
+def test_rolled_back_write_keeps_entries(maker):
+    _titles(maker)
+    invalidations = reference_cache.stats.invalidations
+    with maker() as sess:
+        MutationService(sess).add_department(DepartmentInput(title="Weld"))
+        sess.rollback()
+    assert reference_cache.stats.invalidations == invalidations
+
+
+def test_lru_eviction_and_ttl_expiry():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    for key in ("a", "b", "c"):
+        cache.get_or_load(("ns", key), lambda: key)
+    assert cache.stats.evictions == 1
+    assert len(cache) == 2
+
+    now[0] = 11
+    assert cache.get_or_load(("ns", "c"), lambda: "fresh") == "fresh"
+    assert cache.stats.expirations == 1
+    assert cache.stats.hits == 0
+
+
+def test_load_racing_an_invalidation_is_not_stored():
+    cache = TTLCache(maxsize=8, ttl=60)
+
+    def load():
+        cache.invalidate("ns")  # a commit lands while we are reading
+        return "stale"
+
+    cache.get_or_load(("ns", 1), load)
+    assert cache.get_or_load(("ns", 1), lambda: "fresh") == "fresh"
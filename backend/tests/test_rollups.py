@@ -0,0 +1,173 @@
+import asyncio
+from datetime import date, datetime
+
+import pytest
+from graphql import GraphQLError
+from sqlalchemy import event, select
+
+from app.api.loaders import Loaders
+from app.api.rollups import rebuild
+from app.api.services import MutationService, QueryService
+from app.schema import DefectInput, PartInput
+from main import schema
+from models.models import (
+    Defect,
+    DefectCategory,
+    DefectDailyCount,
+    Department,
+    Part,
+)
+
+
+@pytest.fixture
+def session(session):
+    machining, paint = Department(title="Machining"), Department(title="Paint")
+    session.add_all(
+        [
+            machining,
+            paint,
+            Part(name="Shaft", department=machining),
+            Part(name="Panel", department=paint),
+            DefectCategory(title="Scratch"),
+            DefectCategory(title="Burr"),
+            DefectCategory(title="Porosity"),
+        ]
+    )
+    session.commit()
+    return session
+
+
+def _rollup(session) -> list[tuple]:
+    return session.execute(
+        select(DefectDailyCount.__table__).order_by(
+            DefectDailyCount.day,
+            DefectDailyCount.defect_category_id,
+            DefectDailyCount.part_id,
+        )
+    ).all()
+
+
+def _defect(part_id, category_id):
+    return DefectInput(
+        title="d", description="", part_id=part_id, defect_category_id=category_id
+    )
+
+
+def test_mutations_keep_the_rollup_equal_to_a_rebuild(session):
+    service = MutationService(session)
+    first = service.add_defect(_defect(1, 1))
+    service.add_defect(_defect(1, 1))
+    moved = service.add_defect(_defect(1, 2))
+    service.add_defect(_defect(2, 3))
+    created, errors = service.add_defects([_defect(2, 3), _defect(1, 2)])
+    assert not errors
+    service.update_defect(moved.id, _defect(2, 2))
+    service.delete_defect(first.id)
+    service.add_defect(_defect(None, 1))  # no part: not counted
+    session.commit()
+
+    maintained = _rollup(session)
+    rebuild(session)
+    assert maintained == _rollup(session)
+    today = maintained[0].day
+    # (day, category, part, department, count); Paint is department 2
+    assert [tuple(r) for r in maintained] == [
+        (today, 1, 1, 1, 1),
+        (today, 2, 1, 1, 1),
+        (today, 2, 2, 2, 1),
+        (today, 3, 2, 2, 2),
+    ]
+
+
+def test_deleting_the_last_defect_removes_its_row(session):
+    service = MutationService(session)
+    defect = service.add_defect(_defect(1, 1))
+    service.delete_defect(defect.id)
+    session.commit()
+    assert _rollup(session) == []
+
+
+def test_moving_a_part_moves_its_counts(session):
+    service = MutationService(session)
+    service.add_defect(_defect(1, 1))
+    service.update_part(1, PartInput(name="Shaft", department_id=2))
+    session.commit()
+
+    assert [r.department_id for r in _rollup(session)] == [2]
+    assert QueryService(session).get_defect_pareto(department_id=1) == []
+
+
+def test_pareto_ranks_categories_within_the_filters(session):
+    rows = [
+        # (part, category, day): part 1 is Machining, part 2 Paint
+        (1, 1, 1),
+        (1, 1, 2),
+        (1, 1, 2),
+        (1, 2, 2),
+        (1, 3, 3),
+        (2, 2, 2),
+        (2, 2, 2),
+        (1, 2, 9),
+    ]
+    session.add_all(
+        Defect(
+            title="d",
+            part_id=part,
+            defect_category_id=category,
+            created_at=datetime(2024, 5, day, 12),
+        )
+        for part, category, day in rows
+    )
+    session.flush()
+    rebuild(session)
+    query = QueryService(session)
+
+    ranked = query.get_defect_pareto(
+        department_id=1, start=date(2024, 5, 1), end=date(2024, 5, 3)
+    )
+    assert [(r.defect_category_id, r.count) for r in ranked] == [(1, 3), (2, 1), (3, 1)]
+    assert [(r.share, r.cumulative_share) for r in ranked] == [
+        (60.0, 60.0),
+        (20.0, 80.0),
+        (20.0, 100.0),
+    ]
+
+    top = query.get_defect_pareto(top=1)
+    assert [(r.defect_category_id, r.count, r.share) for r in top] == [(2, 4, 50.0)]
+
+    with pytest.raises(GraphQLError):
+        query.get_defect_pareto(top=0)
+
+
+def test_defect_pareto_reads_only_the_rollup(engine, maker, session):
+    MutationService(session).add_defect(_defect(1, 2))
+    session.commit()
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    db = maker()
+    result = asyncio.run(
+        schema.execute(
+            "{ defectPareto(departmentId: 1, top: 5)"
+            " { defectCategoryId count share cumulativeShare } }",
+            context_value={"db": db, "loaders": Loaders(db)},
+        )
+    )
+    db.close()
+
+    assert result.errors is None
+    assert result.data == {
+        "defectPareto": [
+            {
+                "defectCategoryId": 2,
+                "count": 1,
+                "share": 100.0,
+                "cumulativeShare": 100.0,
+            }
+        ]
+    }
+    [statement] = statements
+    assert "defect_daily_counts" in statement and "FROM defects" not in statement
@@ -1,20 +1,5 @@
-import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from models.models import Base
-from backend.app.api.services import MutationService, QueryService
-from backend.app.schema import DepartmentInput
-
-
-@pytest.fixture
-def session():
-    engine = create_engine("sqlite:///:memory:")
-    TestingSessionLocal = sessionmaker(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    sess = TestingSessionLocal()
-    yield sess
-    sess.close()
+from app.api.services import MutationService, QueryService
+from app.schema import DepartmentInput
 
 
 def test_add_and_get_department(session):
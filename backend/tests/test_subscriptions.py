@@ -0,0 +1,183 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models.models import Base, Department, Part, WorkCenter, WorkOrder, WorkOrderOp
+from app.api.loaders import Loaders
+from app.core.events import Event, bus, emit
+from app.core.pubsub import Broker, SlowConsumerError, broker
+from app.core.session import LazySession
+from main import schema
+
+
+@pytest.fixture
+def maker():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    maker = sessionmaker(bind=engine, expire_on_commit=False)
+    with maker() as session:
+        session.add_all(
+            [
+                Department(id=1, title="Assembly"),
+                Department(id=2, title="Paint"),
+                Part(id=1, name="Bracket", department_id=1),
+                WorkCenter(id=1, name="Press", department_id=1),
+                WorkCenter(id=2, name="Lathe", department_id=1),
+                WorkOrder(id=1, number="WO-1", part_id=1, department_id=1),
+                WorkOrderOp(id=1, work_order_id=1, sequence=10, work_center_id=1),
+            ]
+        )
+        session.commit()
+    return maker
+
+
+@pytest.fixture(autouse=True)
+def forwarding():
+    # what main's lifespan does
+    bus.subscribe(("work_order", "work_order_op", "t"), broker.forward)
+
+
+def _context(maker):
+    db = LazySession(maker)
+    return {"db": db, "loaders": Loaders(db)}
+
+
+def _first_event(document, maker, **kwargs) -> asyncio.Task:
+    """Task resolving to the subscription's first result.
+
+    `schema.subscribe` itself only returns once that result exists, so it
+    has to run concurrently with whatever publishes it.
+    """
+
+    async def first():
+        stream = await schema.subscribe(
+            document, context_value=_context(maker), **kwargs
+        )
+        try:
+            return await stream.__anext__()
+        finally:
+            await stream.aclose()
+
+    return asyncio.ensure_future(first())
+
+
+async def _subscribed(count: int) -> None:
+    while len(broker) < count:
+        await asyncio.sleep(0.001)
+
+
+def test_slow_subscriber_is_dropped_after_its_backlog():
+    async def scenario():
+        bus = Broker(maxsize=2)
+        with bus.subscribe("t") as subscriber:
+            for i in range(5):
+                bus.publish("t", i)
+            received = []
+            with pytest.raises(SlowConsumerError):
+                async for item in subscriber:
+                    received.append(item)
+        return received, len(bus)
+
+    received, open_after = asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert received == [0, 1]
+    assert open_after == 0
+
+
+def test_publish_from_another_thread_reaches_the_subscriber_loop():
+    async def scenario():
+        bus = Broker(maxsize=10)
+        with bus.subscribe(("work_order", 1)) as subscriber:
+            thread = threading.Thread(
+                target=bus.publish, args=(("work_order", 1), "changed")
+            )
+            thread.start()
+            thread.join()
+            bus.publish(("work_order", 2), "other topic")
+            item = await asyncio.wait_for(subscriber.__aiter__().__anext__(), 1)
+        return item, len(bus)
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 5)) == ("changed", 0)
+
+
+def test_events_are_published_on_commit_only(maker):
+    async def scenario():
+        with broker.subscribe(("t", 1)) as subscriber:
+            with maker() as session:
+                session.get(WorkOrder, 1)
+                emit(session, Event("t", 1, {"n": "rolled back"}))
+                session.rollback()
+                session.get(WorkOrder, 1)
+                emit(session, Event("t", 1, {"n": "committed"}))
+                session.commit()
+            return await asyncio.wait_for(subscriber.queue.get(), 1), subscriber
+
+    item, subscriber = asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert item == {"n": "committed"} and subscriber.queue.empty()
+
+
+def test_op_update_notifies_old_and_new_work_center(maker):
+    subscription = """
+    subscription ($wc: Int!) {
+      workOrderOpChanged(workCenterId: $wc) { id status workCenter { name } }
+    }
+    """
+    mutation = """
+    mutation {
+      updateWorkOrderOp(id: 1, data: {workOrderId: 1, sequence: 10,
+                                      workCenterId: 2, status: "running"}) { id }
+    }
+    """
+
+    async def scenario():
+        pending = [
+            _first_event(subscription, maker, variable_values={"wc": wc})
+            for wc in (1, 2)
+        ]
+        await _subscribed(2)
+        result = await schema.execute(mutation, context_value=_context(maker))
+        assert result.errors is None
+        return await asyncio.gather(*pending)
+
+    old, new = asyncio.run(asyncio.wait_for(scenario(), 5))
+    for event in (old, new):
+        assert event.errors is None
+        assert event.data["workOrderOpChanged"] == {
+            "id": 1,
+            "status": "running",
+            "workCenter": {"name": "Lathe"},
+        }
+    assert len(broker) == 0
+
+
+def test_failed_mutation_publishes_nothing(maker):
+    async def scenario():
+        pending = _first_event(
+            "subscription { workOrderChanged(departmentId: 1) { number } }", maker
+        )
+        await _subscribed(1)
+        result = await schema.execute(
+            """
+            mutation {
+              a: updateWorkOrder(id: 1, data: {number: "WO-1b", partId: 1}) { id }
+              b: updateWorkOrder(id: 99, data: {number: "WO-x", partId: 1}) { id }
+            }
+            """,
+            context_value=_context(maker),
+        )
+        assert result.errors
+        await asyncio.sleep(0.05)
+        published = pending.done()
+        pending.cancel()
+        await asyncio.gather(pending, return_exceptions=True)
+        return published
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 5)) is False
+    assert len(broker) == 0
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from models.models import Department, Part, WorkOrder
+from app.api.loaders import Loaders
+from app.core.session import LazySession
+from app.api.services import MutationService
+from app.schema import ActivityLogInput, DepartmentInput, WorkOrderInput
+from main import schema
+
+
+@pytest.fixture
+def statements(engine):
+    captured = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, params, context, executemany):
+        captured.append(statement)
+
+    return captured
+
+
+def test_create_is_a_single_round_trip(session, statements):
+    service = MutationService(session)
+
+    dept = service.add_department(DepartmentInput(title="Paint"))
+    log = service.add_activity_log(ActivityLogInput(event_type="scan"))
+
+    assert dept.id is not None
+    # server default comes back through RETURNING, not a refresh SELECT
+    assert log.created_at is not None
+    assert [s.split()[0] for s in statements] == ["INSERT", "INSERT"]
+
+
+def test_update_defaults_department_without_a_refresh(session, statements):
+    paint, weld = Department(title="Paint"), Department(title="Weld")
+    session.add_all([paint, weld, Part(name="Panel", department=weld)])
+    session.flush()
+    session.add(
+        WorkOrder(number="WO-1", status="open", quantity=1, part_id=1, department_id=1)
+    )
+    session.commit()
+    statements.clear()
+
+    wo = MutationService(session).update_work_order(
+        1, WorkOrderInput(number="WO-1", status="open", quantity=1, part_id=1)
+    )
+
+    # part and order loaded, then updated; the default is not read back
+    assert [s.split()[0] for s in statements] == ["SELECT", "SELECT", "UPDATE"]
+    assert wo.department_id == 2
+
+
+def test_mutation_document_commits_atomically(maker):
+    db = LazySession(maker)
+    document = """
+    mutation {
+      a: addDepartment(data: {title: "Assembly"}) { id }
+      b: addDepartment(data: {title: "Assembly"}) { id }
+    }
+    """
+
+    result = asyncio.run(
+        schema.execute(document, context_value={"db": db, "loaders": Loaders(db)})
+    )
+
+    assert result.errors
+    assert maker().query(Department).count() == 0
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.api.loaders import Loaders
+from app.api.services import activity_log_buffer
+from app.core.session import LazySession
+from app.core.write_behind import WriteBehindBuffer
+from main import schema
+from models.models import ActivityLog, Base
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'logs.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def commits(engine):
+    # one transaction per batch (SQLite then runs its rows one by one, as
+    # RETURNING order is only guaranteed that way there; Postgres batches)
+    seen = []
+    event.listen(engine, "commit", lambda conn: seen.append(conn))
+    return seen
+
+
+def _buffer(**overrides):
+    options = {"max_rows": 4, "max_delay": 0.01, "max_queue": 100, **overrides}
+    return WriteBehindBuffer(ActivityLog.__table__, **options)
+
+
+def _logged(engine) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(ActivityLog))
+
+
+def _run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 10))
+
+
+def test_rows_are_inserted_in_batches_and_futures_get_their_row(engine, commits):
+    async def scenario():
+        buffer = _buffer()
+        buffer.start(engine)
+        futures = [await buffer.submit({"event_type": f"scan-{i}"}) for i in range(10)]
+        rows = await asyncio.gather(*futures)
+        await buffer.close()
+        return rows
+
+    rows = _run(scenario())
+    assert [r.event_type for r in rows] == [f"scan-{i}" for i in range(10)]
+    assert len({r.id for r in rows}) == 10 and all(r.created_at for r in rows)
+    assert len(commits) == 3  # 4 + 4 + 2
+
+
+def test_a_partial_batch_is_flushed_after_max_delay(engine):
+    async def scenario():
+        buffer = _buffer(max_rows=1000, max_delay=0.02)
+        buffer.start(engine)
+        row = await (await buffer.submit({"event_type": "start"}))
+        flushed_before_close = _logged(engine)
+        await buffer.close()
+        return row, flushed_before_close
+
+    row, flushed = _run(scenario())
+    assert row.event_type == "start" and flushed == 1
+
+
+def test_a_full_queue_makes_producers_wait(engine, monkeypatch):
+    release = threading.Event()
+    buffer = _buffer(max_rows=1, max_queue=2)
+    insert_batch = buffer._insert_batch
+    monkeypatch.setattr(
+        buffer, "_insert_batch", lambda rows: release.wait(5) and insert_batch(rows)
+    )
+
+    async def scenario():
+        buffer.start(engine)
+        for i in range(3):  # one taken by the (stalled) flusher, two queued
+            await buffer.submit({"event_type": "scan"}, wait=False)
+            await asyncio.sleep(0.01)
+        blocked = asyncio.ensure_future(
+            buffer.submit({"event_type": "scan"}, wait=False)
+        )
+        await asyncio.sleep(0.05)
+        waited = not blocked.done()
+        release.set()
+        await blocked
+        await buffer.close()
+        return waited
+
+    assert _run(scenario()) is True
+    assert _logged(engine) == 4
+
+
+def test_close_flushes_fire_and_forget_rows(engine):
+    async def scenario():
+        buffer = _buffer(max_rows=1000, max_delay=60)
+        buffer.start(engine)
+        for _ in range(5):
+            assert await buffer.submit({"event_type": "stop"}, wait=False) is None
+        assert _logged(engine) == 0
+        await buffer.close()
+
+    _run(scenario())
+    assert _logged(engine) == 5
+
+
+def test_a_bad_row_fails_alone(engine):
+    async def scenario():
+        buffer = _buffer()
+        buffer.start(engine)
+        futures = [
+            await buffer.submit({"event_type": value})
+            for value in ("scan", None, "stop")
+        ]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        await buffer.close()
+        return results
+
+    good, bad, also_good = _run(scenario())
+    assert isinstance(bad, IntegrityError)
+    assert (good.event_type, also_good.event_type) == ("scan", "stop")
+    assert _logged(engine) == 2
+
+
+def test_add_activity_log_goes_through_the_buffer(engine):
+    maker = sessionmaker(bind=engine)
+
+    async def mutate(document):
+        db = LazySession(maker)
+        return await schema.execute(
+            document, context_value={"db": db, "loaders": Loaders(db)}
+        )
+
+    async def scenario():
+        activity_log_buffer.start(engine)
+        try:
+            queued = await mutate(
+                'mutation { addActivityLog(data: {eventType: "scan"},'
+                " fireAndForget: true) { id } }"
+            )
+            acknowledged = await mutate(
+                'mutation { addActivityLog(data: {eventType: "start"}) { id eventType } }'
+            )
+        finally:
+            await activity_log_buffer.close()
+        return queued, acknowledged
+
+    queued, acknowledged = _run(scenario())
+    assert queued.errors is None and queued.data == {"addActivityLog": None}
+    assert acknowledged.data["addActivityLog"]["eventType"] == "start"
+    assert _logged(engine) == 2
@@ -1,4 +1,6 @@
 // src/services/graphql.ts
+import { getOperationAST, OperationTypeNode, parse } from "graphql";
+
 export interface GraphQLErrorPayload {
   message: string;
   extensions?: {
@@ -21,17 +23,104 @@ export class GraphQLRequestError extends Error {
 const GRAPHQL_URL =
   import.meta.env.VITE_GRAPHQL_URL || "/graphql"; // e.g. "http://localhost:8000/graphql"
 
+// Longer GET URLs risk proxy/server header limits; those queries use POST.
+const MAX_GET_URL_LENGTH = 4000;
+
+interface GraphQLPayload {
+  query?: string;
+  variables?: Record<string, unknown>;
+  extensions?: Record<string, unknown>;
+}
+
+// Parsed rather than pattern-matched, so comments, fragments declared first
+// and shorthand queries are classified correctly. Cached: documents are
+// constants, so each is parsed once.
+const operationKinds = new Map<string, boolean>();
+
+function isMutation(query: string): boolean {
+  let mutation = operationKinds.get(query);
+  if (mutation === undefined) {
+    try {
+      mutation =
+        getOperationAST(parse(query))?.operation === OperationTypeNode.MUTATION;
+    } catch {
+      mutation = false; // the server reports the syntax error
+    }
+    operationKinds.set(query, mutation);
+  }
+  return mutation;
+}
+
+// Automatic persisted queries: send only the query's SHA-256 and fall back
+// to the full text when the server has not seen it yet. crypto.subtle only
+// exists in secure contexts (https or localhost); elsewhere we send text.
+const hashes = new Map<string, Promise<string | null>>();
+
+function sha256(query: string): Promise<string | null> {
+  let hash = hashes.get(query);
+  if (!hash) {
+    hash = globalThis.crypto?.subtle
+      ? crypto.subtle
+          .digest("SHA-256", new TextEncoder().encode(query))
+          .then((buf) =>
+            Array.from(new Uint8Array(buf), (b) =>
+              b.toString(16).padStart(2, "0")
+            ).join("")
+          )
+          .catch(() => null)
+      : Promise.resolve(null);
+    hashes.set(query, hash);
+  }
+  return hash;
+}
+
+// Queries go out as GET so the browser can revalidate them with the server's
+// ETag (If-None-Match -> 304) instead of downloading identical data again.
+function queryUrl(payload: GraphQLPayload) {
+  const params = new URLSearchParams();
+  if (payload.query) params.set("query", payload.query);
+  if (payload.variables) params.set("variables", JSON.stringify(payload.variables));
+  if (payload.extensions) params.set("extensions", JSON.stringify(payload.extensions));
+  const separator = GRAPHQL_URL.includes("?") ? "&" : "?";
+  return `${GRAPHQL_URL}${separator}${params}`;
+}
+
+async function send(payload: GraphQLPayload, mutation: boolean) {
+  const url = mutation ? null : queryUrl(payload);
+  const res =
+    url && url.length <= MAX_GET_URL_LENGTH
+      ? await fetch(url, { method: "GET" })
+      : await fetch(GRAPHQL_URL, {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify(payload),
+        });
+  return res.json();
+}
+
+function persistedQueryNotFound(json: { errors?: GraphQLErrorPayload[] }) {
+  return !!json.errors?.some(
+    (e) => e.extensions?.code === "PERSISTED_QUERY_NOT_FOUND"
+  );
+}
+
 export async function fetchGraphQL<T>(
   query: string,
   variables?: Record<string, unknown>
 ): Promise<T> {
-  const res = await fetch(GRAPHQL_URL, {
-    method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ query, variables }),
-  });
+  const mutation = isMutation(query);
+  const hash = await sha256(query);
 
-  const json = await res.json();
+  let json;
+  if (hash) {
+    const extensions = { persistedQuery: { version: 1, sha256Hash: hash } };
+    json = await send({ variables, extensions }, mutation);
+    if (persistedQueryNotFound(json)) {
+      json = await send({ query, variables, extensions }, mutation);
+    }
+  } else {
+    json = await send({ query, variables }, mutation);
+  }
 
   if (json.errors?.length) {
     const errors: GraphQLErrorPayload[] = json.errors;
@@ -40,4 +129,4 @@ export async function fetchGraphQL<T>(
   }
 
   return json.data as T;
-}
\ No newline at end of file
+}